@@ -5,6 +5,8 @@ from .ui import blueprint as ui_blueprint
 from .api import blueprint as api_blueprint
 from .config import Config
 from .admin import init_admin
+from .services.result_cache import init_result_cache
+from .services.sql_profiling import init_sql_profiling
 from lbrc_flask import init_lbrc_flask, ReverseProxied
 from lbrc_flask.security import init_security, Role
 from lbrc_flask.celery import init_celery
@@ -31,6 +33,9 @@ def create_app(config=Config):
     app.register_blueprint(ui_blueprint)
     app.register_blueprint(api_blueprint, url_prefix='/api')
 
+    init_result_cache(app)
+    init_sql_profiling(app)
+
     return app
 
 
@@ -1,9 +1,12 @@
 import datetime
+import json
+from markupsafe import Markup, escape
 from flask_admin.contrib.sqla import fields
 from lbrc_flask.database import db
 from lbrc_flask.security import Role
 from lbrc_flask.admin import AdminCustomView, init_admin as flask_init_admin
 from lbrc_flask.api import ApiKey
+from academics.model.profiling import SlowRequest
 from academics.model.publication import Journal
 
 from academics.model.security import User
@@ -41,6 +44,24 @@ class ApiKeyView(AdminCustomView):
     form_columns = ["name"]
 
 
+def _json_formatter(view, context, model, name):
+    return Markup(f'<pre>{escape(json.dumps(json.loads(getattr(model, name) or "[]"), indent=2))}</pre>')
+
+
+class SlowRequestView(AdminCustomView):
+    can_create = False
+    can_edit = False
+    can_view_details = True
+    column_list = ['created_datetime', 'method', 'path', 'status_code', 'duration', 'sql_count', 'sql_seconds', 'repeated_count']
+    column_details_list = column_list + ['endpoint', 'repeated_statements', 'slowest_statements']
+    column_searchable_list = ['path', 'endpoint']
+    column_default_sort = ('created_datetime', True)
+    column_formatters_detail = {
+        'repeated_statements': _json_formatter,
+        'slowest_statements': _json_formatter,
+    }
+
+
 def init_admin(app, title):
     flask_init_admin(
         app,
@@ -50,5 +71,6 @@ def init_admin(app, title):
             ThemeView(Theme, db.session),
             JournalView(Journal, db.session),
             ApiKeyView(ApiKey, db.session),
+            SlowRequestView(SlowRequest, db.session),
         ]
     )
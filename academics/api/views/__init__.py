@@ -1,8 +1,10 @@
-from flask import request
+from flask import make_response, request
 from sqlalchemy import select
 from academics.model.academic import Academic
+from academics.services.job_telemetry import job_telemetry_summary
 
 from academics.services.publication_searching import PublicationSummarySearchForm, publication_summary
+from academics.services.result_cache import result_etag
 from lbrc_flask.database import db
 
 from .. import blueprint
@@ -12,7 +14,16 @@ from .. import blueprint
 def api_publications():
     search_form = PublicationSummarySearchForm(formdata=request.args)
 
-    return publication_summary(search_form)
+    etag = result_etag('publication_summary', search_form)
+
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        response = make_response(publication_summary(search_form))
+
+    response.set_etag(etag)
+
+    return response
 
 
 @blueprint.route("/academics", methods=['GET', 'POST'])
@@ -27,3 +38,8 @@ def api_academics():
         'orcid': a.orcid,
         'scopus_ids': list(a.all_scopus_ids()),
     } for a in db.session.scalars(q).all()]
+
+
+@blueprint.route("/job_telemetry", methods=['GET'])
+def api_job_telemetry():
+    return job_telemetry_summary(request.args.get('hours', 24, type=int))
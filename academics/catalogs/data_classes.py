@@ -1,8 +1,28 @@
+import hashlib
+import json
 from dataclasses import dataclass
+from unidecode import unidecode
 from academics.model.academic import Source
 from datetime import date
 
 
+def _normalise(value):
+    if value is None:
+        return ''
+    if isinstance(value, (set, frozenset)):
+        return sorted(_normalise(v) for v in value)
+    if isinstance(value, (list, tuple)):
+        return [_normalise(v) for v in value]
+    if isinstance(value, bool):
+        return value
+    return ' '.join(str(value).split())
+
+
+def fingerprint(*values):
+    content = json.dumps(_normalise(list(values)), sort_keys=True, ensure_ascii=True)
+    return hashlib.sha256(content.encode('ascii')).hexdigest()
+
+
 @dataclass(init=False, unsafe_hash=True)
 class CatalogReference():
     catalog: str
@@ -45,6 +65,23 @@ class AuthorData():
     def affiliation_summary(self):
         return '; '.join(a.summary for a in self.affiliations)
 
+    @property
+    def fingerprint(self):
+        return fingerprint(
+            self.catalog,
+            self.catalog_identifier,
+            self.orcid,
+            self.first_name,
+            self.last_name,
+            self.initials,
+            self.author_name,
+            self.href,
+            self.citation_count,
+            self.document_count,
+            self.h_index,
+            [a.fingerprint for a in self.affiliations],
+        )
+
     def get_new_source(self):
         result = Source()
         self.update_source(result)
@@ -64,6 +101,7 @@ class AuthorData():
         source.citation_count = self.citation_count
         source.document_count = self.document_count
         source.h_index = self.h_index
+        source.fingerprint = self.fingerprint
 
 
 @dataclass
@@ -94,6 +132,36 @@ class PublicationData():
     publication_day: str = None
     publication_date_text: str = None
 
+    @property
+    def fingerprint(self):
+        return fingerprint(
+            self.catalog,
+            self.catalog_identifier,
+            self.href,
+            self.doi,
+            self.title,
+            self.journal_name,
+            self.publication_cover_date,
+            self.abstract_text,
+            # Sponsors are saved by their lower case names, which are
+            # what a refresh from the Scopus search view keeps
+            {unidecode(n).lower() for n in filter(None, self.funding_list or [])},
+            self.funding_text,
+            self.volume,
+            self.issue,
+            self.pages,
+            self.subtype_code,
+            self.subtype_description,
+            self.cited_by_count,
+            [a.fingerprint for a in self.authors],
+            set(self.keywords or []),
+            self.is_open_access,
+            self.publication_year,
+            self.publication_month,
+            self.publication_day,
+            self.publication_date_text,
+        )
+
 
 @dataclass
 class AffiliationData():
@@ -113,12 +181,23 @@ class AffiliationData():
     def summary(self):
         return ', '.join(filter(None, [self.name, self.address, self.country]))
 
+    @property
+    def fingerprint(self):
+        return fingerprint(
+            self.catalog,
+            self.catalog_identifier,
+            self.name,
+            self.address,
+            self.country,
+        )
+
     def update_affiliation(self, affiliation):
         affiliation.catalog_identifier = self.catalog_identifier
         affiliation.catalog = self.catalog
         affiliation.name = self.name
         affiliation.address = self.address
         affiliation.country = self.country
+        affiliation.fingerprint = self.fingerprint
 
 
 @dataclass
@@ -0,0 +1,181 @@
+import logging
+import threading
+from itertools import groupby
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from flask import current_app
+from lbrc_flask.logging import log_exception
+from academics.catalogs.open_alex import OPEN_ALEX_BATCH_SIZE, get_open_alex_affiliation_data, get_open_alex_affiliation_datas, get_open_alex_author_data, get_open_alex_author_datas, get_open_alex_publication_data, get_open_alex_publication_datas, get_openalex_publications
+from academics.catalogs.scopus import SCOPUS_SEARCH_BATCH_SIZE, get_scopus_affiliation_data, get_scopus_author_data, get_scopus_publication_search_datas, get_scopus_publications
+from academics.model.catalog import CATALOG_OPEN_ALEX, CATALOG_SCOPUS
+from academics.services.telemetry import current_measurements, measuring
+
+
+_prefetching = threading.local()
+
+
+def fetch_concurrently(fetch, items, max_workers=None):
+    """Calls `fetch` for each of `items` on a pool of threads,
+    yielding `(item, result)` pairs in the order they complete.
+
+    Requests are still throttled by the shared rate limiters, so
+    this only overlaps the time spent waiting on the network.
+    Failures are logged and yield a result of `None`.
+    """
+    items = list(items)
+
+    if not items:
+        return
+
+    app = current_app._get_current_object()
+    max_workers = max_workers or app.config['FETCH_MAX_WORKERS']
+    measurements = current_measurements()
+
+    def _fetch(item):
+        with app.app_context(), measuring(measurements):
+            try:
+                return fetch(item)
+            except Exception as e:
+                log_exception(e)
+                return None
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = {executor.submit(_fetch, i): i for i in items}
+
+        for f in as_completed(futures):
+            yield futures[f], f.result()
+
+
+def _fetch_for_catalogs(catalog_references, fetchers, batch_fetchers):
+    """Fetches each of `catalog_references` using the batch fetcher
+    for its catalog where there is one, else the single item fetcher,
+    yielding `(catalog_reference, result)` pairs as they complete.
+    """
+    work = []
+
+    keyfunc = lambda r: r.catalog
+
+    for catalog, refs in groupby(sorted(set(catalog_references), key=keyfunc), key=keyfunc):
+        refs = list(refs)
+
+        if catalog in batch_fetchers:
+            batch_fetcher, batch_size = batch_fetchers[catalog]
+
+            for i in range(0, len(refs), batch_size):
+                work.append((batch_fetcher, refs[i:i + batch_size]))
+        elif fetcher := fetchers.get(catalog):
+            work.extend((fetcher, [r]) for r in refs)
+        else:
+            logging.warning(f'No fetcher for catalog {catalog}')
+
+    def _fetch(item):
+        fetcher, refs = item
+
+        if fetcher in [f for f, _ in batch_fetchers.values()]:
+            results = {k.lower(): v for k, v in fetcher([r.catalog_identifier for r in refs]).items()}
+            return [(r, results.get(r.catalog_identifier.lower())) for r in refs]
+        else:
+            return [(r, fetcher(r.catalog_identifier)) for r in refs]
+
+    for item, results in fetch_concurrently(_fetch, work):
+        if results is None:
+            results = [(r, None) for r in item[1]]
+
+        yield from results
+
+
+def get_publication_search_datas(catalog_references):
+    """Fetches the publications, using the Scopus search API, which
+    returns less detail than the abstract API but allows publications
+    to be batched.
+    """
+    return _fetch_for_catalogs(
+        catalog_references,
+        fetchers={
+            CATALOG_OPEN_ALEX: get_open_alex_publication_data,
+        },
+        batch_fetchers={
+            CATALOG_SCOPUS: (lambda ids: get_scopus_publication_search_datas(scopus_ids=ids), SCOPUS_SEARCH_BATCH_SIZE),
+            CATALOG_OPEN_ALEX: (get_open_alex_publication_datas, OPEN_ALEX_BATCH_SIZE),
+        },
+    )
+
+
+def get_scopus_publication_search_datas_for_dois(dois):
+    dois = list(dois)
+    batches = [dois[i:i + SCOPUS_SEARCH_BATCH_SIZE] for i in range(0, len(dois), SCOPUS_SEARCH_BATCH_SIZE)]
+
+    for batch, results in fetch_concurrently(lambda b: get_scopus_publication_search_datas(dois=b), batches):
+        for doi in batch:
+            yield doi, (results or {}).get(doi.lower())
+
+
+def get_author_datas(catalog_references):
+    return _fetch_for_catalogs(
+        catalog_references,
+        fetchers={
+            CATALOG_SCOPUS: get_scopus_author_data,
+            CATALOG_OPEN_ALEX: get_open_alex_author_data,
+        },
+        batch_fetchers={
+            CATALOG_OPEN_ALEX: (get_open_alex_author_datas, OPEN_ALEX_BATCH_SIZE),
+        },
+    )
+
+
+def get_affiliation_datas(catalog_references):
+    return _fetch_for_catalogs(
+        catalog_references,
+        fetchers={
+            CATALOG_SCOPUS: get_scopus_affiliation_data,
+            CATALOG_OPEN_ALEX: get_open_alex_affiliation_data,
+        },
+        batch_fetchers={
+            CATALOG_OPEN_ALEX: (get_open_alex_affiliation_datas, OPEN_ALEX_BATCH_SIZE),
+        },
+    )
+
+
+def get_author_publications(catalog_references, since=None):
+    """Publications of each author in `catalog_references`.  `since` maps
+    catalog references to the date after which their publications
+    need to be fetched, or to None to fetch all of them.
+    """
+    since = {(r.catalog, r.catalog_identifier): s for r, s in (since or {}).items()}
+
+    return _fetch_for_catalogs(
+        catalog_references,
+        fetchers={
+            CATALOG_SCOPUS: lambda id: get_scopus_publications(id, since=since.get((CATALOG_SCOPUS, id))),
+            CATALOG_OPEN_ALEX: lambda id: get_openalex_publications(id, since=since.get((CATALOG_OPEN_ALEX, id))),
+        },
+        batch_fetchers={},
+    )
+
+
+def prefetch(fetched):
+    """Runs a fetch for its side effect of filling the response cache"""
+    for _ in fetched:
+        pass
+
+
+@contextmanager
+def prefetching():
+    """Allows the jobs run by this thread within the block to prefetch
+    the data for the jobs after them, recording what has been prefetched
+    so that each item is only prefetched once in the run.
+    """
+    previous = prefetched_keys()
+    _prefetching.keys = set()
+
+    try:
+        yield
+    finally:
+        _prefetching.keys = previous
+
+
+def prefetched_keys():
+    """The keys of the items prefetched in the current run, or None
+    if prefetching is not allowed.
+    """
+    return getattr(_prefetching, 'keys', None)
@@ -0,0 +1,261 @@
+import logging
+import re
+import sqlite3
+import threading
+import time
+import zlib
+import requests
+from contextlib import closing
+from dataclasses import dataclass, field
+from flask import current_app
+from academics.services.telemetry import record
+
+
+ENDPOINT_ABSTRACT = 'abstract'
+ENDPOINT_AUTHOR = 'author'
+ENDPOINT_AFFILIATION = 'affiliation'
+ENDPOINT_SEARCH = 'search'
+ENDPOINT_SCIVAL_INSTITUTION = 'scival_institution'
+ENDPOINT_SCIVAL_PUBLICATION = 'scival_publication'
+ENDPOINT_OTHER = 'other'
+
+_ENDPOINT_PATTERNS = [
+    (re.compile(r'api\.elsevier\.com/content/abstract/'), ENDPOINT_ABSTRACT),
+    (re.compile(r'api\.elsevier\.com/content/author/'), ENDPOINT_AUTHOR),
+    (re.compile(r'api\.elsevier\.com/content/affiliation/'), ENDPOINT_AFFILIATION),
+    (re.compile(r'api\.elsevier\.com/content/search/'), ENDPOINT_SEARCH),
+    (re.compile(r'api\.elsevier\.com/analytics/scival/institution/'), ENDPOINT_SCIVAL_INSTITUTION),
+    (re.compile(r'api\.elsevier\.com/analytics/scival/publication/'), ENDPOINT_SCIVAL_PUBLICATION),
+    (re.compile(r'api\.openalex\.org/works/'), ENDPOINT_ABSTRACT),
+    (re.compile(r'api\.openalex\.org/authors/'), ENDPOINT_AUTHOR),
+    (re.compile(r'api\.openalex\.org/institutions/'), ENDPOINT_AFFILIATION),
+    (re.compile(r'api\.openalex\.org/'), ENDPOINT_SEARCH),
+]
+
+
+def endpoint_for_url(url):
+    for pattern, endpoint in _ENDPOINT_PATTERNS:
+        if pattern.search(url):
+            return endpoint
+
+    return ENDPOINT_OTHER
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    text: str
+    headers: dict = field(default_factory=dict)
+    from_cache: bool = False
+
+
+@dataclass
+class CacheEntry:
+    text: str
+    etag: str
+    last_modified: str
+    expires: float
+
+    @property
+    def is_fresh(self):
+        return self.expires > time.time()
+
+
+class ResponseCache:
+    """Persistent store of successful catalog responses held in a
+    local SQLite database, so that it is shared by all of the
+    workers on a server and survives restarts.
+
+    Bodies are stored compressed and entries are evicted least
+    recently used first once the total size goes over `max_bytes`.
+    """
+
+    def __init__(self, path, max_bytes, ttls):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self._lock = threading.Lock()
+        self._create()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _create(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS response (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    expires REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix__response__accessed ON response (accessed)')
+
+    def ttl(self, endpoint):
+        return self.ttls.get(endpoint, self.ttls.get(ENDPOINT_OTHER, 0))
+
+    def get(self, key):
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                'SELECT body, etag, last_modified, expires FROM response WHERE key = ?',
+                (key,),
+            ).fetchone()
+
+            if not row:
+                return None
+
+            conn.execute('UPDATE response SET accessed = ? WHERE key = ?', (time.time(), key))
+
+        body, etag, last_modified, expires = row
+
+        return CacheEntry(
+            text=zlib.decompress(body).decode('utf8'),
+            etag=etag,
+            last_modified=last_modified,
+            expires=expires,
+        )
+
+    def put(self, key, endpoint, text, etag=None, last_modified=None):
+        body = zlib.compress(text.encode('utf8'))
+        now = time.time()
+
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO response (key, endpoint, body, size, etag, last_modified, expires, accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, endpoint, body, len(body), etag, last_modified, now + self.ttl(endpoint), now),
+            )
+            self._evict(conn)
+
+    def touch(self, key, endpoint):
+        now = time.time()
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                'UPDATE response SET expires = ?, accessed = ? WHERE key = ?',
+                (now + self.ttl(endpoint), now, key),
+            )
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM response').fetchone()[0]
+
+        while total > self.max_bytes:
+            oldest = conn.execute('SELECT key, size FROM response ORDER BY accessed LIMIT 100').fetchall()
+
+            if not oldest:
+                break
+
+            for key, size in oldest:
+                conn.execute('DELETE FROM response WHERE key = ?', (key,))
+                total -= size
+
+                if total <= self.max_bytes:
+                    break
+
+    def clear(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM response')
+
+
+_caches = {}
+
+
+def response_cache():
+    if not current_app.config['HTTP_CACHE_ENABLED']:
+        return None
+
+    path = current_app.config['HTTP_CACHE_PATH']
+
+    if path not in _caches:
+        _caches[path] = ResponseCache(
+            path=path,
+            max_bytes=current_app.config['HTTP_CACHE_MAX_BYTES'],
+            ttls=current_app.config['HTTP_CACHE_TTLS'],
+        )
+
+    return _caches[path]
+
+
+def cached_get(url, headers=None, params=None, cache_key=None, rate_limiter=None):
+    """GET `url`, returning a cached response where there is a fresh one.
+
+    Stale entries are revalidated using their ETag or Last-Modified
+    value.  Only successful responses are cached.  `cache_key` should
+    be given when `params` contain secrets, such as an API key, that
+    should not be used as the key.  Requests that are actually sent
+    are throttled by `rate_limiter`, which also waits for the quota
+    to reset when the server responds with a 429.
+    """
+    cache = response_cache()
+    endpoint = endpoint_for_url(url)
+    key = cache_key or url
+
+    entry = cache.get(key) if cache else None
+
+    if entry and entry.is_fresh:
+        logging.debug(f'Cache hit for {url}')
+        record(cache_hits=1)
+        return CachedResponse(status_code=200, text=entry.text, from_cache=True)
+
+    request_headers = dict(headers or {})
+
+    if entry:
+        if entry.etag:
+            request_headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            request_headers['If-Modified-Since'] = entry.last_modified
+
+    while True:
+        if rate_limiter:
+            rate_limiter.acquire()
+
+        r = requests.get(url, headers=request_headers, params=params)
+        record(http_calls=1, http_bytes=len(r.content))
+
+        if not rate_limiter:
+            break
+
+        rate_limiter.update_from_headers(r.headers)
+
+        if r.status_code != 429 or not rate_limiter.wait_after_too_many_requests(r.headers):
+            break
+
+    if r.status_code == 304 and entry:
+        logging.debug(f'Cache revalidated for {url}')
+        cache.touch(key, endpoint)
+        record(cache_hits=1)
+        return CachedResponse(status_code=200, text=entry.text, headers=r.headers, from_cache=True)
+
+    if r.status_code == 200 and cache:
+        cache.put(
+            key,
+            endpoint,
+            r.text,
+            etag=r.headers.get('ETag'),
+            last_modified=r.headers.get('Last-Modified'),
+        )
+
+    return CachedResponse(status_code=r.status_code, text=r.text, headers=r.headers)
+
+
+def store(url, text, cache_key=None):
+    """Adds a response obtained some other way, such as an entity
+    returned within a batch, so that later requests for `url` use it.
+    """
+    if cache := response_cache():
+        cache.put(cache_key or url, endpoint_for_url(url), text)
+
+
+def lookup(cache_key):
+    """Returns the text of a fresh cached response, or None"""
+    if cache := response_cache():
+        entry = cache.get(cache_key)
+
+        if entry and entry.is_fresh:
+            return entry.text
@@ -5,9 +5,10 @@ import logging
 from datetime import date
 from sqlalchemy import select
 from academics.catalogs.data_classes import AffiliationData, AuthorData, PublicationData
+from academics.catalogs.http_cache import cached_get, store
+from academics.catalogs.rate_limit import rate_limiter
 from academics.config import Config
-from pyalex import Authors, Works, Institutions
-from itertools import chain
+from pyalex import Authors, Works
 from flask import current_app
 from lbrc_flask.database import db
 from academics.model.academic import Academic, Source
@@ -15,6 +16,91 @@ from academics.model.publication import CATALOG_OPEN_ALEX, DOI_URL, ORCID_URL
 from lbrc_flask.validators import parse_date
 from lbrc_flask.data_conversions import ensure_list
 import requests
+from urllib.parse import urlencode
+
+
+pyalex.config.max_retries = 5
+pyalex.config.retry_backoff_factor = 1
+pyalex.config.retry_http_codes = [429, 500, 503]
+
+OPEN_ALEX_API_URL = 'https://api.openalex.org'
+OPEN_ALEX_BATCH_SIZE = 50
+
+
+def _get_url(url):
+    logging.info(f'Sending GET request to {url}')
+    r = cached_get(
+        url,
+        params=dict(mailto=current_app.config['OPEN_ALEX_EMAIL']),
+        cache_key=url,
+        rate_limiter=rate_limiter(CATALOG_OPEN_ALEX),
+    )
+
+    if r.status_code != 200:
+        raise requests.exceptions.HTTPError(f'HTTP {r.status_code} Error from {url}:\n{r.text}')
+
+    return json.loads(r.text)
+
+
+def _get_entity(entity_type, identifier):
+    return _get_url(f'{OPEN_ALEX_API_URL}/{entity_type}/{identifier}')
+
+
+def _get_entities(entity_type, identifiers):
+    """Gets entities OPEN_ALEX_BATCH_SIZE at a time using an `openalex`
+    filter, returning a dictionary keyed by identifier.  Each entity
+    is also cached as if it had been requested individually.
+    """
+    identifiers = list(dict.fromkeys(filter(None, identifiers)))
+    requested = {i.lower(): i for i in identifiers}
+    result = {}
+
+    for i in range(0, len(identifiers), OPEN_ALEX_BATCH_SIZE):
+        batch = identifiers[i:i + OPEN_ALEX_BATCH_SIZE]
+
+        for e in _get_list(entity_type, {'openalex': '|'.join(batch)}):
+            id = _get_id_from_href(e.get('id'))
+
+            store(f'{OPEN_ALEX_API_URL}/{entity_type}/{id}', json.dumps(e))
+
+            result[requested.get(id.lower(), id)] = e
+
+    return result
+
+
+def _get_list(entity_type, filters):
+    """Cursor paged list of entities, requested through the response
+    cache so that repeated runs do not use the quota again.
+    """
+    filter = ','.join(f'{k}:{v}' for k, v in filters.items())
+    cursor = '*'
+
+    while cursor:
+        page = _get_url(f'{OPEN_ALEX_API_URL}/{entity_type}?{urlencode(dict(filter=filter, cursor=cursor))}&per-page=200')
+
+        results = page.get('results', [])
+
+        if not results:
+            return
+
+        yield from results
+
+        cursor = page.get('meta', {}).get('next_cursor')
+
+
+def _paginate(q):
+    limiter = rate_limiter(CATALOG_OPEN_ALEX)
+    pages = q.paginate(per_page=200)
+
+    while True:
+        limiter.acquire()
+
+        page = next(pages, None)
+
+        if page is None:
+            return
+
+        yield from page
 
 
 def get_open_alex():
@@ -26,7 +112,10 @@ def get_open_alex():
             .get()]
 
 
-def get_openalex_publications(identifier):
+def get_openalex_publications(identifier, since=None):
+    """Works of the author, or if `since` is given, only those
+    updated in OpenAlex after that date.
+    """
     logging.debug('get_openalex_publications: started')
 
     pyalex.config.email = current_app.config['OPEN_ALEX_EMAIL']
@@ -35,14 +124,14 @@ def get_openalex_publications(identifier):
         logging.warning('OpenAlex Not Enabled')
         return []
 
-    result = []
+    filters = {"author.id": identifier}
 
-    q = (
-        Works()
-            .filter(**{"author.id": identifier})
-        )
+    if since:
+        filters['from_updated_date'] = since.date().isoformat()
 
-    for w in chain(*q.paginate(per_page=200)):
+    result = []
+
+    for w in _get_list('works', filters):
         result.append(_get_publication_data(w, 'get_openalex_publications'))
 
     return result
@@ -58,12 +147,25 @@ def get_open_alex_publication_data(identifier):
         return None
     
     try:
-        return _get_publication_data(Works()[identifier], 'get_open_alex_publication_data')
+        return _get_publication_data(_get_entity('works', identifier), 'get_open_alex_publication_data')
     except requests.exceptions.HTTPError as e:
         logging.warning(f'OpenAlex publication not found for identifier: {identifier}')
         return None
 
 
+def get_open_alex_publication_datas(identifiers):
+    logging.debug('started')
+
+    if not current_app.config['OPEN_ALEX_ENABLED']:
+        logging.warning('OpenAlex Not Enabled')
+        return {}
+
+    return {
+        id: _get_publication_data(w, 'get_open_alex_publication_datas')
+        for id, w in _get_entities('works', identifiers).items()
+    }
+
+
 def _get_publication_data(pubdata, action):
 
     pd = _diction_purge_none(pubdata)
@@ -197,7 +299,7 @@ def get_open_alex_affiliation_data(identifier):
         return None
 
     try:
-        affiliation = Institutions()[identifier]
+        affiliation = _get_entity('institutions', identifier)
 
         results = _get_affiliation_datas([affiliation], 'get_open_alex_affiliation_data')
 
@@ -209,6 +311,28 @@ def get_open_alex_affiliation_data(identifier):
 
 
 
+def get_open_alex_affiliation_datas(identifiers):
+    if not current_app.config['OPEN_ALEX_ENABLED']:
+        logging.warning('OpenAlex Not Enabled')
+        return {}
+
+    return {
+        id: next(iter(_get_affiliation_datas([a], 'get_open_alex_affiliation_datas')))
+        for id, a in _get_entities('institutions', identifiers).items()
+    }
+
+
+def get_open_alex_author_datas(identifiers):
+    if not current_app.config['OPEN_ALEX_ENABLED']:
+        logging.warning('OpenAlex Not Enabled')
+        return {}
+
+    return {
+        id: next(iter(_get_author_datas([a], 'get_open_alex_author_datas')))
+        for id, a in _get_entities('authors', identifiers).items()
+    }
+
+
 def get_open_alex_author_data(identifier):
     if not current_app.config['OPEN_ALEX_ENABLED']:
         logging.warning('OpenAlex Not Enabled')
@@ -216,7 +340,7 @@ def get_open_alex_author_data(identifier):
 
     try:
 
-        author = Authors()[identifier]
+        author = _get_entity('authors', identifier)
 
         results = _get_author_datas([author], 'get_open_alex_author_data')
 
@@ -322,18 +446,18 @@ def _get_for_orcid(orcid):
     logging.debug(f'Getting OpenAlex authors for ORCID: {orcid}')
 
     q = Authors().filter(orcid=orcid)
-    return chain(*q.paginate(per_page=200))
+    return _paginate(q)
 
 
 def _get_for_scopus_id(scopus_id):
     logging.debug(f'Getting OpenAlex authors for SCOPUS ID: {scopus_id}')
 
     q = Authors().filter(scopus=scopus_id)
-    return chain(*q.paginate(per_page=200))
+    return _paginate(q)
 
 
 def _get_for_name(name):
     logging.debug(f'Getting OpenAlex authors for name: {name}')
 
     q = Authors().search_filter(display_name=name)
-    return chain(*q.paginate(per_page=200))
+    return _paginate(q)
@@ -0,0 +1,209 @@
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from flask import current_app
+
+
+def _retry_after_timestamp(retry_after):
+    """The time given by a Retry-After header, which is either
+    a number of seconds or an HTTP date, or None if it is missing
+    or invalid.
+    """
+    if not retry_after:
+        return None
+
+    try:
+        return time.time() + float(retry_after)
+    except ValueError:
+        pass
+
+    try:
+        result = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+    if result.tzinfo is None:
+        result = result.replace(tzinfo=timezone.utc)
+
+    return result.timestamp()
+
+
+class RateLimiter:
+    """Token bucket held in a local SQLite database so that every
+    worker on a server shares the same allowance for an API.
+
+    The bucket refills at `rate` requests a second up to `capacity`.
+    When the API reports that the remaining quota would run out before
+    the reset time at that rate, the bucket refills more slowly so that
+    the quota lasts until then.  When the quota has run out, or the API
+    returns a 429, the bucket is blocked until the reset time.
+    """
+
+    def __init__(self, path, name, rate, capacity=None):
+        self.path = path
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self._create()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _create(self):
+        with closing(self._connect()) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS bucket (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    blocked_until REAL NOT NULL,
+                    paced_rate REAL NOT NULL DEFAULT 0,
+                    paced_until REAL NOT NULL DEFAULT 0
+                )
+            ''')
+
+            # Buckets created before the rate could be slowed
+            columns = {c[1] for c in conn.execute('PRAGMA table_info(bucket)')}
+
+            for column in ['paced_rate', 'paced_until']:
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE bucket ADD COLUMN {column} REAL NOT NULL DEFAULT 0')
+
+            conn.execute(
+                'INSERT OR IGNORE INTO bucket (name, tokens, updated, blocked_until) VALUES (?, ?, ?, 0)',
+                (self.name, self.capacity, time.time()),
+            )
+
+    def _take(self):
+        """Takes a token if one is available, otherwise returns
+        the number of seconds to wait before trying again.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+
+            try:
+                tokens, updated, blocked_until, paced_rate, paced_until = conn.execute(
+                    'SELECT tokens, updated, blocked_until, paced_rate, paced_until FROM bucket WHERE name = ?',
+                    (self.name,),
+                ).fetchone()
+
+                now = time.time()
+
+                if blocked_until > now:
+                    return blocked_until - now
+
+                if paced_until > now and 0 < paced_rate < self.rate:
+                    rate = paced_rate
+                else:
+                    rate = self.rate
+
+                tokens = min(self.capacity, tokens + (now - updated) * rate)
+
+                if tokens >= 1:
+                    tokens -= 1
+                    wait = 0
+                else:
+                    wait = (1 - tokens) / rate
+
+                conn.execute(
+                    'UPDATE bucket SET tokens = ?, updated = ? WHERE name = ?',
+                    (tokens, now, self.name),
+                )
+
+                return wait
+            finally:
+                conn.execute('COMMIT')
+
+    def acquire(self):
+        while (wait := self._take()) > 0:
+            logging.debug(f'Rate limit {self.name}: waiting {wait:.2f}s')
+            time.sleep(wait)
+
+    def block_until(self, timestamp):
+        with closing(self._connect()) as conn:
+            conn.execute(
+                'UPDATE bucket SET tokens = 0, blocked_until = MAX(blocked_until, ?) WHERE name = ?',
+                (timestamp, self.name),
+            )
+
+    def pace_until(self, rate, timestamp, tokens):
+        """Refills the bucket at `rate` rather than the configured rate
+        until `timestamp`, with at most `tokens` tokens left in it.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute(
+                'UPDATE bucket SET tokens = MIN(tokens, ?), paced_rate = ?, paced_until = ? WHERE name = ?',
+                (tokens, rate, timestamp, self.name),
+            )
+
+    def update_from_headers(self, headers):
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+
+        if remaining is None or reset is None:
+            return
+
+        try:
+            remaining = int(remaining)
+            reset = float(reset)
+        except ValueError:
+            return
+
+        if remaining <= 0:
+            logging.warning(f'Rate limit {self.name}: quota used until {time.ctime(reset)}')
+            self.block_until(reset)
+            return
+
+        now = time.time()
+
+        if reset <= now:
+            return
+
+        paced_rate = remaining / (reset - now)
+
+        if paced_rate < self.rate:
+            logging.debug(f'Rate limit {self.name}: slowed to {paced_rate:.3f}/s until {time.ctime(reset)}')
+            self.pace_until(paced_rate, reset, remaining)
+
+    def wait_after_too_many_requests(self, headers):
+        """Blocks the bucket after a 429 response, so that the next
+        `acquire` waits for it to reopen.  Returns False if the wait
+        would be longer than allowed, in which case the caller should
+        give up.
+        """
+        reset = _retry_after_timestamp(headers.get('Retry-After'))
+
+        if reset is None and headers.get('X-RateLimit-Reset'):
+            reset = float(headers.get('X-RateLimit-Reset'))
+
+        if reset is None:
+            reset = time.time() + 60
+
+        wait = reset - time.time()
+
+        if wait > current_app.config['RATE_LIMIT_MAX_WAIT']:
+            logging.warning(f'Rate limit {self.name}: quota exceeded until {time.ctime(reset)}')
+            return False
+
+        logging.warning(f'Rate limit {self.name}: too many requests, waiting until {time.ctime(reset)}')
+        self.block_until(reset)
+
+        return True
+
+
+_limiters = {}
+
+
+def rate_limiter(name):
+    path = current_app.config['RATE_LIMIT_PATH']
+    rate = current_app.config['RATE_LIMITS'][name]
+
+    if (path, name) not in _limiters:
+        _limiters[(path, name)] = RateLimiter(path=path, name=name, rate=rate)
+
+    return _limiters[(path, name)]
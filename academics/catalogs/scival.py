@@ -1,12 +1,12 @@
 from datetime import datetime
 import logging
 import requests
-import time
 import json
 from flask import current_app
 from functools import cache
-from cachetools import cached, TTLCache
 from academics.catalogs.data_classes import InstitutionData
+from academics.catalogs.http_cache import cached_get
+from academics.catalogs.rate_limit import rate_limiter
 
 from academics.model.catalog import CATALOG_SCIVAL
 
@@ -16,30 +16,17 @@ class ResourceNotFoundException(Exception):
 
 
 class SciValClient:
-    __min_req_interval = 1
-    __ts_last_req = time.time()
-
     def __init__(self, api_key) -> None:
         self._api_key = api_key
 
-    def _throttle(self):
-        interval = time.time() - self.__ts_last_req
-
-        logging.debug(f'Checking throttle - Time: {time.time()}; Last Request: {self.__ts_last_req}; Interval: {interval}')
-        if (interval < self.__min_req_interval):
-            logging.debug(f'Throttle Start: {time.time()}')
-            time.sleep( self.__min_req_interval - interval )
-            logging.debug(f'Throttle End: {time.time()}')
-
-        self.__ts_last_req = time.time()
-        
-
-    @cached(cache=TTLCache(maxsize=1024, ttl=60*60))
     def exec_request(self, URL):
-        self._throttle()
-
         logging.info('Sending GET request to ' + URL)
-        r = requests.get(URL, params=dict(apiKey=self._api_key))
+        r = cached_get(
+            URL,
+            params=dict(apiKey=self._api_key),
+            cache_key=URL,
+            rate_limiter=rate_limiter(CATALOG_SCIVAL),
+        )
 
         if r.status_code == 200:
             next_allowed = datetime.fromtimestamp(int(r.headers.get("X-RateLimit-Reset", 0)))
@@ -2,12 +2,13 @@ from datetime import date, datetime
 import logging
 from random import choice, randint
 import requests
-import time
 import re
 import json
 from elsapy.elssearch import ElsSearch
 from elsapy.elsprofile import ElsAuthor, ElsAffil
 from academics.catalogs.data_classes import AffiliationData, AuthorData, PublicationData
+from academics.catalogs.http_cache import cached_get, lookup, store
+from academics.catalogs.rate_limit import rate_limiter
 from elsapy.elsdoc import AbsDoc
 from elsapy.elsclient import ElsClient
 from flask import current_app
@@ -18,12 +19,14 @@ from lbrc_flask.validators import parse_date
 from lbrc_flask.data_conversions import ensure_list, convert_int_nullable
 from elsapy import version
 from functools import cache
-from cachetools import cached, TTLCache
 from academics.model.academic import Academic, Source
 
 from academics.model.catalog import CATALOG_SCOPUS
 
 
+SCOPUS_SEARCH_BATCH_SIZE = 25
+
+
 class ResourceNotFoundException(Exception):
     pass
 
@@ -32,23 +35,11 @@ class ScopusClient(ElsClient):
     # class variables
     __url_base = "https://api.elsevier.com/"    ## Base URL for later use
     __user_agent = "elsapy-v%s" % version       ## Helps track library use
-    __min_req_interval = 1                      ## Min. request interval in sec
-    __ts_last_req = time.time()                 ## Tracker for throttling
- 
 
-    @cached(cache=TTLCache(maxsize=1024, ttl=60*60))
+
     def exec_request(self, URL):
         """Sends the actual request; returns response."""
 
-        ## Throttle request, if need be
-        interval = time.time() - self.__ts_last_req
-
-        logging.debug(f'Checking throttle - Time: {time.time()}; Last Request: {self.__ts_last_req}; Interval: {interval}')
-        if (interval < self.__min_req_interval):
-            logging.debug(f'Throttle Start: {time.time()}')
-            time.sleep( self.__min_req_interval - interval )
-            logging.debug(f'Throttle End: {time.time()}')
-        
         ## Construct and execute request
         headers = {
             "X-ELS-APIKey"  : self.api_key,
@@ -58,11 +49,11 @@ class ScopusClient(ElsClient):
         if self.inst_token:
             headers["X-ELS-Insttoken"] = self.inst_token
         logging.info('Sending GET request to ' + URL)
-        r = requests.get(
+        r = cached_get(
             URL,
-            headers = headers
+            headers = headers,
+            rate_limiter = rate_limiter(CATALOG_SCOPUS),
             )
-        self.__ts_last_req = time.time()
         self._status_code=r.status_code
         if r.status_code == 200:
             next_allowed = datetime.fromtimestamp(int(r.headers.get("X-RateLimit-Reset", 0)))
@@ -161,53 +152,131 @@ def get_scopus_publication_data(scopus_id=None, doi=None, log_data=False):
     return result
 
 
-def get_scopus_publications(identifier):
+def get_scopus_publications(identifier, since=None):
+    """Publications of the author, or if `since` is given, only
+    those loaded or updated in Scopus after that date.
+    """
     logging.debug('started')
 
     if not current_app.config['SCOPUS_ENABLED']:
         logging.warning('SCOPUS Not Enabled')
         return []
     
-    search_results = DocumentSearch(identifier)
+    search_results = DocumentSearch(identifier, since=since)
     search_results.execute(_client(), get_all=True)
 
     result = []
 
     for p in search_results.results:
-        id = p.get(u'dc:identifier', ':').split(':')[1]
+        if pd := _get_search_publication_data(p, 'get_scopus_publications'):
+            result.append(pd)
 
-        if not id:
-            # SCOPUS sends an "Empty Set" result as opposed to no results
-            continue
+    return result
+
+
+def _get_search_publication_data(p, action):
+    id = p.get(u'dc:identifier', ':').split(':')[1]
+
+    if not id:
+        # SCOPUS sends an "Empty Set" result as opposed to no results
+        return None
+
+    return PublicationData(
+        catalog='scopus',
+        catalog_identifier=id,
+        href=_get_scopus_publication_link(p),
+        doi=p.get(u'prism:doi', ''),
+        title=p.get(u'dc:title', ''),
+        journal_name=p.get(u'prism:publicationName', ''),
+        publication_cover_date=parse_date(p.get(u'prism:coverDate', '')),
+        abstract_text=p.get(u'dc:description', ''),
+        funding_text='',
+        funding_list=[],
+        volume=p.get(u'prism:volume', ''),
+        issue=p.get(u'prism:issueIdentifier', ''),
+        pages=p.get(u'prism:pageRange', ''),
+        subtype_code=p.get(u'subtype', ''),
+        subtype_description=p.get(u'subtypeDescription', ''),
+        cited_by_count=int(p.get(u'citedby-count', '0')),
+        authors=[_translate_publication_author(a, action) for a in p.get('author', [])],
+        keywords=set(p.get(u'authkeywords', '').split('|')),
+        is_open_access=p.get(u'openaccess', '0') == "1",
+        raw_text=json.dumps(p, sort_keys=True, indent=4),
+        action=action,
+    )
+
+
+def _search_entry_cache_key(scopus_id=None, doi=None):
+    if scopus_id:
+        return f'https://api.elsevier.com/content/search/scopus/entry/scopus_id/{scopus_id.lower()}'
+    else:
+        return f'https://api.elsevier.com/content/search/scopus/entry/doi/{doi.lower()}'
+
+
+def get_scopus_publication_search_datas(scopus_ids=None, dois=None):
+    """Finds publications SCOPUS_SEARCH_BATCH_SIZE at a time using
+    the Scopus search API rather than retrieving each abstract.
+
+    Returns a dictionary keyed by the lower case Scopus ID and DOI.
+    The search results do not include the funding text, funding
+    agencies or publication date parts; where these are needed use
+    `get_scopus_publication_data`.
+    """
+    logging.debug('started')
+
+    if not current_app.config['SCOPUS_ENABLED']:
+        logging.warning('SCOPUS Not Enabled')
+        return {}
 
-        result.append(
-            PublicationData(
-                catalog='scopus',
-                catalog_identifier=id,
-                href=_get_scopus_publication_link(p),
-                doi=p.get(u'prism:doi', ''),
-                title=p.get(u'dc:title', ''),
-                journal_name=p.get(u'prism:publicationName', ''),
-                publication_cover_date=parse_date(p.get(u'prism:coverDate', '')),
-                abstract_text=p.get(u'dc:description', ''),
-                funding_text='',
-                funding_list=[],
-                volume=p.get(u'prism:volume', ''),
-                issue=p.get(u'prism:issueIdentifier', ''),
-                pages=p.get(u'prism:pageRange', ''),
-                subtype_code=p.get(u'subtype', ''),
-                subtype_description=p.get(u'subtypeDescription', ''),
-                cited_by_count=int(p.get(u'citedby-count', '0')),
-                authors=[_translate_publication_author(a, 'get_scopus_publications') for a in p.get('author', [])],
-                keywords=set(p.get(u'authkeywords', '').split('|')),
-                is_open_access=p.get(u'openaccess', '0') == "1",
-                raw_text=json.dumps(p, sort_keys=True, indent=4),
-                action='get_scopus_publications',
-            ))
+    identifiers = [('scopus_id', i) for i in dict.fromkeys(filter(None, scopus_ids or []))]
+    identifiers += [('doi', d) for d in dict.fromkeys(filter(None, dois or []))]
+
+    result = {}
+
+    for i in range(0, len(identifiers), SCOPUS_SEARCH_BATCH_SIZE):
+        batch = identifiers[i:i + SCOPUS_SEARCH_BATCH_SIZE]
+
+        search_results = IdentifierSearch(
+            scopus_ids=[v for k, v in batch if k == 'scopus_id'],
+            dois=[v for k, v in batch if k == 'doi'],
+        )
+        search_results.execute(_client(), get_all=True)
+
+        for p in search_results.results:
+            pd = _get_search_publication_data(p, 'get_scopus_publication_search_datas')
+
+            if not pd:
+                continue
+
+            store(_search_entry_cache_key(scopus_id=pd.catalog_identifier), json.dumps(p))
+            result[pd.catalog_identifier.lower()] = pd
+
+            if pd.doi:
+                store(_search_entry_cache_key(doi=pd.doi), json.dumps(p))
+                result[pd.doi.lower()] = pd
 
     return result
 
 
+def get_scopus_publication_search_data(scopus_id=None, doi=None):
+    """Single publication version of `get_scopus_publication_search_datas`,
+    which uses the results of an earlier batch if they are in the cache.
+    """
+    if not current_app.config['SCOPUS_ENABLED']:
+        logging.warning('SCOPUS Not Enabled')
+        return None
+
+    if cached := lookup(_search_entry_cache_key(scopus_id=scopus_id, doi=doi)):
+        return _get_search_publication_data(json.loads(cached), 'get_scopus_publication_search_data')
+
+    results = get_scopus_publication_search_datas(
+        scopus_ids=[scopus_id] if scopus_id else [],
+        dois=[doi] if doi and not scopus_id else [],
+    )
+
+    return results.get((scopus_id or doi).lower())
+
+
 def _translate_publication_author(author_dict, action):
 
     afils = ensure_list(author_dict.get('afid'))
@@ -637,12 +706,26 @@ class Abstract(AbsDoc):
             return False
 
 
+class IdentifierSearch(ElsSearch):
+    def __init__(self, scopus_ids=None, dois=None):
+        q = ' OR '.join(
+            [f'EID(2-s2.0-{i})' for i in scopus_ids or []] +
+            [f'DOI("{d}")' for d in dois or []]
+        )
+
+        super().__init__(query=q, index='scopus')
+        self._uri += '&view=complete'
+
+
 class DocumentSearch(ElsSearch):
-    def __init__(self, identifier):
+    def __init__(self, identifier, since=None):
         q = f'au-id({identifier})'
 
         if not current_app.config['LOAD_OLD_PUBLICATIONS']:
             q = f'{q} AND PUBYEAR > {current_app.config["HISTORIC_PUBLICATION_CUTOFF"].year - 1}'
 
+        if since:
+            q = f'{q} AND LOAD-DATE AFT {since:%Y%m%d}'
+
         super().__init__(query=q, index='scopus')
         self._uri += '&view=complete'
@@ -1,10 +1,59 @@
 import os
+import tempfile
 from lbrc_flask.config import BaseConfig, BaseTestConfig
 from lbrc_flask.validators import parse_date
 
 
 class SharedConfig:
     HISTORIC_PUBLICATION_CUTOFF = parse_date(os.environ["HISTORIC_PUBLICATION_CUTOFF"])
+    PUBLICATION_SAVE_BATCH_SIZE = int(os.environ.get("PUBLICATION_SAVE_BATCH_SIZE", 500))
+    CATALOG_PUBLICATION_STALE_DAYS = int(os.environ.get("CATALOG_PUBLICATION_STALE_DAYS", 30))
+
+    HTTP_CACHE_ENABLED = os.environ.get("HTTP_CACHE_ENABLED", 'True').lower() == 'true'
+    HTTP_CACHE_PATH = os.environ.get("HTTP_CACHE_PATH", os.path.join(tempfile.gettempdir(), 'academics_http_cache.db'))
+    HTTP_CACHE_MAX_BYTES = int(os.environ.get("HTTP_CACHE_MAX_BYTES", 1024 * 1024 * 1024))
+    HTTP_CACHE_TTLS = {
+        'abstract': int(os.environ.get("HTTP_CACHE_TTL_ABSTRACT", 60 * 60 * 24)),
+        'author': int(os.environ.get("HTTP_CACHE_TTL_AUTHOR", 60 * 60 * 24)),
+        'affiliation': int(os.environ.get("HTTP_CACHE_TTL_AFFILIATION", 60 * 60 * 24 * 7)),
+        'search': int(os.environ.get("HTTP_CACHE_TTL_SEARCH", 60 * 60)),
+        'scival_institution': int(os.environ.get("HTTP_CACHE_TTL_SCIVAL_INSTITUTION", 60 * 60 * 24 * 7)),
+        'scival_publication': int(os.environ.get("HTTP_CACHE_TTL_SCIVAL_PUBLICATION", 60 * 60 * 24)),
+        'other': int(os.environ.get("HTTP_CACHE_TTL_OTHER", 60 * 60)),
+    }
+
+    RESULT_CACHE_ENABLED = os.environ.get("RESULT_CACHE_ENABLED", 'True').lower() == 'true'
+    RESULT_CACHE_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+    SOURCE_FULL_SYNC_DAYS = int(os.environ.get("SOURCE_FULL_SYNC_DAYS", 30))
+    SOURCE_SYNC_OVERLAP_DAYS = int(os.environ.get("SOURCE_SYNC_OVERLAP_DAYS", 2))
+
+    JOB_CLAIM_SECONDS = int(os.environ.get("JOB_CLAIM_SECONDS", 5 * 60))
+    JOB_HEARTBEAT_SECONDS = int(os.environ.get("JOB_HEARTBEAT_SECONDS", 30))
+    JOB_POLL_SECONDS = int(os.environ.get("JOB_POLL_SECONDS", 5))
+    JOB_TELEMETRY_RETENTION_DAYS = int(os.environ.get("JOB_TELEMETRY_RETENTION_DAYS", 30))
+    JOB_BACKLOG_SAMPLE_SECONDS = int(os.environ.get("JOB_BACKLOG_SAMPLE_SECONDS", 5 * 60))
+
+    FETCH_MAX_WORKERS = int(os.environ.get("FETCH_MAX_WORKERS", 8))
+    FETCH_PREFETCH_SIZE = int(os.environ.get("FETCH_PREFETCH_SIZE", 50))
+
+    EXPORT_ARTIFACT_PATH = os.environ.get("EXPORT_ARTIFACT_PATH", os.path.join(tempfile.gettempdir(), 'academics_exports'))
+    EXPORT_ARTIFACT_EXPIRY_HOURS = int(os.environ.get("EXPORT_ARTIFACT_EXPIRY_HOURS", 24))
+    EXPORT_MAX_WORKERS = int(os.environ.get("EXPORT_MAX_WORKERS", os.cpu_count() or 1))
+
+    RATE_LIMIT_PATH = os.environ.get("RATE_LIMIT_PATH", os.path.join(tempfile.gettempdir(), 'academics_rate_limit.db'))
+    RATE_LIMIT_MAX_WAIT = int(os.environ.get("RATE_LIMIT_MAX_WAIT", 60 * 60))
+    RATE_LIMITS = {
+        'scopus': float(os.environ.get("SCOPUS_RATE_LIMIT", 2)),
+        'scival': float(os.environ.get("SCIVAL_RATE_LIMIT", 2)),
+        'open alex': float(os.environ.get("OPEN_ALEX_RATE_LIMIT", 10)),
+    }
+
+    SQL_PROFILING_ENABLED = os.environ.get("SQL_PROFILING_ENABLED", 'False').lower() == 'true'
+    SQL_PROFILING_SLOW_REQUEST_MS = int(os.environ.get("SQL_PROFILING_SLOW_REQUEST_MS", 500))
+    SQL_PROFILING_REPEAT_THRESHOLD = int(os.environ.get("SQL_PROFILING_REPEAT_THRESHOLD", 5))
+    SQL_PROFILING_EXPLAIN_COUNT = int(os.environ.get("SQL_PROFILING_EXPLAIN_COUNT", 3))
+    SQL_PROFILING_RETENTION_DAYS = int(os.environ.get("SQL_PROFILING_RETENTION_DAYS", 30))
 
 class Config(BaseConfig, SharedConfig):
     SCOPUS_API_KEY = os.environ["SCOPUS_API_KEY"]
@@ -13,8 +62,11 @@ class Config(BaseConfig, SharedConfig):
     WORKER_STOPS_ON_ERROR = os.environ.get("WORKER_STOPS_ON_ERROR", 'False').lower() == 'true'
     OPEN_ALEX_EMAIL = os.environ["OPEN_ALEX_EMAIL"]
     OPEN_ALEX_ENABLED = os.environ.get("OPEN_ALEX_ENABLED", 'True').lower() == 'true'
+    OPEN_ALEX_INCREMENTAL_SYNC = os.environ.get("OPEN_ALEX_INCREMENTAL_SYNC", 'False').lower() == 'true'
     LOAD_OLD_PUBLICATIONS = os.environ.get("LOAD_OLD_PUBLICATIONS", 'False').lower() == 'true'
 
 
 class TestConfig(BaseTestConfig, SharedConfig):
-    ...
\ No newline at end of file
+    OPEN_ALEX_INCREMENTAL_SYNC = False
+    HTTP_CACHE_ENABLED = False
+    RESULT_CACHE_ENABLED = False
\ No newline at end of file
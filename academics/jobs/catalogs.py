@@ -1,22 +1,34 @@
+import json
 import logging
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from dateutil.relativedelta import relativedelta
 from unidecode import unidecode
 from itertools import chain, groupby
-from lbrc_flask.async_jobs import AsyncJob, AsyncJobs
+from lbrc_flask.async_jobs import AsyncJob
 from lbrc_flask.database import db
 from flask import current_app
-from sqlalchemy import delete, select
-from academics.services.publication_searching import manual_only_catalog_publications
-from academics.services.sources import create_potential_sources
+from sqlalchemy import or_, select
+from academics.jobs.publications import PublicationSummaryRefresh
+from academics.jobs.scheduling import log_coalesced_jobs, schedule
+from academics.services import bulk
+from academics.services.institutions import institution_publication_ids, update_publication_collaborations
+from academics.services.publication_searching import manual_only_catalog_publications, update_best_catalog_publications
+from academics.services.publication_summary import update_publication_summaries
+from academics.services.text_searching import update_catalog_publication_search, update_catalog_publication_search_for_sources
+from academics.services.sources import create_potential_sources, source_publications_fetch_since
 from academics.catalogs.data_classes import CatalogReference
+from academics.catalogs.fetching import get_affiliation_datas, get_author_datas, get_author_publications, get_publication_search_datas, get_scopus_publication_search_datas_for_dois, prefetch, prefetched_keys
+from academics.catalogs.http_cache import response_cache
 from academics.catalogs.open_alex import get_open_alex_affiliation_data, get_open_alex_author_data, get_open_alex_publication_data, get_openalex_publications, open_alex_similar_authors
 from academics.catalogs.scival import get_scival_institution, get_scival_publication_institutions
-from academics.catalogs.scopus import get_scopus_affiliation_data, get_scopus_author_data, get_scopus_publication_data, get_scopus_publications, scopus_similar_authors
+from academics.catalogs.scopus import get_scopus_affiliation_data, get_scopus_author_data, get_scopus_publication_data, get_scopus_publication_search_data, get_scopus_publications, scopus_similar_authors
 from academics.model.academic import Academic, AcademicPotentialSource, Affiliation, Source, CatalogPublicationsSources, catalog_publications_sources_affiliations, Affiliation, Source
 from academics.model.catalog import CATALOG_MANUAL, CATALOG_OPEN_ALEX, CATALOG_SCIVAL, CATALOG_SCOPUS
 from academics.model.institutions import Institution
-from academics.model.publication import CatalogPublication, NihrAcknowledgement, Journal, Keyword, Publication, Sponsor, Subtype
+from academics.model.job import LANE_SCIVAL, LANE_SCOPUS, catalog_lane
+from academics.model.publication import CatalogPublication, NihrAcknowledgement, Journal, Keyword, Publication, Sponsor, Subtype, catalog_publications_keywords, catalog_publications_sponsors
 from lbrc_flask.validators import parse_date
 from academics.model.raw_data import RawData
 
@@ -33,7 +45,7 @@ def _journal_xref_for_publication_data_list(publication_datas):
     new_journals = [Journal(name=n) for n in unique_names if unidecode(n).lower() not in xref.keys()]
 
     db.session.add_all(new_journals)
-    db.session.commit()
+    db.session.flush()
 
     xref = xref | {j.name.lower(): j.id for j in new_journals}
 
@@ -52,7 +64,7 @@ def _subtype_xref_for_publication_data_list(publication_datas):
     new_subtypes = [Subtype(code=d, description=d) for d in descs if d.lower() not in xref.keys()]
 
     db.session.add_all(new_subtypes)
-    db.session.commit()
+    db.session.flush()
 
     xref = xref | {st.description.lower(): st.id for st in new_subtypes}
 
@@ -93,8 +105,8 @@ def _publication_xref_for_pub_data_with_doi(pub_data):
 
     for np in new_pubs.values():
         db.session.add(np)
-        db.session.commit()
-        AsyncJobs.schedule(PublicationInitialise(np))
+        db.session.flush()
+        schedule(PublicationInitialise(np))
 
     return {CatalogReference(pd): new_pubs[pd.doi] for pd in pub_data}
     
@@ -105,8 +117,8 @@ def _publication_xref_for_pub_data_with_no_doi(pub_data):
     for pd in pub_data:
         new_pub = Publication(refresh_full_details=True)
         db.session.add(new_pub)
-        db.session.commit()
-        AsyncJobs.schedule(PublicationInitialise(new_pub))
+        db.session.flush()
+        schedule(PublicationInitialise(new_pub))
         result[CatalogReference(pd)] = new_pub
 
     return result
@@ -125,7 +137,7 @@ def _sponsor_xref_for_publication_data_list(publication_datas):
     new_sponsors = [Sponsor(name=u) for u in unique_names if u not in xref.keys()]
 
     db.session.add_all(new_sponsors)
-    db.session.commit()
+    db.session.flush()
 
     xref = xref | {unidecode(s.name).lower(): s for s in new_sponsors}
 
@@ -161,7 +173,7 @@ def _institutions(institution_datas):
             raw_text=i.raw_text,
         ))
         db.session.commit()
-        AsyncJobs.schedule(InstitutionRefresh(new_i))
+        schedule(InstitutionRefresh(new_i))
     
     db.session.commit()
 
@@ -180,7 +192,7 @@ def _keyword_xref_for_publication_data_list(publication_datas):
     new_keywords = [Keyword(keyword=u) for u in unique_keywords if u not in xref.keys()]
 
     db.session.add_all(new_keywords)
-    db.session.commit()
+    db.session.flush()
 
     xref = xref | {unidecode(k.keyword).lower(): k for k in new_keywords}
 
@@ -225,6 +237,7 @@ def _affiliation_xref_for_author_data_list(author_datas):
                 name=a.name,
                 address=a.address,
                 country=a.country,
+                fingerprint=a.fingerprint,
             ))
             db.session.add(RawData(
                 catalog=a.catalog,
@@ -234,10 +247,10 @@ def _affiliation_xref_for_author_data_list(author_datas):
             ))
 
         db.session.add_all(new_affiliations)
-        db.session.commit()
+        db.session.flush()
 
         for a in new_affiliations:
-            AsyncJobs.schedule(AffiliationRefresh(a))
+            schedule(AffiliationRefresh(a))
 
         xref = xref | {CatalogReference(a): a for a in new_affiliations}
 
@@ -303,14 +316,142 @@ def _source_xref_for_author_data_list(author_datas):
         ))
 
     db.session.add_all(new_sources)
-    db.session.commit()
+    db.session.flush()
 
     return xref | {CatalogReference(s): s for s in new_sources}
 
 
+@dataclass
+class PublicationSaveSummary:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __add__(self, other):
+        return PublicationSaveSummary(
+            inserted=self.inserted + other.inserted,
+            updated=self.updated + other.updated,
+            unchanged=self.unchanged + other.unchanged,
+        )
+
+
+CATALOG_PUBLICATION_SAVE_COLUMNS = [
+    'publication_id',
+    'doi',
+    'title',
+    'publication_cover_date',
+    'href',
+    'abstract',
+    'funding_text',
+    'volume',
+    'issue',
+    'pages',
+    'is_open_access',
+    'cited_by_count',
+    'journal_id',
+    'subtype_id',
+    'publication_year',
+    'publication_month',
+    'publication_day',
+    'publication_date_text',
+    'publication_period_start',
+    'publication_period_end',
+    'fingerprint',
+]
+
+
+def _publication_period(p):
+    if not p.publication_year:
+        return p.publication_cover_date, p.publication_cover_date
+    elif p.publication_day:
+        start = date(year=int(p.publication_year), month=int(p.publication_month), day=int(p.publication_day))
+        return start, start
+    elif p.publication_month:
+        start = date(year=int(p.publication_year), month=int(p.publication_month), day=1)
+        return start, start + relativedelta(months=1) - relativedelta(days=1)
+    else:
+        start = date(year=int(p.publication_year), month=1, day=1)
+        return start, (start + relativedelta(years=1)) - relativedelta(days=1)
+
+
+def _normalised_value(value):
+    if value is None:
+        return None
+    return str(value)
+
+
+def _existing_catalog_publications(publication_datas):
+    result = {}
+
+    keyfunc = lambda a: a.catalog
+
+    columns = [CatalogPublication.id, CatalogPublication.catalog, CatalogPublication.catalog_identifier] + [
+        getattr(CatalogPublication, c) for c in CATALOG_PUBLICATION_SAVE_COLUMNS
+    ]
+
+    for cat, pubs in groupby(sorted(publication_datas, key=keyfunc), key=keyfunc):
+        q = select(*columns).where(
+            CatalogPublication.catalog_identifier.in_([p.catalog_identifier for p in pubs])
+        ).where(
+            CatalogPublication.catalog == cat
+        )
+
+        result = result | {CatalogReference(cp): cp for cp in db.session.execute(q)}
+
+    return result
+
+
+def _unchanged_publication_datas(publication_datas):
+    result = set()
+
+    keyfunc = lambda a: a.catalog
+
+    for cat, pubs in groupby(sorted(publication_datas, key=keyfunc), key=keyfunc):
+        pubs = list(pubs)
+
+        q = select(
+            CatalogPublication.catalog,
+            CatalogPublication.catalog_identifier,
+            CatalogPublication.fingerprint,
+        ).where(
+            CatalogPublication.catalog_identifier.in_([p.catalog_identifier for p in pubs])
+        ).where(
+            CatalogPublication.catalog == cat
+        )
+
+        fingerprints = {CatalogReference(cp): cp.fingerprint for cp in db.session.execute(q)}
+
+        result |= {CatalogReference(p) for p in pubs if fingerprints.get(CatalogReference(p)) == p.fingerprint}
+
+    return result
+
+
 def save_publications(new_pubs):
     logging.info(len(new_pubs))
 
+    # Later entries for the same catalog publication win
+    new_pubs = list({CatalogReference(p): p for p in new_pubs}.values())
+
+    # Most refreshes return exactly what we already have, so
+    # don't rewrite publications whose content has not changed.
+    unchanged = _unchanged_publication_datas(new_pubs)
+    new_pubs = [p for p in new_pubs if CatalogReference(p) not in unchanged]
+
+    batch_size = current_app.config['PUBLICATION_SAVE_BATCH_SIZE']
+
+    summary = PublicationSaveSummary(unchanged=len(unchanged))
+
+    for i in range(0, len(new_pubs), batch_size):
+        summary += _save_publication_batch(new_pubs[i:i + batch_size])
+
+    logging.info(f'Publications saved: {summary}')
+
+    return summary
+
+
+def _save_publication_batch(new_pubs):
+    summary = PublicationSaveSummary()
+
     journal_xref = _journal_xref_for_publication_data_list(new_pubs)
     subtype_xref = _subtype_xref_for_publication_data_list(new_pubs)
     pubs_xref = _publication_xref_for_publication_data_list(new_pubs)
@@ -320,109 +461,284 @@ def save_publications(new_pubs):
 
     affiliation_xref = _affiliation_xref_for_author_data_list(chain.from_iterable([p.authors for p in new_pubs]))
 
+    existing = _existing_catalog_publications(new_pubs)
+
+    audit = bulk.audit_values(CatalogPublication)
+    rows = []
+    changed = set()
+
     for p in new_pubs:
         cpr = CatalogReference(p)
-        logging.info(f'Saving Publication {cpr}')
-
         pub = pubs_xref[cpr]
 
-        cat_pub = db.session.execute(
-            select(CatalogPublication)
-            .where(CatalogPublication.catalog == p.catalog)
-            .where(CatalogPublication.catalog_identifier == p.catalog_identifier)
-        ).scalar()
-
-        if not cat_pub:
-            cat_pub = CatalogPublication(
-                catalog=p.catalog,
-                catalog_identifier=p.catalog_identifier,
-                refresh_full_details=True,
-            )
+        period_start, period_end = _publication_period(p)
+
+        values = {
+            'publication_id': pub.id,
+            'doi': p.doi or '',
+            'title': p.title or '',
+            'publication_cover_date': p.publication_cover_date,
+            'href': p.href,
+            'abstract': p.abstract_text or '',
+            'funding_text': p.funding_text or '',
+            'volume': p.volume or '',
+            'issue': p.issue or '',
+            'pages': p.pages or '',
+            'is_open_access': p.is_open_access,
+            'cited_by_count': p.cited_by_count,
+            'journal_id': journal_xref[cpr],
+            'subtype_id': subtype_xref[cpr],
+            'publication_year': p.publication_year,
+            'publication_month': p.publication_month,
+            'publication_day': p.publication_day,
+            'publication_date_text': p.publication_date_text,
+            'publication_period_start': period_start,
+            'publication_period_end': period_end,
+            'fingerprint': p.fingerprint,
+        }
+
+        if cpr not in existing:
+            summary.inserted += 1
+        elif any(_normalised_value(getattr(existing[cpr], c)) != _normalised_value(v) for c, v in values.items()):
+            changed.add(cpr)
+
+        rows.append(audit | values | {
+            'catalog': p.catalog,
+            'catalog_identifier': p.catalog_identifier,
+            'refresh_full_details': True,
+        })
 
-        cat_pub.publication_id=pub.id
-        cat_pub.doi = p.doi or ''
-        cat_pub.title = p.title or ''
-        cat_pub.publication_cover_date = p.publication_cover_date
-        cat_pub.href = p.href
-        cat_pub.abstract = p.abstract_text or ''
-        cat_pub.funding_text = p.funding_text or ''
-        cat_pub.volume = p.volume or ''
-        cat_pub.issue = p.issue or ''
-        cat_pub.pages = p.pages or ''
-        cat_pub.is_open_access = p.is_open_access
-        cat_pub.cited_by_count = p.cited_by_count
-        cat_pub.journal_id = journal_xref[cpr]
-        cat_pub.subtype_id = subtype_xref[cpr]
-        cat_pub.sponsors = set(sponsor_xref[cpr])
-        cat_pub.keywords = set(keyword_xref[cpr])
-        cat_pub.publication_year = p.publication_year
-        cat_pub.publication_month = p.publication_month
-        cat_pub.publication_day = p.publication_day
-        cat_pub.publication_date_text = p.publication_date_text
-
-        if not p.publication_year:
-            cat_pub.publication_period_start = cat_pub.publication_period_end = cat_pub.publication_cover_date
-        elif p.publication_day:
-            cat_pub.publication_period_start = date(year=int(p.publication_year), month=int(p.publication_month), day=int(p.publication_day))
-            cat_pub.publication_period_end = cat_pub.publication_period_start
-        elif p.publication_month:
-            cat_pub.publication_period_start = date(year=int(p.publication_year), month=int(p.publication_month), day=1)
-            cat_pub.publication_period_end = cat_pub.publication_period_start + relativedelta(months=1) - relativedelta(days=1)
-        else:
-            cat_pub.publication_period_start = date(year=int(p.publication_year), month=1, day=1)
-            cat_pub.publication_period_end = (cat_pub.publication_period_start + relativedelta(years=1)) - relativedelta(days=1)
+        pub.validation_historic = (parse_date(p.publication_cover_date) < current_app.config['HISTORIC_PUBLICATION_CUTOFF'])
+        db.session.add(pub)
 
-        db.session.add(RawData(
-            catalog=cat_pub.catalog,
-            catalog_identifier=cat_pub.catalog_identifier,
+    bulk.upsert(
+        CatalogPublication,
+        rows,
+        index_elements=['catalog', 'catalog_identifier'],
+        update_columns=CATALOG_PUBLICATION_SAVE_COLUMNS + bulk.audit_update_columns(CatalogPublication),
+    )
+
+    cat_pub_ids = {cpr: cp.id for cpr, cp in _existing_catalog_publications(new_pubs).items()}
+
+    changed_ids = bulk.sync_links(
+        catalog_publications_sponsors,
+        'catalog_publication_id',
+        'sponsor_id',
+        {cat_pub_ids[CatalogReference(p)]: {s.id for s in sponsor_xref[CatalogReference(p)]} for p in new_pubs},
+    )
+    changed_ids |= bulk.sync_links(
+        catalog_publications_keywords,
+        'catalog_publication_id',
+        'keyword_id',
+        {cat_pub_ids[CatalogReference(p)]: {k.id for k in keyword_xref[CatalogReference(p)]} for p in new_pubs},
+    )
+
+    changed |= {cpr for cpr in existing.keys() if cat_pub_ids[cpr] in changed_ids}
+
+    update_best_catalog_publications(
+        {pubs_xref[CatalogReference(p)].id for p in new_pubs} | {cp.publication_id for cp in existing.values()}
+    )
+
+    summary.updated = len(changed)
+    summary.unchanged = len(existing) - summary.updated
+
+    _save_catalog_publication_sources(
+        {cat_pub_ids[CatalogReference(p)]: source_xref[CatalogReference(p)] for p in new_pubs},
+        affiliation_xref,
+    )
+
+    update_catalog_publication_search(cat_pub_ids.values())
+    update_publication_summaries(
+        {pubs_xref[CatalogReference(p)].id for p in new_pubs} | {cp.publication_id for cp in existing.values()}
+    )
+
+    db.session.add_all([
+        RawData(
+            catalog=p.catalog,
+            catalog_identifier=p.catalog_identifier,
             action=p.action,
             raw_text=p.raw_text,
-        ))
+        ) for p in new_pubs
+    ])
 
-        db.session.add(cat_pub)
+    # Only new publications need their full details loading.  Existing
+    # ones are refreshed when they become stale by CatalogPublicationRefreshStale.
+    cat_pubs = db.session.execute(
+        select(CatalogPublication)
+        .where(CatalogPublication.id.in_(cat_pub_ids.values()))
+        .where(CatalogPublication.refresh_full_details == True)
+        .execution_options(populate_existing=True)
+    ).scalars().all()
 
-        pub.validation_historic = (parse_date(p.publication_cover_date) < current_app.config['HISTORIC_PUBLICATION_CUTOFF'])
-        db.session.add(pub)
+    for cat_pub in cat_pubs:
+        schedule(CatalogPublicationRefresh(cat_pub))
 
-        db.session.commit()
+    db.session.commit()
 
-        AsyncJobs.schedule(CatalogPublicationRefresh(cat_pub))
+    return summary
 
-        # When there are lots of sources (authors) for a publication the
-        # saving and deleting of these sources (and their associated affiliations)
-        # causes SQLAlchemy to fall over, so I've split it up into different bits
 
-        db.session.execute(
-            delete(catalog_publications_sources_affiliations)
-            .where(CatalogPublicationsSources.id == catalog_publications_sources_affiliations.c.catalog_publications_sources_id)
-            .where(CatalogPublicationsSources.catalog_publication_id == cat_pub.id)
-        )
+def _save_catalog_publication_sources(sources_for_cat_pub_ids, affiliation_xref):
+    # When there are lots of sources (authors) for a publication the
+    # saving and deleting of these sources (and their associated affiliations)
+    # through the ORM causes SQLAlchemy to fall over, so the existing
+    # author list is compared with the new one and only the differences
+    # are written using bulk statements.
+
+    cat_pub_ids = list(sources_for_cat_pub_ids.keys())
+
+    existing = {}
+
+    for cps in db.session.execute(
+        select(
+            CatalogPublicationsSources.id,
+            CatalogPublicationsSources.catalog_publication_id,
+            CatalogPublicationsSources.ordinal,
+            CatalogPublicationsSources.source_id,
+        ).where(CatalogPublicationsSources.catalog_publication_id.in_(cat_pub_ids))
+    ):
+        existing[(cps.catalog_publication_id, cps.ordinal)] = cps
+
+    existing_affiliations = defaultdict(set)
+
+    for cps_id, affiliation_id in db.session.execute(
+        select(
+            catalog_publications_sources_affiliations.c.catalog_publications_sources_id,
+            catalog_publications_sources_affiliations.c.affiliation_id,
+        ).where(catalog_publications_sources_affiliations.c.catalog_publications_sources_id.in_(
+            select(CatalogPublicationsSources.id)
+            .where(CatalogPublicationsSources.catalog_publication_id.in_(cat_pub_ids))
+        ))
+    ):
+        existing_affiliations[cps_id].add(affiliation_id)
+
+    incoming = {}
+
+    for cat_pub_id, sources in sources_for_cat_pub_ids.items():
+        for i, s in enumerate(sources):
+            incoming[(cat_pub_id, i)] = (s.id, {a.id for a in affiliation_xref.get(CatalogReference(s), [])})
+
+    removed_ids = [cps.id for k, cps in existing.items() if k not in incoming]
+
+    updated = [
+        {'id': existing[k].id, 'source_id': source_id}
+        for k, (source_id, _) in incoming.items()
+        if k in existing and existing[k].source_id != source_id
+    ]
+
+    added = [
+        {'catalog_publication_id': cat_pub_id, 'ordinal': ordinal, 'source_id': source_id}
+        for (cat_pub_id, ordinal), (source_id, _) in incoming.items()
+        if (cat_pub_id, ordinal) not in existing
+    ]
+
+    bulk.delete_keys(catalog_publications_sources_affiliations, ['catalog_publications_sources_id'], removed_ids)
+    bulk.delete_keys(CatalogPublicationsSources, ['id'], removed_ids)
+    bulk.bulk_update(CatalogPublicationsSources, updated, 'id')
+    bulk.bulk_insert(CatalogPublicationsSources, added)
+
+    cps_ids = {k: cps.id for k, cps in existing.items()}
+
+    if added:
+        added_keys = {(a['catalog_publication_id'], a['ordinal']) for a in added}
+
+        for cps in db.session.execute(
+            select(
+                CatalogPublicationsSources.id,
+                CatalogPublicationsSources.catalog_publication_id,
+                CatalogPublicationsSources.ordinal,
+            ).where(CatalogPublicationsSources.catalog_publication_id.in_(
+                {cat_pub_id for cat_pub_id, _ in added_keys}
+            ))
+        ):
+            if (cps.catalog_publication_id, cps.ordinal) in added_keys:
+                cps_ids[(cps.catalog_publication_id, cps.ordinal)] = cps.id
+
+    affiliations_to_add = []
+    affiliations_to_remove = []
+
+    for k, (_, affiliation_ids) in incoming.items():
+        cps_id = cps_ids[k]
+        current = existing_affiliations.get(cps_id, set())
 
-        db.session.execute(
-            delete(CatalogPublicationsSources)
-            .where(CatalogPublicationsSources.catalog_publication_id == cat_pub.id)
+        affiliations_to_add.extend(
+            {'catalog_publications_sources_id': cps_id, 'affiliation_id': a}
+            for a in affiliation_ids - current
         )
+        affiliations_to_remove.extend((cps_id, a) for a in current - affiliation_ids)
+
+    bulk.delete_keys(
+        catalog_publications_sources_affiliations,
+        ['catalog_publications_sources_id', 'affiliation_id'],
+        affiliations_to_remove,
+    )
+    bulk.insert_ignore(catalog_publications_sources_affiliations, affiliations_to_add)
+
+
+def _prefetch_pending(job_class, model, fetch, since=None):
+    """Concurrently fetches the catalog data for jobs of the same type
+    that are due to run, so that they find it in the response cache
+    rather than each waiting for their own requests in turn.
+
+    If `since` is given, it is called for each entity to find the date
+    that the job will fetch its data from, so that the same requests
+    are made.
+
+    Nothing is prefetched without a response cache to hold the data,
+    or outside of a run of the jobs.
+    """
+    entities = [
+        e for e in _entities_to_prefetch(job_class, model)
+        if e.catalog in [CATALOG_SCOPUS, CATALOG_OPEN_ALEX] and e.catalog_identifier
+    ]
+
+    if not entities:
+        return
+
+    if since is None:
+        prefetch(fetch([CatalogReference(e) for e in entities]))
+    else:
+        prefetch(fetch(
+            [CatalogReference(e) for e in entities],
+            since={CatalogReference(e): since(e) for e in entities},
+        ))
 
-        catalog_publication_sources = []
 
-        for i, s in enumerate(source_xref[cpr]):
-            cps = CatalogPublicationsSources(
-                source=s,
-                catalog_publication=cat_pub,
-                ordinal=i,
-                affiliations=[],
-            )
-            cps.affiliations_delayed = affiliation_xref[CatalogReference(s)]
-            catalog_publication_sources.append(cps)
+def _entities_to_prefetch(job_class, model):
+    """Entities for due jobs of `job_class` that have not been
+    prefetched in this run, or none if there is no response cache
+    or no run.
+    """
+    prefetched = prefetched_keys()
 
-        db.session.add_all(catalog_publication_sources)
-        db.session.commit()
+    if response_cache() is None or prefetched is None:
+        return []
 
-        for c in catalog_publication_sources:
-            c.affiliations=c.affiliations_delayed
+    return _pending_entities(job_class, model, prefetched)
 
-        db.session.add_all(catalog_publication_sources)
-        db.session.commit()
+
+def _pending_entities(job_class, model, prefetched):
+    """Entities for due jobs of `job_class` that are not in
+    `prefetched`, which they are then added to.
+    """
+    job_type = job_class.__mapper_args__['polymorphic_identity']
+
+    entity_ids = db.session.execute(
+        select(AsyncJob.entity_id)
+        .where(AsyncJob.job_type == job_type)
+        .where(AsyncJob.scheduled <= datetime.now(timezone.utc))
+        .order_by(AsyncJob.scheduled)
+        .limit(current_app.config['FETCH_PREFETCH_SIZE'])
+    ).scalars().all()
+
+    entity_ids = [id for id in entity_ids if (job_type, id) not in prefetched]
+
+    if not entity_ids:
+        return []
+
+    prefetched.update((job_type, id) for id in entity_ids)
+
+    return db.session.execute(select(model).where(model.id.in_(entity_ids))).scalars().all()
 
 
 class RefreshAll(AsyncJob):
@@ -437,10 +753,17 @@ class RefreshAll(AsyncJob):
         )
 
     def _run_actual(self):
+        # Report on the previous refresh cycle
+        log_coalesced_jobs()
+
         for academic in db.session.execute(select(Academic)).scalars():
-            AsyncJobs.schedule(AcademicRefresh(academic))
+            schedule(AcademicRefresh(academic))
+
+        schedule(CatalogPublicationRefreshStale())
 
-        AsyncJobs.schedule(ManaualCatalogPublicationsFindScopus())
+        schedule(ManaualCatalogPublicationsFindScopus())
+
+        schedule(PublicationSummaryRefresh())
 
 
 class ManaualCatalogPublicationsFindScopus(AsyncJob):
@@ -456,7 +779,7 @@ class ManaualCatalogPublicationsFindScopus(AsyncJob):
 
     def _run_actual(self):
         for cp in db.session.execute(manual_only_catalog_publications()).scalars():
-            AsyncJobs.schedule(PublicationGetMissingScopus(cp.publication))
+            schedule(PublicationGetMissingScopus(cp.publication))
 
 
 class AffiliationRefresh(AsyncJob):
@@ -473,8 +796,11 @@ class AffiliationRefresh(AsyncJob):
             retry_timedelta_period='days',
             retry_timedelta_size='7',
         )
+        self.lane = catalog_lane(affiliation.catalog)
 
     def _run_actual(self):
+        _prefetch_pending(AffiliationRefresh, Affiliation, get_affiliation_datas)
+
         affiliation = db.session.execute(select(Affiliation).where(Affiliation.id == self.entity_id)).scalar_one_or_none()
 
         if not affiliation:
@@ -487,7 +813,7 @@ class AffiliationRefresh(AsyncJob):
         if affiliation.catalog == CATALOG_OPEN_ALEX:
             aff_data = get_open_alex_affiliation_data(affiliation.catalog_identifier)
 
-        if aff_data:
+        if aff_data and aff_data.fingerprint != affiliation.fingerprint:
             aff_data.update_affiliation(affiliation)
 
             db.session.add(affiliation)
@@ -513,7 +839,7 @@ class InstitutionRefreshAll(AsyncJob):
         ).scalars()
 
         for i in insts:
-            AsyncJobs.schedule(InstitutionRefresh(i))
+            schedule(InstitutionRefresh(i))
 
 
 class InstitutionRefresh(AsyncJob):
@@ -521,6 +847,8 @@ class InstitutionRefresh(AsyncJob):
         "polymorphic_identity": "InstitutionRefresh",
     }
 
+    lane = LANE_SCIVAL
+
     def __init__(self, institution):
         db.session.refresh(institution)
         super().__init__(
@@ -545,9 +873,18 @@ class InstitutionRefresh(AsyncJob):
         if not institution_data:
             logging.warning(f'Institution not found {institution.catalog_identifier}')
 
+        collaboration_details = (institution.sector, institution.country_code, institution.home_institution)
+
         institution_data.update_institution(institution)
 
         db.session.add(institution)
+        db.session.flush()
+
+        if collaboration_details != (institution.sector, institution.country_code, institution.home_institution):
+            publication_ids = institution_publication_ids([institution.id])
+            update_publication_collaborations(publication_ids)
+            update_publication_summaries(publication_ids)
+
         db.session.commit()
 
 
@@ -556,6 +893,8 @@ class PublicationGetMissingScopus(AsyncJob):
         "polymorphic_identity": "PublicationGetMissingScopus",
     }
 
+    lane = LANE_SCOPUS
+
     def __init__(self, publication):
         db.session.refresh(publication)
         super().__init__(
@@ -567,14 +906,20 @@ class PublicationGetMissingScopus(AsyncJob):
         )
 
     def _run_actual(self):
+        # Most manual publications are not in Scopus, so find out which
+        # are using batched searches before retrieving the full details.
+        if dois := [p.doi for p in _entities_to_prefetch(PublicationGetMissingScopus, Publication) if p.doi]:
+            prefetch(get_scopus_publication_search_datas_for_dois(dois))
+
         publication = db.session.execute(select(Publication).where(Publication.id == self.entity_id)).scalar_one_or_none()
 
         if not publication:
             return
 
         if not publication.scopus_catalog_publication and publication.doi:
-            if pub_data := get_scopus_publication_data(doi=publication.doi):
-                save_publications([pub_data])
+            if search_data := get_scopus_publication_search_data(doi=publication.doi):
+                if pub_data := get_scopus_publication_data(scopus_id=search_data.catalog_identifier):
+                    save_publications([pub_data])
 
 
 class PublicationGetScivalInstitutions(AsyncJob):
@@ -582,6 +927,8 @@ class PublicationGetScivalInstitutions(AsyncJob):
         "polymorphic_identity": "PublicationGetScivalInstitutions",
     }
 
+    lane = LANE_SCIVAL
+
     def __init__(self, publication):
         db.session.refresh(publication)
         super().__init__(
@@ -600,6 +947,10 @@ class PublicationGetScivalInstitutions(AsyncJob):
         if publication.scopus_catalog_publication and not publication.institutions:
             institutions = get_scival_publication_institutions(publication.scopus_catalog_publication.catalog_identifier)
             publication.institutions = set(_institutions(institutions))
+            publication.set_collaboration_flags()
+            db.session.flush()
+
+            update_publication_summaries([publication.id])
 
 
 class PublicationInitialise(AsyncJob):
@@ -628,11 +979,14 @@ class PublicationInitialise(AsyncJob):
         publication.set_strict_from_guess()
 
         db.session.add(publication)
+        db.session.flush()
+
+        update_publication_summaries([publication.id])
         db.session.commit()
 
         if publication.scopus_catalog_publication is None:
-            AsyncJobs.schedule(PublicationGetMissingScopus(publication))
-        AsyncJobs.schedule(PublicationGetScivalInstitutions(publication))
+            schedule(PublicationGetMissingScopus(publication))
+        schedule(PublicationGetScivalInstitutions(publication))
 
 
 class PublicationReGuessStatus(AsyncJob):
@@ -658,6 +1012,8 @@ class PublicationReGuessStatus(AsyncJob):
             .where(Publication.nihr_acknowledgement_id == None)
         ).scalars()
 
+        publication_ids = []
+
         i = 0
         for p in pubs:
             if p.is_supplementary:
@@ -666,9 +1022,54 @@ class PublicationReGuessStatus(AsyncJob):
                 p.auto_nihr_acknowledgement_id = p.nihr_acknowledgement_id = NihrAcknowledgement.get_supplementary_status().id
             p.strict_nihr_acknowledgement_match = NihrAcknowledgement.get_strict_match(p.best_catalog_publication.funding_text)
             db.session.add(p)
+            publication_ids.append(p.id)
+        db.session.flush()
+
+        update_publication_summaries(publication_ids)
         db.session.commit()
 
 
+def _stale_before():
+    return datetime.now(timezone.utc) - relativedelta(days=current_app.config['CATALOG_PUBLICATION_STALE_DAYS'])
+
+
+def _catalog_publication_needs_refresh(catalog_publication):
+    if catalog_publication.refresh_full_details:
+        return True
+
+    last_refreshed = catalog_publication.last_refreshed_datetime
+
+    if last_refreshed is None:
+        return True
+
+    if last_refreshed.tzinfo is None:
+        last_refreshed = last_refreshed.replace(tzinfo=timezone.utc)
+
+    return last_refreshed < _stale_before()
+
+
+def _needs_full_scopus_details(catalog_publication, search_data):
+    """The Scopus search results do not contain the funding or
+    publication date details, so the full abstract is only retrieved
+    when these have not been loaded or the funding looks to be missing.
+    """
+    if catalog_publication.refresh_full_details:
+        return True
+
+    has_funding = 'fund-sponsor' in json.loads(search_data.raw_text or '{}')
+
+    return has_funding and not catalog_publication.funding_text
+
+
+def _keep_full_scopus_details(catalog_publication, search_data):
+    search_data.funding_text = catalog_publication.funding_text
+    search_data.funding_list = {s.name for s in catalog_publication.sponsors}
+    search_data.publication_year = catalog_publication.publication_year
+    search_data.publication_month = catalog_publication.publication_month
+    search_data.publication_day = catalog_publication.publication_day
+    search_data.publication_date_text = catalog_publication.publication_date_text
+
+
 class CatalogPublicationRefresh(AsyncJob):
     __mapper_args__ = {
         "polymorphic_identity": "CatalogPublicationRefresh",
@@ -683,18 +1084,37 @@ class CatalogPublicationRefresh(AsyncJob):
             retry_timedelta_period='days',
             retry_timedelta_size='1',
         )
+        self.lane = catalog_lane(catalog_publication.catalog)
 
     def _run_actual(self):
+        _prefetch_pending(CatalogPublicationRefresh, CatalogPublication, get_publication_search_datas)
+
         catalog_publication = db.session.execute(select(CatalogPublication).where(CatalogPublication.id == self.entity_id)).scalar_one_or_none()
         if not catalog_publication:
             return
 
+        if not _catalog_publication_needs_refresh(catalog_publication):
+            logging.info(f'Catalog publication {catalog_publication.id} refreshed recently')
+            return
+
         pub_data = None
         if catalog_publication.catalog == CATALOG_SCOPUS:
-            pub_data = get_scopus_publication_data(scopus_id=catalog_publication.catalog_identifier)
+            pub_data = get_scopus_publication_search_data(scopus_id=catalog_publication.catalog_identifier)
+
+            if pub_data and _needs_full_scopus_details(catalog_publication, pub_data):
+                pub_data = get_scopus_publication_data(scopus_id=catalog_publication.catalog_identifier)
+            elif pub_data:
+                _keep_full_scopus_details(catalog_publication, pub_data)
         if catalog_publication.catalog == CATALOG_OPEN_ALEX:
             pub_data = get_open_alex_publication_data(catalog_publication.catalog_identifier)
 
+        # Mark as refreshed before saving so that saving the
+        # publication does not schedule another refresh of it.
+        catalog_publication.refresh_full_details = False
+        catalog_publication.last_refreshed_datetime = datetime.now(timezone.utc)
+        db.session.add(catalog_publication)
+        db.session.flush()
+
         if pub_data:
             save_publications([pub_data])
 
@@ -702,6 +1122,34 @@ class CatalogPublicationRefresh(AsyncJob):
         db.session.commit()
 
 
+class CatalogPublicationRefreshStale(AsyncJob):
+    __mapper_args__ = {
+        "polymorphic_identity": "CatalogPublicationRefreshStale",
+    }
+
+    def __init__(self):
+        super().__init__(
+            scheduled=datetime.now(timezone.utc),
+            retry=False,
+        )
+
+    def _run_actual(self):
+        q = (
+            select(CatalogPublication)
+            .where(CatalogPublication.catalog.in_([CATALOG_SCOPUS, CATALOG_OPEN_ALEX]))
+            .where(or_(
+                CatalogPublication.refresh_full_details == True,
+                CatalogPublication.last_refreshed_datetime == None,
+                CatalogPublication.last_refreshed_datetime < _stale_before(),
+            ))
+        )
+
+        for cp in db.session.execute(q).scalars():
+            schedule(CatalogPublicationRefresh(cp))
+
+        db.session.commit()
+
+
 class SourceRefresh(AsyncJob):
     __mapper_args__ = {
         "polymorphic_identity": "SourceRefresh",
@@ -716,8 +1164,11 @@ class SourceRefresh(AsyncJob):
             retry_timedelta_period='days',
             retry_timedelta_size='1',
         )
+        self.lane = catalog_lane(source.catalog)
 
     def _run_actual(self):
+        _prefetch_pending(SourceRefresh, Source, get_author_datas)
+
         source = db.session.execute(select(Source).where(Source.id == self.entity_id)).scalar_one_or_none()
         if not source:
             return
@@ -729,21 +1180,29 @@ class SourceRefresh(AsyncJob):
         if source.catalog == CATALOG_OPEN_ALEX:
             author_data = get_open_alex_author_data(source.catalog_identifier)
 
-        if author_data and CatalogReference(source) == CatalogReference(author_data):
+        if author_data and CatalogReference(source) == CatalogReference(author_data) and author_data.fingerprint == source.fingerprint:
+            logging.info(f'Source {source.display_name} unchanged')
+        elif author_data and CatalogReference(source) == CatalogReference(author_data):
             _source_xref_for_author_data_list([author_data])
             affiliation_xref = _affiliation_xref_for_author_data_list([author_data])
 
             if CatalogReference(source) in affiliation_xref:
                 source.affiliations = affiliation_xref[CatalogReference(source)]
 
+            names = (source.first_name, source.last_name, source.display_name)
+
             author_data.update_source(source)
+
+            # The search text of its publications includes the names of the source
+            if names != (source.first_name, source.last_name, source.display_name):
+                update_catalog_publication_search_for_sources([source.id])
         else:
             logging.warning(f'Source {source.display_name} not found so setting it to be in error')
             source.error = True
 
         db.session.add(source)
         db.session.commit()
-        AsyncJobs.schedule(SourceGetPublications(source))
+        schedule(SourceGetPublications(source))
 
 
 class SourceGetPublications(AsyncJob):
@@ -760,18 +1219,24 @@ class SourceGetPublications(AsyncJob):
             retry_timedelta_period='days',
             retry_timedelta_size='1',
         )
+        self.lane = catalog_lane(source.catalog)
 
     def _run_actual(self):
+        _prefetch_pending(SourceGetPublications, Source, get_author_publications, since=source_publications_fetch_since)
+
         source = db.session.execute(select(Source).where(Source.id == self.entity_id)).scalar_one_or_none()
         if not source or not source.academic:
             return
 
+        fetched = datetime.now(timezone.utc)
+        since = source_publications_fetch_since(source)
+
         publication_datas = []
 
         if source.catalog == CATALOG_SCOPUS:
-            publication_datas = get_scopus_publications(source.catalog_identifier)
+            publication_datas = get_scopus_publications(source.catalog_identifier, since=since)
         if source.catalog == CATALOG_OPEN_ALEX:
-            publication_datas = get_openalex_publications(source.catalog_identifier)
+            publication_datas = get_openalex_publications(source.catalog_identifier, since=since)
 
         existing = set()
 
@@ -790,7 +1255,10 @@ class SourceGetPublications(AsyncJob):
 
         save_publications(new_pubs)
 
-        source.last_fetched_datetime = datetime.now(timezone.utc)
+        source.last_fetched_datetime = fetched
+
+        if since is None:
+            source.last_full_fetched_datetime = fetched
 
         db.session.add(source)
         db.session.commit()
@@ -843,12 +1311,12 @@ class AcademicRefresh(AsyncJob):
         if not academic:
             return
 
-        AsyncJobs.schedule(AcademicFindNewPotentialSources(academic))
-        AsyncJobs.schedule(AcademicEnsureSourcesArePotential(academic))
+        schedule(AcademicFindNewPotentialSources(academic))
+        schedule(AcademicEnsureSourcesArePotential(academic))
 
         for s in academic.sources:
-            AsyncJobs.schedule(SourceRefresh(s))
-            AsyncJobs.schedule(SourceGetPublications(s))
+            schedule(SourceRefresh(s))
+            schedule(SourceGetPublications(s))
 
 
 class AcademicFindNewPotentialSources(AsyncJob):
@@ -856,6 +1324,8 @@ class AcademicFindNewPotentialSources(AsyncJob):
         "polymorphic_identity": "AcademicFindNewPotentialSources",
     }
 
+    lane = LANE_SCOPUS
+
     def __init__(self, academic):
         db.session.refresh(academic)
         super().__init__(
@@ -0,0 +1,143 @@
+import tempfile
+import zipfile
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from billiard.pool import Pool
+from flask import current_app, render_template
+from lbrc_flask.celery import celery
+from lbrc_flask.database import db
+from lbrc_flask.logging import log_exception
+from sqlalchemy.orm import selectinload
+from weasyprint import HTML
+from werkzeug.utils import secure_filename
+from academics.model.academic import CatalogPublicationsSources, Source
+from academics.model.export import ExportJob
+from academics.model.folder import FolderDoi
+from academics.model.publication import CatalogPublication, Publication
+from academics.services.export_jobs import complete_export, export_artifact_path, fail_export, update_export_progress
+from academics.services.publication_searching import PublicationSearchForm, publication_search_query
+
+
+def _write_pdf(item):
+    # Run in the pool processes, so it is given only the rendered
+    # HTML and must not use the database or the application.
+    html, base_url, path = item
+
+    HTML(string=html, base_url=base_url).write_pdf(path)
+
+    return path
+
+
+def _current_date():
+    return f'{datetime.now():%d %B %Y}'
+
+
+def _search_form(export_job: ExportJob):
+    return PublicationSearchForm(formdata=export_job.search_args, meta={'csrf': False})
+
+
+def _export_publications_pdf(export_job: ExportJob):
+    search_form = _search_form(export_job)
+
+    q = publication_search_query(search_form)
+    q = q.options(
+        selectinload(Publication.catalog_publications)
+        .selectinload(CatalogPublication.catalog_publication_sources)
+        .selectinload(CatalogPublicationsSources.source)
+        .selectinload(Source.academic)
+    )
+    q = q.options(
+        selectinload(Publication.folder_dois)
+        .selectinload(FolderDoi.folder)
+    )
+
+    update_export_progress(export_job, 0, total=1)
+
+    publications = db.session.execute(q.order_by(CatalogPublication.publication_period_start)).unique().scalars()
+
+    html = render_template(
+        'ui/exports/publication_export.html',
+        publications=publications,
+        parameters=search_form.values_description(),
+        current_date=_current_date(),
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        _write_pdf((html, tmpdirname, export_artifact_path(export_job)))
+
+    return f'publication_export_{datetime.now():%Y%m%d_%H%M%S}.pdf'
+
+
+def _export_author_report(export_job: ExportJob):
+    search_form = _search_form(export_job)
+
+    q = publication_search_query(search_form)
+    q = q.options(
+        selectinload(Publication.catalog_publications)
+        .selectinload(CatalogPublication.catalog_publication_sources)
+        .selectinload(CatalogPublicationsSources.source)
+        .selectinload(Source.academic)
+    )
+
+    publications = db.session.execute(q.order_by(CatalogPublication.publication_period_start)).unique().scalars()
+
+    academics = defaultdict(set)
+
+    for p in publications:
+        for a in p.academics:
+            academics[a].add(p)
+
+    update_export_progress(export_job, 0, total=len(academics))
+
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        items = [(
+            render_template(
+                'ui/exports/publications_by_academic.html',
+                publications=pubs,
+                academic=a,
+                parameters=search_form.values_description(),
+                current_date=_current_date(),
+            ),
+            tmpdirname,
+            Path(tmpdirname) / secure_filename(f'{a.full_name}.pdf'),
+        ) for a, pubs in academics.items()]
+
+        with zipfile.ZipFile(export_artifact_path(export_job), 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            if items:
+                processes = max(1, min(current_app.config['EXPORT_MAX_WORKERS'], len(items)))
+
+                with Pool(processes=processes) as pool:
+                    for i, path in enumerate(pool.imap_unordered(_write_pdf, items), start=1):
+                        zf.write(path, arcname=path.name)
+                        update_export_progress(export_job, i)
+
+    return f'publication_author_report_{datetime.now():%Y%m%d_%H%M%S}.zip'
+
+
+EXPORTERS = {
+    ExportJob.TYPE_PUBLICATIONS_PDF: _export_publications_pdf,
+    ExportJob.TYPE_AUTHOR_REPORT: _export_author_report,
+}
+
+
+@celery.task(bind=True)
+def run_export_job(self, export_job_id: int):
+    export_job: ExportJob = db.session.get(ExportJob, export_job_id)
+
+    if export_job is None or export_job.status != ExportJob.STATUS_QUEUED:
+        return
+
+    try:
+        export_job.status = ExportJob.STATUS_RUNNING
+        update_export_progress(export_job, 0)
+
+        filename = EXPORTERS[export_job.export_type](export_job)
+
+        complete_export(export_job, filename)
+
+    except Exception as e:
+        log_exception(e)
+        db.session.rollback()
+        export_artifact_path(export_job).unlink(missing_ok=True)
+        fail_export(export_job, e)
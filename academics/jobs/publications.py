@@ -2,9 +2,11 @@ from datetime import date, datetime, timezone
 from lbrc_flask.async_jobs import AsyncJob
 from lbrc_flask.database import db
 from sqlalchemy import delete, select
-from academics.services.publication_searching import best_catalog_publications
 from academics.model.folder import Folder, FolderDoi, FolderExcludedDoi
 from academics.model.publication import CatalogPublication, Publication
+from academics.services.institutions import update_publication_collaborations
+from academics.services.publication_summary import rebuild_publication_summaries
+from academics.services.result_cache import data_changed
 
 
 class PublicationRemoveUnused(AsyncJob):
@@ -39,6 +41,45 @@ class PublicationRemoveUnused(AsyncJob):
         db.session.commit()
 
 
+class PublicationSummaryRefresh(AsyncJob):
+    __mapper_args__ = {
+        "polymorphic_identity": "PublicationSummaryRefresh",
+    }
+
+    def __init__(self):
+        super().__init__(
+            scheduled=datetime.now(timezone.utc),
+            retry=True,
+            retry_timedelta_period='days',
+            retry_timedelta_size='1',
+        )
+
+    def _run_actual(self):
+        # The summaries are updated as publications change, but rebuilding
+        # them all catches changes made elsewhere, such as to institutions.
+        rebuild_publication_summaries()
+        db.session.commit()
+
+
+class PublicationCollaborationRefresh(AsyncJob):
+    __mapper_args__ = {
+        "polymorphic_identity": "PublicationCollaborationRefresh",
+    }
+
+    def __init__(self):
+        super().__init__(
+            scheduled=datetime.now(timezone.utc),
+            retry=True,
+            retry_timedelta_period='days',
+            retry_timedelta_size='1',
+        )
+
+    def _run_actual(self):
+        update_publication_collaborations()
+        rebuild_publication_summaries()
+        db.session.commit()
+
+
 class AutoFillFolders(AsyncJob):
     __mapper_args__ = {
         "polymorphic_identity": "AutoFillFolders",
@@ -59,18 +100,17 @@ class AutoFillFolders(AsyncJob):
         ).scalars():
             self._add_publications_to_folder(f)
 
+        data_changed()
         db.session.commit()
 
     def _add_publications_to_folder(self, folder: Folder):
-        bcp = best_catalog_publications().subquery()
         autofill_start = date(folder.autofill_year, 4, 1)
         autofill_end = date(folder.autofill_year + 1, 3, 31)
 
         q = (
             select(CatalogPublication)
             .select_from(CatalogPublication)
-            .join(CatalogPublication.publication)
-            .where(CatalogPublication.id.in_(bcp))
+            .join(Publication, Publication.best_catalog_publication_id == CatalogPublication.id)
             .where(CatalogPublication.doi.not_in(
                 select(FolderDoi.doi)
                 .where(FolderDoi.folder_id == folder.id)
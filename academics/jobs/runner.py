@@ -0,0 +1,367 @@
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from dateutil.relativedelta import relativedelta
+from flask import current_app
+from lbrc_flask.async_jobs import AsyncJob
+from lbrc_flask.celery import celery
+from lbrc_flask.database import db
+from lbrc_flask.logging import log_exception
+from sqlalchemy import func, or_, select, update
+from academics.catalogs.fetching import prefetching
+from academics.jobs.scheduling import running_job_priority
+from academics.model.job import LANE_DATABASE, LANES, PRIORITY_PERIODIC, JobExecution, JobSchedule
+from academics.services import bulk
+from academics.services.job_telemetry import record_job_execution, remove_old_job_telemetry, sample_job_backlog
+from academics.services.result_cache import bump_changed_data_versions
+from academics.services.telemetry import measuring
+
+
+# Number of due jobs tried in turn when claiming a job
+# on databases that do not support SKIP LOCKED
+CLAIM_CANDIDATES = 10
+
+
+def worker_name(pid=None):
+    """The name of the worker process `pid`, by which its claims
+    on jobs are recorded.
+    """
+    return f'{socket.gethostname()}:{pid or os.getpid()}'
+
+
+def _job_type_lanes():
+    """Lanes of the job types that set their lane on the class, for
+    jobs that were scheduled without a lane.
+    """
+    result = {}
+    classes = AsyncJob.__subclasses__()
+
+    while classes:
+        cls = classes.pop()
+        classes.extend(cls.__subclasses__())
+
+        if (identity := cls.__mapper_args__.get('polymorphic_identity')) and getattr(cls, 'lane', None):
+            result[identity] = cls.lane
+
+    return result
+
+
+def add_missing_schedules():
+    """Adds a schedule for the jobs that were scheduled without one,
+    so that they can be claimed.
+    """
+    lanes = _job_type_lanes()
+
+    missing = db.session.execute(
+        select(AsyncJob.id, AsyncJob.job_type)
+        .outerjoin(JobSchedule, JobSchedule.async_job_id == AsyncJob.id)
+        .where(JobSchedule.async_job_id == None)
+        .where(AsyncJob.scheduled != None)
+    ).all()
+
+    bulk.insert_ignore(JobSchedule, [{
+        'async_job_id': id,
+        'priority': PRIORITY_PERIODIC,
+        'lane': lanes.get(job_type, LANE_DATABASE),
+    } for id, job_type in missing])
+    db.session.commit()
+
+
+def _claim_expiry():
+    return datetime.now(timezone.utc) + timedelta(seconds=current_app.config['JOB_CLAIM_SECONDS'])
+
+
+def _due_jobs(lane):
+    now = datetime.now(timezone.utc)
+
+    return (
+        select(AsyncJob, JobSchedule.priority)
+        .join(JobSchedule, JobSchedule.async_job_id == AsyncJob.id)
+        .where(AsyncJob.scheduled <= now)
+        .where(JobSchedule.lane == lane)
+        .where(or_(JobSchedule.claimed_until == None, JobSchedule.claimed_until < now))
+        .order_by(
+            JobSchedule.priority.desc(),
+            AsyncJob.scheduled,
+            AsyncJob.id,
+        )
+    )
+
+
+def next_due_job(lane):
+    """The highest priority unclaimed job that is due to run in
+    `lane`, oldest first for jobs of the same priority.
+    """
+    return db.session.execute(_due_jobs(lane).limit(1)).first()
+
+
+def _claim(job_id, unclaimed_only):
+    q = (
+        update(JobSchedule)
+        .where(JobSchedule.async_job_id == job_id)
+        .values(claimed_by=worker_name(), claimed_until=_claim_expiry())
+        .execution_options(synchronize_session=False)
+    )
+
+    if unclaimed_only:
+        q = q.where(or_(JobSchedule.claimed_until == None, JobSchedule.claimed_until < datetime.now(timezone.utc)))
+
+    return db.session.execute(q).rowcount == 1
+
+
+def claim_next_job(lane):
+    """Claims the next due job in `lane` for this worker.
+
+    On MariaDB the job is selected with SKIP LOCKED, so that workers
+    claiming at the same time each get a different job.  Elsewhere,
+    the claim is only made if the job is still unclaimed.
+
+    Returns the job and its priority, or None if there are no
+    unclaimed jobs due.
+    """
+    if db.session.get_bind().dialect.name in ('mysql', 'mariadb'):
+        due = db.session.execute(_due_jobs(lane).limit(1).with_for_update(skip_locked=True)).first()
+
+        if due:
+            _claim(due[0].id, unclaimed_only=False)
+
+        db.session.commit()
+        return due
+
+    for due in db.session.execute(_due_jobs(lane).limit(CLAIM_CANDIDATES)).all():
+        if _claim(due[0].id, unclaimed_only=True):
+            db.session.commit()
+            return due
+
+    db.session.commit()
+
+
+def renew_claims(worker=None):
+    """Extends the claims of `worker`, defaulting to this one, while
+    it is still running their jobs.
+    """
+    db.session.execute(
+        update(JobSchedule)
+        .where(JobSchedule.claimed_by == (worker or worker_name()))
+        .values(claimed_until=_claim_expiry())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def release_claims(worker=None):
+    """Releases the claims of `worker`, defaulting to this one."""
+    released = db.session.execute(
+        update(JobSchedule)
+        .where(JobSchedule.claimed_by == (worker or worker_name()))
+        .values(claimed_by=None, claimed_until=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+
+    return released
+
+
+def release_claim(job_id):
+    db.session.execute(
+        update(JobSchedule)
+        .where(JobSchedule.async_job_id == job_id)
+        .values(claimed_by=None, claimed_until=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def release_expired_claims():
+    """Releases the claims of workers that have stopped renewing them."""
+    released = db.session.execute(
+        update(JobSchedule)
+        .where(JobSchedule.claimed_until < datetime.now(timezone.utc))
+        .values(claimed_by=None, claimed_until=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+
+    if released:
+        logging.warning(f'Released {released} expired job claims')
+
+    return released
+
+
+def jobs_outstanding():
+    """Whether any jobs are due, including those being run, which
+    may schedule more jobs.
+    """
+    return db.session.execute(
+        select(func.count(AsyncJob.id))
+        .where(AsyncJob.scheduled <= datetime.now(timezone.utc))
+    ).scalar() > 0
+
+
+@contextmanager
+def heartbeat():
+    """Renews the claims of this worker and samples the backlog
+    until the block exits.
+    """
+    app = current_app._get_current_object()
+    stopped = threading.Event()
+
+    def _beat():
+        with app.app_context():
+            while not stopped.wait(app.config['JOB_HEARTBEAT_SECONDS']):
+                try:
+                    renew_claims()
+                    sample_job_backlog()
+                except Exception as e:
+                    log_exception(e)
+
+    thread = threading.Thread(target=_beat, daemon=True)
+    thread.start()
+
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def run_job(job: AsyncJob, priority=PRIORITY_PERIODIC):
+    """Runs `job`, deleting it if it succeeds.  If it fails, the error
+    is recorded and it is rescheduled if it is to be retried.  The
+    telemetry of the run is recorded and the versions of the data it
+    changed are bumped either way.
+    """
+    job_id = job.id
+    logging.info(f'Running job {job.job_type} for entity {job.entity_id or job.entity_id_string}')
+
+    started = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    schedule = job.job_schedule
+
+    try:
+        with measuring() as measurements, running_job_priority(priority):
+            job._run_actual()
+
+        record_job_execution(job, schedule, worker_name(), started, time.perf_counter() - start, measurements, JobExecution.OUTCOME_SUCCESS)
+
+        db.session.delete(job)
+        db.session.commit()
+
+    except Exception as e:
+        log_exception(e)
+        db.session.rollback()
+
+        job = db.session.get(AsyncJob, job_id)
+
+        if job is None:
+            return
+
+        record_job_execution(job, job.job_schedule, worker_name(), started, time.perf_counter() - start, measurements, JobExecution.OUTCOME_ERROR)
+
+        job.error = traceback.format_exc()
+        job.last_executed = datetime.now(timezone.utc)
+
+        if job.retry and job.retry_timedelta_period:
+            job.scheduled = datetime.now(timezone.utc) + relativedelta(**{job.retry_timedelta_period: int(job.retry_timedelta_size or 1)})
+        else:
+            job.scheduled = None
+
+        if job.job_schedule:
+            job.job_schedule.claimed_by = None
+            job.job_schedule.claimed_until = None
+
+        db.session.add(job)
+        db.session.commit()
+
+        if current_app.config['WORKER_STOPS_ON_ERROR']:
+            raise
+
+    finally:
+        # The versions of the data changed are bumped once the changes
+        # are committed, which parts of a failed job may have been.
+        bump_changed_data_versions()
+
+
+def run_lane(lane, stop=None):
+    """Claims and runs the due jobs in `lane` until `stop` is set or
+    no jobs are outstanding in any lane.  While jobs in other lanes are
+    still running, it waits for them to schedule more.
+
+    Returns the number of jobs run.
+    """
+    stop = stop or threading.Event()
+    count = 0
+
+    with prefetching():
+        while not stop.is_set():
+            if due := claim_next_job(lane):
+                job, priority = due
+                job_id = job.id
+
+                try:
+                    run_job(job, priority)
+                except Exception:
+                    # Otherwise the heartbeat would keep the claim
+                    # and the job would never be run again.
+                    db.session.rollback()
+                    release_claim(job_id)
+                    raise
+
+                count += 1
+
+            elif jobs_outstanding():
+                stop.wait(current_app.config['JOB_POLL_SECONDS'])
+
+            else:
+                break
+
+    return count
+
+
+def run_due_jobs(lanes=None, stop=None):
+    """Runs the due jobs, with each lane worked through by its own
+    thread, so that the jobs in one lane do not wait for those in
+    another.  Other runners may work through the same lanes at the
+    same time, as each job is claimed by the worker that runs it.
+    """
+    lanes = lanes or LANES
+    app = current_app._get_current_object()
+
+    add_missing_schedules()
+    release_expired_claims()
+    remove_old_job_telemetry()
+    sample_job_backlog()
+
+    def _run_lane(lane):
+        with app.app_context():
+            try:
+                return run_lane(lane, stop)
+            except Exception as e:
+                log_exception(e)
+                return 0
+
+    with heartbeat():
+        try:
+            with ThreadPoolExecutor(max_workers=len(lanes)) as executor:
+                counts = dict(zip(lanes, executor.map(_run_lane, lanes)))
+        finally:
+            release_claims()
+
+    logging.info('Jobs run: ' + '; '.join(f'{k}: {v}' for k, v in counts.items()))
+
+    return counts
+
+
+@celery.task()
+def run_due_jobs_task():
+    run_due_jobs()
+
+
+def run_jobs_asynch():
+    run_due_jobs_task.delay()
@@ -0,0 +1,129 @@
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from lbrc_flask.async_jobs import AsyncJob, AsyncJobs
+from lbrc_flask.database import db
+from sqlalchemy import select
+from academics.model.job import LANE_DATABASE, PRIORITY_PERIODIC, JobSchedule
+
+
+_coalesced = Counter()
+_running = threading.local()
+
+
+def _key(job):
+    return (job.job_type, job.entity_id, job.entity_id_string)
+
+
+def _pending(job):
+    """The job of the same type for the same entity that is waiting
+    to run.  Jobs that have failed and will not be retried are not
+    waiting to run.
+    """
+    key = _key(job)
+
+    for j in db.session.new:
+        if isinstance(j, AsyncJob) and _key(j) == key and j.scheduled is not None:
+            return j
+
+    q = (
+        select(AsyncJob)
+        .where(AsyncJob.scheduled != None)
+        .where(AsyncJob.job_type == job.job_type)
+        .where(AsyncJob.entity_id == job.entity_id)
+        .where(AsyncJob.entity_id_string == job.entity_id_string)
+        .limit(1)
+    )
+
+    return db.session.execute(q).scalar()
+
+
+def job_lane(job):
+    """The lane that `job` runs in: set by the job class, or by the
+    job for the catalog of its entity, else the database lane.
+    """
+    return getattr(job, 'lane', None) or LANE_DATABASE
+
+
+def running_priority():
+    """The priority of the job being run by this thread, which the
+    jobs it schedules inherit.
+    """
+    return getattr(_running, 'priority', None)
+
+
+@contextmanager
+def running_job_priority(priority):
+    previous = running_priority()
+    _running.priority = priority
+
+    try:
+        yield
+    finally:
+        _running.priority = previous
+
+
+def _utc(value):
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+
+    return value
+
+
+def _bring_forward(pending, job):
+    """Runs `pending` when `job` would have run, if that is sooner,
+    so that a job waiting to be retried does not delay it.
+    """
+    scheduled = _utc(job.scheduled or datetime.now(timezone.utc))
+
+    if scheduled < _utc(pending.scheduled):
+        pending.scheduled = scheduled
+
+
+def _set_schedule(job, priority, lane):
+    if job.job_schedule is None:
+        job.job_schedule = JobSchedule(priority=priority, lane=lane)
+    elif job.job_schedule.priority < priority:
+        job.job_schedule.priority = priority
+
+
+def schedule(job, priority=None):
+    """Schedules `job` unless a job of the same type for the same
+    entity is already waiting to run, in which case the two are
+    coalesced and nothing is scheduled.
+
+    The job runs at `priority`, or at the priority of the job that
+    scheduled it if that is higher.  A waiting job is raised to
+    the priority of a job coalesced into it, and brought forward
+    to when that job would have run.
+
+    Returns True if the job was scheduled.
+    """
+    priority = max(priority or PRIORITY_PERIODIC, running_priority() or PRIORITY_PERIODIC)
+
+    if pending := _pending(job):
+        logging.debug(f'Coalesced {job.job_type} for entity {job.entity_id or job.entity_id_string}')
+        _coalesced[job.job_type] += 1
+        _set_schedule(pending, priority, job_lane(job))
+        _bring_forward(pending, job)
+        return False
+
+    _set_schedule(job, priority, job_lane(job))
+    AsyncJobs.schedule(job)
+    return True
+
+
+def coalesced_job_counts():
+    return dict(_coalesced)
+
+
+def log_coalesced_jobs(reset=True):
+    if _coalesced:
+        logging.info('Coalesced jobs: ' + '; '.join(f'{k}: {v}' for k, v in sorted(_coalesced.items())))
+    else:
+        logging.info('Coalesced jobs: none')
+
+    if reset:
+        _coalesced.clear()
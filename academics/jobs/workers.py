@@ -0,0 +1,82 @@
+import logging
+import multiprocessing
+import signal
+from multiprocessing.connection import wait
+from flask import current_app
+from academics.jobs.runner import release_claims, release_expired_claims, worker_name
+
+
+def _worker_main(config, lanes, stop):
+    # Run in a new process, so it creates its own application
+    # rather than sharing the database connections of the parent.
+    def _stop(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    from academics import create_app
+    from academics.jobs.runner import run_due_jobs
+
+    app = create_app()
+    app.config.update(config)
+
+    with app.app_context():
+        run_due_jobs(lanes, stop)
+
+
+def run_workers(workers, lanes=None, config=None):
+    """Runs the due jobs in `workers` processes, each of which claims
+    jobs for itself, until no jobs are outstanding.
+
+    The first SIGINT or SIGTERM stops the workers once they have
+    finished their current jobs; a second kills them.  The jobs
+    claimed by a worker that dies are released for the others.
+    """
+    context = multiprocessing.get_context('spawn')
+    stop = context.Event()
+    config = config or {}
+
+    def _shutdown(signum, frame):
+        if stop.is_set():
+            logging.warning('Killing job workers')
+
+            for p in processes:
+                p.kill()
+        else:
+            logging.info('Stopping job workers after their current jobs')
+            stop.set()
+
+    signal.signal(signal.SIGINT, _shutdown)
+    signal.signal(signal.SIGTERM, _shutdown)
+
+    release_expired_claims()
+
+    processes = []
+
+    for i in range(workers):
+        p = context.Process(
+            target=_worker_main,
+            args=(config, lanes, stop),
+            name=f'job-worker-{i + 1}',
+        )
+        p.start()
+        processes.append(p)
+
+    logging.info(f'Started {workers} job workers')
+
+    running = list(processes)
+
+    while running:
+        wait([p.sentinel for p in running], timeout=current_app.config['JOB_HEARTBEAT_SECONDS'])
+
+        for p in [p for p in running if not p.is_alive()]:
+            running.remove(p)
+
+            if p.exitcode != 0:
+                released = release_claims(worker_name(p.pid))
+                logging.error(f'Job worker {p.name} exited with code {p.exitcode}, releasing {released} jobs')
+
+        release_expired_claims()
+
+    logging.info('Job workers finished')
@@ -1,6 +1,6 @@
 import re
-from sqlalchemy import Boolean, ForeignKey, String, UniqueConstraint, distinct, func, or_, select
-from sqlalchemy.orm import Mapped, mapped_column, relationship, backref
+from sqlalchemy import Boolean, ForeignKey, String, UniqueConstraint, distinct, func, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship, backref
 from sqlalchemy.ext.orderinglist import ordering_list
 from lbrc_flask.security import AuditMixin
 from lbrc_flask.model import CommonMixin
@@ -73,6 +73,7 @@ class Affiliation(CommonMixin, db.Model):
     name = db.Column(db.String(1000))
     address = db.Column(db.String(1000))
     country = db.Column(db.String(100))
+    fingerprint = db.Column(db.String(64))
     refresh_details: Mapped[bool] = mapped_column(Boolean, nullable=True)
     home_organisation: Mapped[bool] = mapped_column(Boolean, nullable=True)
     international: Mapped[bool] = mapped_column(Boolean, nullable=True)
@@ -199,32 +200,6 @@ class Academic(AuditMixin, CommonMixin, db.Model):
         return list(reversed(sorted(self.sources, key=lambda x: int(x.h_index or '0'))))
 
 
-    @property
-    def publication_count(self) -> int:
-        normal_ids = (
-            select(distinct(Publication.id))
-            .join(Publication.catalog_publications)
-            .join(CatalogPublication.catalog_publication_sources)
-            .join(CatalogPublicationsSources.source)
-            .where(Source.academic_id == self.id)
-        )
-
-        supplementary_ids = (
-            select(distinct(Publication.id))
-            .join(Publication.supplementary_authors)
-            .where(Academic.id == self.id)
-        )
-
-        q =  (
-            select(func.count(distinct(Publication.id)))
-            .where(or_(
-                Publication.id.in_(normal_ids),
-                Publication.id.in_(supplementary_ids),
-            ))
-        )
-
-        return db.session.execute(q).scalar()    
-
     @property
     def orcid_mismatch(self):
         return any([s.orcid_mismatch for s in self.sources])
@@ -233,19 +208,6 @@ class Academic(AuditMixin, CommonMixin, db.Model):
     def source_errors(self):
         return any([s.error for s in self.sources])
 
-    @property
-    def has_new_potential_sources(self):
-        q =  (
-            select(func.count(distinct(Academic.id)))
-            .join(Academic.potential_sources)
-            .join(AcademicPotentialSource.source)
-            .where(AcademicPotentialSource.not_match == False)
-            .where(Source.academic == None)
-            .where(Academic.id == self.id)
-        )
-
-        return db.session.execute(q).scalar() > 0
-
     @property
     def theme_summary(self):
         return ', '.join([t.name for t in self.themes])
@@ -302,7 +264,9 @@ class Source(AuditMixin, CommonMixin, db.Model):
     h_index = db.Column(db.String(100))
 
     last_fetched_datetime = db.Column(db.DateTime)
+    last_full_fetched_datetime = db.Column(db.DateTime)
     error = db.Column(db.Boolean, default=False)
+    fingerprint = db.Column(db.String(64))
 
     @property
     def author_url(self):
@@ -313,17 +277,6 @@ class Source(AuditMixin, CommonMixin, db.Model):
         else:
             return ''
 
-    @property
-    def publication_count(self):
-        q =  (
-            select(func.count(distinct(Publication.id)))
-            .join(Publication.catalog_publications)
-            .join(CatalogPublication.catalog_publication_sources)
-            .where(CatalogPublicationsSources.source_id == self.id)
-        )
-
-        return db.session.execute(q).scalar()
-
     @property
     def orcid_mismatch(self):
         if self.academic.orcid and self.orcid:
@@ -456,3 +409,48 @@ class CatalogPublicationsSources(CommonMixin, db.Model):
         secondary=catalog_publications_sources_affiliations,
         backref=backref("catalog_publication_sources"),
     )
+
+
+# The publication counts are deferred, so they are only loaded
+# by queries that undefer them, such as the academics index.
+
+_academic_catalog_publication_ids = (
+    select(CatalogPublication.publication_id)
+    .join(CatalogPublicationsSources, CatalogPublicationsSources.catalog_publication_id == CatalogPublication.id)
+    .join(Source, Source.id == CatalogPublicationsSources.source_id)
+    .where(Source.academic_id == Academic.id)
+    .correlate_except(CatalogPublication, CatalogPublicationsSources, Source)
+)
+
+Academic.publication_count = column_property(
+    _academic_catalog_publication_ids
+    .with_only_columns(func.count(distinct(CatalogPublication.publication_id)))
+    .scalar_subquery()
+    + select(func.count())
+    .select_from(supplementary_authors)
+    .where(supplementary_authors.c.academic_id == Academic.id)
+    .where(supplementary_authors.c.publication_id.not_in(_academic_catalog_publication_ids))
+    .correlate_except(supplementary_authors)
+    .scalar_subquery(),
+    deferred=True,
+)
+
+Academic.has_new_potential_sources = column_property(
+    select(AcademicPotentialSource.id)
+    .join(Source, Source.id == AcademicPotentialSource.source_id)
+    .where(AcademicPotentialSource.academic_id == Academic.id)
+    .where(AcademicPotentialSource.not_match == False)
+    .where(Source.academic_id == None)
+    .correlate_except(AcademicPotentialSource, Source)
+    .exists(),
+    deferred=True,
+)
+
+Source.publication_count = column_property(
+    select(func.count(distinct(CatalogPublication.publication_id)))
+    .join(CatalogPublicationsSources, CatalogPublicationsSources.catalog_publication_id == CatalogPublication.id)
+    .where(CatalogPublicationsSources.source_id == Source.id)
+    .correlate_except(CatalogPublication, CatalogPublicationsSources)
+    .scalar_subquery(),
+    deferred=True,
+)
@@ -0,0 +1,65 @@
+import json
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UnicodeText
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from werkzeug.datastructures import MultiDict
+from lbrc_flask.database import db
+from lbrc_flask.security import AuditMixin
+from lbrc_flask.model import CommonMixin
+from academics.model.security import User
+
+
+class ExportJob(AuditMixin, CommonMixin, db.Model):
+    """An export rendered by the Celery worker, whose finished file
+    is kept in the export artifact store until it expires.
+    """
+    TYPE_PUBLICATIONS_PDF = 'publications_pdf'
+    TYPE_AUTHOR_REPORT = 'author_report'
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    export_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    parameters: Mapped[str] = mapped_column(UnicodeText, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=STATUS_QUEUED)
+    progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total: Mapped[int] = mapped_column(Integer, nullable=True)
+    filename: Mapped[str] = mapped_column(String(500), nullable=True)
+    error: Mapped[str] = mapped_column(UnicodeText, nullable=True)
+    completed_datetime: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    expires_datetime: Mapped[datetime] = mapped_column(DateTime, nullable=True, index=True)
+
+    owner_id = mapped_column(ForeignKey(User.id), nullable=False, index=True)
+    owner: Mapped[User] = relationship(User)
+
+    @property
+    def search_args(self):
+        return MultiDict(json.loads(self.parameters))
+
+    @search_args.setter
+    def search_args(self, args):
+        self.parameters = json.dumps(args.to_dict(flat=False))
+
+    @property
+    def is_finished(self):
+        return self.status in [ExportJob.STATUS_DONE, ExportJob.STATUS_FAILED]
+
+    @property
+    def is_expired(self):
+        return self.expires_datetime is not None and self.expires_datetime < datetime.now()
+
+    @property
+    def is_downloadable(self):
+        return self.status == ExportJob.STATUS_DONE and not self.is_expired
+
+    @property
+    def percent_complete(self):
+        if self.status == ExportJob.STATUS_DONE:
+            return 100
+        elif not self.total:
+            return 0
+        else:
+            return int(self.progress * 100 / self.total)
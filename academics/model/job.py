@@ -0,0 +1,94 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
+from lbrc_flask.async_jobs import AsyncJob
+from lbrc_flask.database import db
+from lbrc_flask.model import CommonMixin
+from academics.model.catalog import CATALOG_OPEN_ALEX, CATALOG_SCIVAL, CATALOG_SCOPUS
+
+
+PRIORITY_PERIODIC = 10
+PRIORITY_INITIALISE = 20
+PRIORITY_INTERACTIVE = 30
+
+LANE_DATABASE = 'database'
+LANE_SCOPUS = CATALOG_SCOPUS
+LANE_SCIVAL = CATALOG_SCIVAL
+LANE_OPEN_ALEX = CATALOG_OPEN_ALEX
+
+LANES = [LANE_DATABASE, LANE_SCOPUS, LANE_SCIVAL, LANE_OPEN_ALEX]
+
+
+def catalog_lane(catalog):
+    """The lane for jobs that fetch data from `catalog`"""
+    catalog = (catalog or '').lower().strip()
+
+    if catalog in LANES:
+        return catalog
+    else:
+        return LANE_DATABASE
+
+
+class JobSchedule(db.Model):
+    """The priority of an async job, the lane it runs in and the
+    worker that has claimed it.
+
+    Each lane runs its jobs separately from the others, so that
+    a slow catalog only delays the jobs that use it.  Within a lane,
+    jobs with a higher priority run first.  A claim lasts until
+    `claimed_until` and is renewed by the worker while the job runs,
+    so the jobs of a worker that dies are released when it expires.
+    """
+    __table_args__ = (
+        Index('ix__job_schedule__lane__priority', 'lane', 'priority'),
+    )
+
+    async_job_id = mapped_column(ForeignKey(AsyncJob.id, ondelete='CASCADE'), primary_key=True)
+    async_job: Mapped[AsyncJob] = relationship(
+        AsyncJob,
+        backref=backref(
+            'job_schedule',
+            uselist=False,
+            cascade='all, delete-orphan',
+        ),
+    )
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=PRIORITY_PERIODIC)
+    lane: Mapped[str] = mapped_column(String(50), nullable=False, default=LANE_DATABASE)
+    claimed_by: Mapped[str] = mapped_column(String(100), nullable=True, index=True)
+    claimed_until: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+
+class JobExecution(CommonMixin, db.Model):
+    """Telemetry recorded for each run of an async job"""
+    OUTCOME_SUCCESS = 'success'
+    OUTCOME_ERROR = 'error'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    job_type: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    entity_id_string: Mapped[str] = mapped_column(String(100), nullable=True)
+    lane: Mapped[str] = mapped_column(String(50), nullable=True)
+    priority: Mapped[int] = mapped_column(Integer, nullable=True)
+    worker: Mapped[str] = mapped_column(String(100), nullable=True)
+    started_datetime: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    duration: Mapped[float] = mapped_column(Float, nullable=False)
+    http_calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    http_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cache_hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sql_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sql_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    rows_written: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    outcome: Mapped[str] = mapped_column(String(20), nullable=False)
+
+
+class JobBacklog(CommonMixin, db.Model):
+    """The number of jobs waiting in a lane at the time it was sampled"""
+    __table_args__ = (
+        Index('ix__job_backlog__sampled_datetime__lane', 'sampled_datetime', 'lane'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    sampled_datetime: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    lane: Mapped[str] = mapped_column(String(50), nullable=False)
+    due: Mapped[int] = mapped_column(Integer, nullable=False)
+    running: Mapped[int] = mapped_column(Integer, nullable=False)
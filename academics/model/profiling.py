@@ -0,0 +1,25 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Float, Integer, String, UnicodeText
+from sqlalchemy.orm import Mapped, mapped_column
+from lbrc_flask.database import db
+from lbrc_flask.model import CommonMixin
+
+
+class SlowRequest(CommonMixin, db.Model):
+    """A request that took longer than SQL_PROFILING_SLOW_REQUEST_MS
+    while SQL profiling was enabled, with the statements it repeated
+    and the query plans of its slowest statements.
+    """
+    id: Mapped[int] = mapped_column(primary_key=True)
+    created_datetime: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    method: Mapped[str] = mapped_column(String(10), nullable=False)
+    path: Mapped[str] = mapped_column(String(500), nullable=False)
+    endpoint: Mapped[str] = mapped_column(String(200), nullable=True)
+    status_code: Mapped[int] = mapped_column(Integer, nullable=True)
+    duration: Mapped[float] = mapped_column(Float, nullable=False)
+    sql_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    sql_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    repeated_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    repeated_statements: Mapped[str] = mapped_column(UnicodeText, nullable=True)
+    slowest_statements: Mapped[str] = mapped_column(UnicodeText, nullable=True)
+
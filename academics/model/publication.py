@@ -1,15 +1,13 @@
 from itertools import chain
 import logging
-from datetime import date
+from datetime import date, datetime
 import re
-from typing import Optional
 from lbrc_flask.security import AuditMixin
 from lbrc_flask.database import db
 from sqlalchemy.orm import Mapped, mapped_column, relationship, backref
-from sqlalchemy import Boolean, Date, ForeignKey, Integer, String, Unicode, UnicodeText, UniqueConstraint, and_, func, select
+from sqlalchemy import DDL, Boolean, Date, DateTime, ForeignKey, Integer, String, Unicode, UnicodeText, UniqueConstraint, event, select
 from sqlalchemy.ext.hybrid import hybrid_property
 from lbrc_flask.model import CommonMixin
-from sqlalchemy import SQLColumnExpression
 from academics.model.catalog import CATALOG_MANUAL, CATALOG_OPEN_ALEX, CATALOG_SCOPUS
 from academics.model.institutions import Institution
 from sqlalchemy.ext.associationproxy import association_proxy
@@ -209,6 +207,23 @@ class Publication(AuditMixin, CommonMixin, db.Model):
 
     preprint: Mapped[bool] = mapped_column(Boolean, nullable=True)
 
+    # Set from the institutions by set_collaboration_flags
+    # or, in bulk, by update_publication_collaborations.
+    is_industrial_collaboration: Mapped[bool] = mapped_column(Boolean, nullable=True, index=True)
+    is_international_collaboration: Mapped[bool] = mapped_column(Boolean, nullable=True, index=True)
+    is_external_collaboration: Mapped[bool] = mapped_column(Boolean, nullable=True, index=True)
+
+    # Maintained by update_best_catalog_publications whenever catalog
+    # publications are saved or deleted, so that searches can join to it.
+    best_catalog_publication_id = mapped_column(
+        ForeignKey("catalog_publication.id", use_alter=True, ondelete="SET NULL", name="fk__publication__best_catalog_publication_id"),
+        nullable=True,
+    )
+    best_catalog_publication: Mapped["CatalogPublication"] = relationship(
+        foreign_keys=[best_catalog_publication_id],
+        post_update=True,
+    )
+
     institutions: Mapped[Institution] = relationship(
         "Institution",
         secondary=institutions__publications,
@@ -224,56 +239,24 @@ class Publication(AuditMixin, CommonMixin, db.Model):
         else:
             return ''
 
-    @hybrid_property
-    def is_industrial_collaboration(self):
-        if self.institutions:
-            return any([i.sector.lower() == 'corporate' for i in self.institutions])
-        else:
-            None
-
-    @is_industrial_collaboration.inplace.expression
-    @classmethod
-    def _is_industrial_collaboration_expression(cls) -> SQLColumnExpression[Optional[Boolean]]:
-        return (select(1)
-             .where(institutions__publications.c.publication_id == cls.id)
-             .where(Institution.id == institutions__publications.c.institution_id)
-             .where(Institution.sector == 'corporate')).exists().label("is_industrial_collaboration")
-
-    @hybrid_property
-    def is_international_collaboration(self):
-        if self.institutions:
-            return any([i.country_code.lower() != 'gbr' for i in self.institutions])
-        else:
-            None
-
-    @is_international_collaboration.inplace.expression
-    @classmethod
-    def _is_international_collaboration_expression(cls) -> SQLColumnExpression[Optional[Boolean]]:
-        return (select(Institution.id)
-            .where(institutions__publications.c.publication_id == cls.id)
-            .where(Institution.id == institutions__publications.c.institution_id)
-            .where(Institution.country_code != 'GBR')).exists().label("is_international_collaboration")
-
-    @hybrid_property
-    def is_external_collaboration(self):
-        if self.institutions:
-            return any([i.home_institution for i in self.institutions]) and any([not i.home_institution for i in self.institutions])
-        else:
-            None
+    def set_collaboration_flags(self):
+        # The flags are unknown until the institutions are, and an institution
+        # without a country does not make a collaboration international.
+        # update_publication_collaborations must use the same rules.
+        if not self.institutions:
+            self.is_industrial_collaboration = None
+            self.is_international_collaboration = None
+            self.is_external_collaboration = None
+            return
 
-    @is_external_collaboration.inplace.expression
-    @classmethod
-    def _is_external_collaboration_expression(cls) -> SQLColumnExpression[Optional[Boolean]]:
-        return and_(
-            (select(Institution.id)
-            .where(institutions__publications.c.publication_id == cls.id)
-            .where(Institution.id == institutions__publications.c.institution_id)
-            .where(Institution.home_institution == 1)).exists(),
-            (select(Institution.id)
-            .where(institutions__publications.c.publication_id == cls.id)
-            .where(Institution.id == institutions__publications.c.institution_id)
-            .where(func.coalesce(Institution.home_institution, 0) == 0)).exists(),
-            ).label("is_external_collaboration")
+        self.is_industrial_collaboration = any((i.sector or '').lower() == 'corporate' for i in self.institutions)
+        self.is_international_collaboration = any(
+            i.country_code is not None and i.country_code.upper() != 'GBR' for i in self.institutions
+        )
+        self.is_external_collaboration = (
+            any(i.home_institution for i in self.institutions)
+            and any(not i.home_institution for i in self.institutions)
+        )
 
     @hybrid_property
     def is_theme_collaboration(self):
@@ -291,10 +274,6 @@ class Publication(AuditMixin, CommonMixin, db.Model):
     def manual_catalog_publication(self):
         return next((cp for cp in self.catalog_publications if cp.catalog == CATALOG_MANUAL), None)
 
-    @property
-    def best_catalog_publication(self):
-        return self.scopus_catalog_publication or self.openalex_catalog_publication or self.manual_catalog_publication or None
-
     @property
     def academics(self):
         if not self.best_catalog_publication:
@@ -455,6 +434,7 @@ class CatalogPublication(AuditMixin, CommonMixin, db.Model):
     id: Mapped[int] = mapped_column(primary_key=True)
     publication_id: Mapped[int] = mapped_column(ForeignKey(Publication.id))
     publication: Mapped[Publication] = relationship(
+        foreign_keys=[publication_id],
         backref=backref(
             "catalog_publications",
             cascade="delete, delete-orphan",
@@ -463,6 +443,8 @@ class CatalogPublication(AuditMixin, CommonMixin, db.Model):
     refresh_full_details: Mapped[bool] = mapped_column(Boolean, nullable=True)
     catalog: Mapped[str] = mapped_column(String(50), index=True)
     catalog_identifier: Mapped[str] = mapped_column(String(500), index=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=True)
+    last_refreshed_datetime: Mapped[datetime] = mapped_column(DateTime, nullable=True)
 
     doi: Mapped[str] = mapped_column(String(1000), index=True)
     title: Mapped[str] = mapped_column(Unicode(1000))
@@ -521,3 +503,63 @@ class CatalogPublication(AuditMixin, CommonMixin, db.Model):
     @property
     def author_list(self):
         return ', '.join([s.source.full_name for s in self.catalog_publication_sources])
+
+
+# Denormalised copy of the searchable text of each catalog publication,
+# kept up to date by update_catalog_publication_search.  MariaDB searches
+# it with a FULLTEXT index and SQLite with an FTS5 external content table.
+catalog_publication_search = db.Table(
+    'catalog_publication_search',
+    db.Column('catalog_publication_id', db.Integer(), db.ForeignKey('catalog_publication.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('title', db.UnicodeText()),
+    db.Column('abstract', db.UnicodeText()),
+    db.Column('journal', db.UnicodeText()),
+    db.Column('keywords', db.UnicodeText()),
+    db.Column('authors', db.UnicodeText()),
+    db.Index(
+        'ix__catalog_publication_search__fulltext',
+        'title', 'abstract', 'journal', 'keywords', 'authors',
+        mysql_prefix='FULLTEXT',
+    ).ddl_if(dialect=('mysql', 'mariadb')),
+)
+
+CATALOG_PUBLICATION_SEARCH_FTS = 'catalog_publication_search_fts'
+
+for ddl in [
+    f'''
+        CREATE VIRTUAL TABLE {CATALOG_PUBLICATION_SEARCH_FTS} USING fts5(
+            title, abstract, journal, keywords, authors,
+            content='catalog_publication_search',
+            content_rowid='catalog_publication_id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    ''',
+    f'''
+        CREATE TRIGGER catalog_publication_search__ai AFTER INSERT ON catalog_publication_search BEGIN
+            INSERT INTO {CATALOG_PUBLICATION_SEARCH_FTS} (rowid, title, abstract, journal, keywords, authors)
+            VALUES (new.catalog_publication_id, new.title, new.abstract, new.journal, new.keywords, new.authors);
+        END
+    ''',
+    f'''
+        CREATE TRIGGER catalog_publication_search__ad AFTER DELETE ON catalog_publication_search BEGIN
+            INSERT INTO {CATALOG_PUBLICATION_SEARCH_FTS} ({CATALOG_PUBLICATION_SEARCH_FTS}, rowid, title, abstract, journal, keywords, authors)
+            VALUES ('delete', old.catalog_publication_id, old.title, old.abstract, old.journal, old.keywords, old.authors);
+        END
+    ''',
+    f'''
+        CREATE TRIGGER catalog_publication_search__au AFTER UPDATE ON catalog_publication_search BEGIN
+            INSERT INTO {CATALOG_PUBLICATION_SEARCH_FTS} ({CATALOG_PUBLICATION_SEARCH_FTS}, rowid, title, abstract, journal, keywords, authors)
+            VALUES ('delete', old.catalog_publication_id, old.title, old.abstract, old.journal, old.keywords, old.authors);
+            INSERT INTO {CATALOG_PUBLICATION_SEARCH_FTS} (rowid, title, abstract, journal, keywords, authors)
+            VALUES (new.catalog_publication_id, new.title, new.abstract, new.journal, new.keywords, new.authors);
+        END
+    ''',
+]:
+    event.listen(catalog_publication_search, 'after_create', DDL(ddl).execute_if(dialect='sqlite'))
+
+event.listen(
+    catalog_publication_search,
+    'before_drop',
+    DDL(f'DROP TABLE IF EXISTS {CATALOG_PUBLICATION_SEARCH_FTS}').execute_if(dialect='sqlite'),
+)
@@ -0,0 +1,68 @@
+from datetime import date
+from lbrc_flask.database import db
+from sqlalchemy import Boolean, Date, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from academics.model.academic import Academic
+from academics.model.group import Group
+from academics.model.publication import CatalogPublication, NihrAcknowledgement, Publication, Subtype
+from academics.model.theme import Theme
+
+
+class PublicationSummary(db.Model):
+    """The dimensions that the publication summary reports group and
+    filter by for the best catalog publication of each publication.
+
+    Rows are maintained by `update_publication_summaries`, so the
+    reports do not have to join the catalog publications, publications
+    and institutions for every chart.
+    """
+    catalog_publication_id = mapped_column(ForeignKey(CatalogPublication.id, ondelete='CASCADE'), primary_key=True)
+    publication_id = mapped_column(ForeignKey(Publication.id, ondelete='CASCADE'), nullable=False, index=True)
+    catalog: Mapped[str] = mapped_column(String(50), index=True)
+    nihr_acknowledgement_id = mapped_column(ForeignKey(NihrAcknowledgement.id), nullable=True, index=True)
+    subtype_id = mapped_column(ForeignKey(Subtype.id), nullable=True, index=True)
+    preprint: Mapped[bool] = mapped_column(Boolean, nullable=True)
+    is_industrial_collaboration: Mapped[bool] = mapped_column(Boolean, nullable=True)
+    is_international_collaboration: Mapped[bool] = mapped_column(Boolean, nullable=True)
+    is_external_collaboration: Mapped[bool] = mapped_column(Boolean, nullable=True)
+    publication_cover_date: Mapped[date] = mapped_column(Date, nullable=True)
+    publication_period_start: Mapped[date] = mapped_column(Date, nullable=True)
+    publication_period_end: Mapped[date] = mapped_column(Date, nullable=True)
+    month: Mapped[date] = mapped_column(Date, nullable=True, index=True)
+
+
+class PublicationMembership(db.Model):
+    """The academics of each publication, either as an author of the
+    best catalog publication or as a supplementary author, with one
+    row for each combination of the academic's themes and groups.
+    An academic without themes or groups has a row with a null
+    `theme_id` or `group_id`.
+
+    Rows are maintained by `update_publication_memberships`, so the
+    academic, theme and group filters do not have to union the
+    source and supplementary author paths for every query.
+    """
+    __table_args__ = (
+        Index('ix__publication_membership__publication_id', 'publication_id', 'academic_id', 'via_supplementary'),
+        Index('ix__publication_membership__academic_id', 'academic_id', 'publication_id', 'via_supplementary'),
+        Index('ix__publication_membership__theme_id', 'theme_id', 'publication_id', 'via_supplementary'),
+        Index('ix__publication_membership__group_id', 'group_id', 'publication_id'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    publication_id = mapped_column(ForeignKey(Publication.id, ondelete='CASCADE'), nullable=False)
+    academic_id = mapped_column(ForeignKey(Academic.id, ondelete='CASCADE'), nullable=False)
+    theme_id = mapped_column(ForeignKey(Theme.id, ondelete='CASCADE'), nullable=True)
+    group_id = mapped_column(ForeignKey(Group.id, ondelete='CASCADE'), nullable=True)
+    via_supplementary: Mapped[bool] = mapped_column(Boolean, nullable=False)
+
+
+class DataVersion(db.Model):
+    """Counters that are incremented whenever the data they name
+    changes, so that cached results computed from an older version
+    are no longer used.
+    """
+    PUBLICATIONS = 'publications'
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,177 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from sqlalchemy import bindparam, delete, insert, select, tuple_, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from lbrc_flask.database import db
+
+
+# Keeps multi-row statements under the SQLite bound parameter limit
+# and stops MariaDB packets getting silly for large batches
+MAX_STATEMENT_PARAMETERS = 30000
+
+
+AUDIT_USER = 'system'
+
+# Databases with multi-row inserts that can skip or update existing rows
+SUPPORTED_DIALECTS = ('mysql', 'mariadb', 'sqlite')
+
+
+def _table(table_or_model):
+    return getattr(table_or_model, '__table__', table_or_model)
+
+
+def _dialect_name():
+    result = db.session.get_bind().dialect.name
+
+    if result not in SUPPORTED_DIALECTS:
+        raise ValueError(f'Bulk writes are not supported for database dialect {result}, only for {", ".join(SUPPORTED_DIALECTS)}')
+
+    return result
+
+
+def _chunks(rows):
+    rows = list(rows)
+
+    if not rows:
+        return
+
+    width = len(rows[0]) if isinstance(rows[0], (tuple, list, dict)) else 1
+    size = max(1, MAX_STATEMENT_PARAMETERS // max(1, width))
+
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def audit_values(table_or_model):
+    """Values for the audit columns of `table_or_model`, which are
+    otherwise only filled in when saving through the ORM.
+    """
+    columns = _table(table_or_model).c.keys()
+    now = datetime.now(timezone.utc)
+
+    return {k: v for k, v in {
+        'created_date': now,
+        'created_by': AUDIT_USER,
+        'last_update_date': now,
+        'last_update_by': AUDIT_USER,
+    }.items() if k in columns}
+
+
+def audit_update_columns(table_or_model):
+    columns = _table(table_or_model).c.keys()
+
+    return [c for c in ['last_update_date', 'last_update_by'] if c in columns]
+
+
+def upsert(table_or_model, rows, index_elements, update_columns):
+    """Multi-row INSERT that updates `update_columns` when a row
+    matching the unique key `index_elements` already exists.
+
+    Uses ON DUPLICATE KEY UPDATE for MariaDB/MySQL and
+    ON CONFLICT DO UPDATE for SQLite.  Other databases raise
+    a ValueError.
+    """
+    table = _table(table_or_model)
+    dialect = _dialect_name()
+
+    for chunk in _chunks(rows):
+        if dialect in ('mysql', 'mariadb'):
+            stmt = mysql_insert(table).values(chunk)
+            stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_columns})
+        else:
+            stmt = sqlite_insert(table).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={c: stmt.excluded[c] for c in update_columns},
+            )
+
+        db.session.execute(stmt)
+
+
+def insert_ignore(table_or_model, rows):
+    """Multi-row INSERT that silently skips rows that already exist."""
+    table = _table(table_or_model)
+    dialect = _dialect_name()
+
+    for chunk in _chunks(rows):
+        if dialect in ('mysql', 'mariadb'):
+            stmt = mysql_insert(table).values(chunk).prefix_with('IGNORE')
+        else:
+            stmt = sqlite_insert(table).values(chunk).on_conflict_do_nothing()
+
+        db.session.execute(stmt)
+
+
+def bulk_insert(table_or_model, rows):
+    table = _table(table_or_model)
+
+    for chunk in _chunks(rows):
+        db.session.execute(insert(table).values(chunk))
+
+
+def bulk_update(table_or_model, rows, key_column):
+    """Updates rows identified by `key_column` using a single
+    executemany statement.  All rows must have the same keys.
+    """
+    table = _table(table_or_model)
+
+    if not rows:
+        return
+
+    columns = [c for c in rows[0].keys() if c != key_column]
+
+    stmt = (
+        update(table)
+        .where(table.c[key_column] == bindparam(f'b_{key_column}'))
+        .values({c: bindparam(f'b_{c}') for c in columns})
+    )
+
+    db.session.connection().execute(
+        stmt,
+        [{f'b_{k}': v for k, v in r.items()} for r in rows],
+    )
+
+
+def delete_keys(table_or_model, columns, keys):
+    """Deletes rows whose values for `columns` are in `keys`"""
+    table = _table(table_or_model)
+    key = tuple_(*[table.c[c] for c in columns]) if len(columns) > 1 else table.c[columns[0]]
+
+    for chunk in _chunks(keys):
+        db.session.execute(delete(table).where(key.in_(chunk)))
+
+
+def sync_links(table, parent_column, child_column, desired):
+    """Makes the association table `table` match `desired`, a dictionary
+    of parent id to the set of child ids that should be linked.
+
+    Only parents in `desired` are touched.  Returns the set of parent
+    ids whose links were changed.
+    """
+    parent = table.c[parent_column]
+    child = table.c[child_column]
+
+    if not desired:
+        return set()
+
+    existing = defaultdict(set)
+
+    for parent_ids in _chunks(desired.keys()):
+        q = select(parent, child).where(parent.in_(parent_ids))
+
+        for p, c in db.session.execute(q):
+            existing[p].add(c)
+
+    to_add = []
+    to_remove = []
+
+    for p, children in desired.items():
+        to_add.extend((p, c) for c in children - existing[p])
+        to_remove.extend((p, c) for c in existing[p] - children)
+
+    insert_ignore(table, [{parent_column: p, child_column: c} for p, c in to_add])
+
+    delete_keys(table, [parent_column, child_column], to_remove)
+
+    return {p for p, _ in to_add} | {p for p, _ in to_remove}
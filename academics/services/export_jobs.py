@@ -0,0 +1,85 @@
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from flask import current_app
+from lbrc_flask.database import db
+from lbrc_flask.security import current_user_id
+from sqlalchemy import select
+from academics.model.export import ExportJob
+
+
+def export_artifact_path(export_job: ExportJob):
+    """Path of the finished file of `export_job` in the artifact store,
+    which must be shared by the web application and the Celery worker.
+    """
+    path = Path(current_app.config['EXPORT_ARTIFACT_PATH'])
+    path.mkdir(parents=True, exist_ok=True)
+
+    return path / f'{export_job.id}'
+
+
+def create_export_job(export_type, search_args):
+    """Creates an export job for the current user, to be queued
+    for the Celery worker once it is committed.
+    """
+    remove_expired_exports()
+
+    export_job = ExportJob(
+        export_type=export_type,
+        status=ExportJob.STATUS_QUEUED,
+        progress=0,
+        owner_id=current_user_id(),
+    )
+    export_job.search_args = search_args
+
+    db.session.add(export_job)
+    db.session.commit()
+
+    return export_job
+
+
+def update_export_progress(export_job: ExportJob, progress, total=None):
+    export_job.progress = progress
+
+    if total is not None:
+        export_job.total = total
+
+    db.session.add(export_job)
+    db.session.commit()
+
+
+def complete_export(export_job: ExportJob, filename):
+    export_job.status = ExportJob.STATUS_DONE
+    export_job.filename = filename
+    export_job.progress = export_job.total or export_job.progress
+    export_job.completed_datetime = datetime.now()
+    export_job.expires_datetime = export_job.completed_datetime + timedelta(hours=current_app.config['EXPORT_ARTIFACT_EXPIRY_HOURS'])
+
+    db.session.add(export_job)
+    db.session.commit()
+
+
+def fail_export(export_job: ExportJob, error):
+    export_job.status = ExportJob.STATUS_FAILED
+    export_job.error = str(error)
+    export_job.completed_datetime = datetime.now()
+    export_job.expires_datetime = export_job.completed_datetime + timedelta(hours=current_app.config['EXPORT_ARTIFACT_EXPIRY_HOURS'])
+
+    db.session.add(export_job)
+    db.session.commit()
+
+
+def remove_expired_exports():
+    """Deletes the expired export jobs and their files."""
+    expired = db.session.execute(
+        select(ExportJob)
+        .where(ExportJob.expires_datetime < datetime.now())
+    ).scalars().all()
+
+    for export_job in expired:
+        logging.debug(f'Removing expired export {export_job.id}')
+
+        export_artifact_path(export_job).unlink(missing_ok=True)
+        db.session.delete(export_job)
+
+    db.session.commit()
@@ -4,17 +4,20 @@ from lbrc_flask.database import db
 from sqlalchemy import distinct, func, or_, select
 from wtforms import HiddenField
 from academics.jobs.catalogs import CatalogPublicationRefresh
+from academics.jobs.runner import run_jobs_asynch
+from academics.jobs.scheduling import schedule
+from academics.model.job import PRIORITY_INTERACTIVE
 from academics.model.academic import Academic, CatalogPublicationsSources, Source
 from academics.model.folder import Folder, FolderDoi, FolderExcludedDoi
 from academics.model.publication import CatalogPublication, Publication
 from academics.model.security import User
 from academics.model.theme import Theme
+from academics.services.result_cache import bump_data_version
 from academics.services.publication_searching import catalog_publication_academics, catalog_publication_search_query, catalog_publication_themes, publication_folder_query
 from lbrc_flask.security import current_user_id
 from sqlalchemy.orm import with_expression, Mapped, query_expression, relationship, foreign, joinedload
 from lbrc_flask.forms import SearchForm
 from lbrc_flask.requests import all_args
-from lbrc_flask.async_jobs import AsyncJobs, run_jobs_asynch
 
 
 def folder_author_users(folder):
@@ -78,6 +81,12 @@ class FolderPublication(Publication):
         return result
 
 
+FOLDER_PUBLICATION_ORDER_BY = [
+    CatalogPublication.publication_cover_date.asc(),
+    CatalogPublication.id.asc(),
+]
+
+
 def folder_publication_search_query(folder: Folder, search_form: FolderPublicationSearchForm):
     cat_pubs = catalog_publication_search_query(search_form).subquery()
 
@@ -90,7 +99,7 @@ def folder_publication_search_query(folder: Folder, search_form: FolderPublicati
             FolderDoi.folder_id == folder.id,
             FolderDoi.doi == Publication.doi,
         )))
-        .order_by(CatalogPublication.publication_cover_date.asc(), CatalogPublication.id)
+        .order_by(*FOLDER_PUBLICATION_ORDER_BY)
     )
 
     return q
@@ -142,6 +151,7 @@ def add_doi_to_folder(folder_id, doi):
             folder_id=folder_id,
             doi=doi,
         ))
+        bump_data_version()
 
 
 def remove_doi_from_folder(folder_id, doi):
@@ -150,6 +160,7 @@ def remove_doi_from_folder(folder_id, doi):
     if fd:
         db.session.delete(fd)
         exclude_doi_from_folder(folder_id, doi)
+        bump_data_version()
 
 
 def exclude_doi_from_folder(folder_id, doi):
@@ -189,6 +200,7 @@ def create_publication_folder(publications):
     db.session.add_all([
         FolderDoi(folder_id=folder.id, doi=p.doi) for p in publications
     ])
+    bump_data_version()
 
     return folder
 
@@ -233,7 +245,7 @@ def folder_scheule_update_publications(folder):
     )
 
     for cp in db.session.execute(q).scalars():
-        AsyncJobs.schedule(CatalogPublicationRefresh(cp))
+        schedule(CatalogPublicationRefresh(cp), priority=PRIORITY_INTERACTIVE)
     
     db.session.commit()
 
@@ -0,0 +1,53 @@
+from lbrc_flask.database import db
+from sqlalchemy import and_, case, distinct, func, select, update
+from academics.model.institutions import Institution
+from academics.model.publication import Publication, institutions__publications
+
+
+def _has_institution(*criteria):
+    return (
+        select(Institution.id)
+        .join(institutions__publications, institutions__publications.c.institution_id == Institution.id)
+        .where(institutions__publications.c.publication_id == Publication.id)
+        .where(*criteria)
+    ).exists()
+
+
+def _unless_no_institutions(flag):
+    return case((_has_institution(), flag), else_=None)
+
+
+def update_publication_collaborations(publication_ids=None):
+    """Sets the collaboration flags of the publications from their
+    institutions, or of all publications if `publication_ids` is None,
+    by the same rules as `Publication.set_collaboration_flags`.
+    """
+    q = update(Publication).values(
+        is_industrial_collaboration=_unless_no_institutions(
+            _has_institution(func.lower(Institution.sector) == 'corporate'),
+        ),
+        is_international_collaboration=_unless_no_institutions(
+            _has_institution(func.upper(Institution.country_code) != 'GBR'),
+        ),
+        is_external_collaboration=_unless_no_institutions(and_(
+            _has_institution(Institution.home_institution == 1),
+            _has_institution(func.coalesce(Institution.home_institution, 0) == 0),
+        )),
+    ).execution_options(synchronize_session=False)
+
+    if publication_ids is not None:
+        publication_ids = set(filter(None, publication_ids))
+
+        if not publication_ids:
+            return
+
+        q = q.where(Publication.id.in_(publication_ids))
+
+    db.session.execute(q)
+
+
+def institution_publication_ids(institution_ids):
+    return db.session.execute(
+        select(distinct(institutions__publications.c.publication_id))
+        .where(institutions__publications.c.institution_id.in_(institution_ids))
+    ).scalars().all()
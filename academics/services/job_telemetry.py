@@ -0,0 +1,181 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from lbrc_flask.async_jobs import AsyncJob
+from lbrc_flask.database import db
+from sqlalchemy import case, delete, func, select
+from academics.model.job import LANES, JobBacklog, JobExecution, JobSchedule
+from academics.services.telemetry import Measurements
+
+
+PERCENTILES = [50, 90, 99]
+
+
+def record_job_execution(job: AsyncJob, schedule: JobSchedule, worker, started, duration, measurements: Measurements, outcome):
+    """Adds the telemetry of a run of `job` to the session, to be
+    committed with the outcome of the job.
+    """
+    db.session.add(JobExecution(
+        job_type=job.job_type,
+        entity_id=job.entity_id,
+        entity_id_string=job.entity_id_string,
+        lane=schedule.lane if schedule else None,
+        priority=schedule.priority if schedule else None,
+        worker=worker,
+        started_datetime=started,
+        duration=duration,
+        outcome=outcome,
+        **measurements.as_dict(),
+    ))
+
+
+def current_job_backlog():
+    """The number of jobs that are due and that are running in each lane"""
+    now = datetime.now(timezone.utc)
+
+    counts = db.session.execute(
+        select(
+            JobSchedule.lane,
+            func.count(),
+            func.sum(case((JobSchedule.claimed_until >= now, 1), else_=0)),
+        )
+        .join(AsyncJob, AsyncJob.id == JobSchedule.async_job_id)
+        .where(AsyncJob.scheduled <= now)
+        .group_by(JobSchedule.lane)
+    ).all()
+
+    result = {l: {'due': 0, 'running': 0} for l in LANES}
+
+    for lane, due, running in counts:
+        result[lane] = {'due': due - (running or 0), 'running': running or 0}
+
+    return result
+
+
+def sample_job_backlog():
+    """Records the current backlog, unless it was sampled less than
+    JOB_BACKLOG_SAMPLE_SECONDS ago.
+    """
+    now = datetime.now(timezone.utc)
+    last_sampled = db.session.execute(select(func.max(JobBacklog.sampled_datetime))).scalar()
+
+    if last_sampled and last_sampled.replace(tzinfo=timezone.utc) > now - timedelta(seconds=current_app.config['JOB_BACKLOG_SAMPLE_SECONDS']):
+        return
+
+    for lane, counts in current_job_backlog().items():
+        db.session.add(JobBacklog(sampled_datetime=now, lane=lane, **counts))
+
+    db.session.commit()
+
+
+def remove_old_job_telemetry():
+    cutoff = datetime.now(timezone.utc) - timedelta(days=current_app.config['JOB_TELEMETRY_RETENTION_DAYS'])
+
+    db.session.execute(delete(JobExecution).where(JobExecution.started_datetime < cutoff))
+    db.session.execute(delete(JobBacklog).where(JobBacklog.sampled_datetime < cutoff))
+    db.session.commit()
+
+
+def _percentile(values, percent):
+    """Nearest rank percentile of the sorted `values`"""
+    if not values:
+        return None
+
+    return values[max(0, math.ceil(len(values) * percent / 100) - 1)]
+
+
+def _bucket(value: datetime, bucket_size: timedelta):
+    seconds = bucket_size.total_seconds()
+    return datetime.fromtimestamp(value.replace(tzinfo=timezone.utc).timestamp() // seconds * seconds, timezone.utc)
+
+
+def job_type_statistics(since):
+    """Percentiles of the duration, SQL time and the calls made by each
+    job type run since `since`, slowest total time first.
+    """
+    executions = defaultdict(list)
+
+    for e in db.session.execute(
+        select(
+            JobExecution.job_type,
+            JobExecution.duration,
+            JobExecution.http_calls,
+            JobExecution.http_bytes,
+            JobExecution.cache_hits,
+            JobExecution.sql_count,
+            JobExecution.sql_seconds,
+            JobExecution.rows_written,
+            JobExecution.outcome,
+        )
+        .where(JobExecution.started_datetime >= since)
+    ):
+        executions[e.job_type].append(e)
+
+    result = []
+
+    for job_type, es in executions.items():
+        durations = sorted(e.duration for e in es)
+        sql_seconds = sorted(e.sql_seconds for e in es)
+        http_calls = sorted(e.http_calls for e in es)
+        sql_counts = sorted(e.sql_count for e in es)
+
+        result.append({
+            'job_type': job_type,
+            'executions': len(es),
+            'errors': sum(1 for e in es if e.outcome == JobExecution.OUTCOME_ERROR),
+            'total_duration': sum(durations),
+            'duration': {f'p{p}': _percentile(durations, p) for p in PERCENTILES},
+            'sql_seconds': {f'p{p}': _percentile(sql_seconds, p) for p in PERCENTILES},
+            'sql_count': {f'p{p}': _percentile(sql_counts, p) for p in PERCENTILES},
+            'http_calls': {f'p{p}': _percentile(http_calls, p) for p in PERCENTILES},
+            'http_bytes': sum(e.http_bytes for e in es),
+            'cache_hits': sum(e.cache_hits for e in es),
+            'rows_written': sum(e.rows_written for e in es),
+        })
+
+    return sorted(result, key=lambda s: s['total_duration'], reverse=True)
+
+
+def job_throughput(since, bucket_size):
+    """The number of jobs run and failed in each `bucket_size` period"""
+    result = defaultdict(lambda: {'executions': 0, 'errors': 0})
+
+    for started, outcome in db.session.execute(
+        select(JobExecution.started_datetime, JobExecution.outcome)
+        .where(JobExecution.started_datetime >= since)
+    ):
+        counts = result[_bucket(started, bucket_size)]
+        counts['executions'] += 1
+
+        if outcome == JobExecution.OUTCOME_ERROR:
+            counts['errors'] += 1
+
+    return [{'period': k, **v} for k, v in sorted(result.items())]
+
+
+def job_backlog_history(since):
+    """The samples of the backlog taken since `since`, with the counts
+    for each lane.
+    """
+    result = defaultdict(dict)
+
+    for b in db.session.execute(
+        select(JobBacklog).where(JobBacklog.sampled_datetime >= since)
+    ).scalars():
+        result[b.sampled_datetime.replace(tzinfo=timezone.utc)][b.lane] = {'due': b.due, 'running': b.running}
+
+    return [{'sampled': k, 'lanes': v} for k, v in sorted(result.items())]
+
+
+def job_telemetry_summary(hours):
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    bucket_size = timedelta(hours=1) if hours <= 48 else timedelta(days=1)
+
+    return {
+        'since': since,
+        'job_types': job_type_statistics(since),
+        'throughput': job_throughput(since, bucket_size),
+        'backlog': current_job_backlog(),
+        'backlog_history': job_backlog_history(since),
+    }
@@ -0,0 +1,251 @@
+import base64
+import json
+from datetime import date, datetime
+from cachetools import TTLCache
+from lbrc_flask.database import db
+from sqlalchemy import and_, false, func, or_, select
+from sqlalchemy.sql import operators
+from academics.services.result_cache import data_version
+
+
+KEYSET_TOTAL_TTL = 300
+KEYSET_ARGS = ('after', 'before', 'page')
+
+_keyset_totals = TTLCache(maxsize=1000, ttl=KEYSET_TOTAL_TTL)
+
+
+class KeysetPage:
+    """A page of results found by keyset pagination.
+
+    `next_args` and `previous_args` are the URL arguments for the
+    neighbouring pages; `total` is cached for a few minutes, so it
+    may be approximate.
+    """
+    def __init__(self, items, total, next_cursor, previous_cursor, args):
+        self.items = items
+        self.total = total
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.args = args
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.previous_cursor is not None
+
+    @property
+    def next_args(self):
+        return self.args | {'after': self.next_cursor}
+
+    @property
+    def previous_args(self):
+        return self.args | {'before': self.previous_cursor}
+
+
+def _key_column(key):
+    return key.element
+
+
+def _key_descending(key):
+    return key.modifier is operators.desc_op
+
+
+def _encode_cursor(values):
+    data = json.dumps([v.isoformat() if isinstance(v, date) else v for v in values])
+    return base64.urlsafe_b64encode(data.encode('utf8')).decode('ascii')
+
+
+def _decode_cursor(cursor, order_by):
+    values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf8'))
+
+    if len(values) != len(order_by):
+        raise ValueError('Cursor does not match the sort keys')
+
+    result = []
+
+    for value, key in zip(values, order_by):
+        try:
+            python_type = _key_column(key).type.python_type
+        except NotImplementedError:
+            python_type = None
+
+        if value is not None and python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif value is not None and python_type is date:
+            value = date.fromisoformat(value)
+
+        result.append(value)
+
+    return result
+
+
+def _equal(column, value):
+    if value is None:
+        return column.is_(None)
+    else:
+        return column == value
+
+
+def _past(column, value, ascending):
+    """Condition for the values of `column` that come after `value`
+    when moving through them in `ascending` order or not.  NULLs sort
+    before every other value, as they do in MariaDB and SQLite.
+    """
+    if ascending and value is None:
+        return column.is_not(None)
+    elif ascending:
+        return column > value
+    elif value is None:
+        return false()
+    else:
+        return or_(column < value, column.is_(None))
+
+
+def _beyond(order_by, values, reverse=False):
+    """Condition for the rows that sort after `values`, or before
+    them if `reverse` is True.
+    """
+    conditions = []
+
+    for i, (key, value) in enumerate(zip(order_by, values)):
+        conditions.append(and_(
+            *[_equal(_key_column(k), v) for k, v in zip(order_by[:i], values[:i])],
+            _past(_key_column(key), value, ascending=_key_descending(key) == reverse),
+        ))
+
+    return or_(*conditions)
+
+
+def _reversed(key):
+    column = _key_column(key)
+
+    if _key_descending(key):
+        return column.asc()
+    else:
+        return column.desc()
+
+
+def keyset_total(q, total_key=None):
+    """Count of the rows of `q`, cached under `total_key` if
+    it is given so that it is not recounted for every page.
+    """
+    if total_key is not None and total_key in _keyset_totals:
+        return _keyset_totals[total_key]
+
+    result = db.session.execute(
+        select(func.count()).select_from(q.order_by(None).subquery())
+    ).scalar()
+
+    if total_key is not None:
+        _keyset_totals[total_key] = result
+
+    return result
+
+
+def keyset_total_key(path, args):
+    """Key for caching the total of the results at `path` for the
+    search `args`, whichever page of the results is being shown,
+    until the data changes.
+    """
+    return (path, data_version(), tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v)
+        for k, v in args.items()
+        if k not in KEYSET_ARGS
+    )))
+
+
+def keyset_paginate(q, order_by, after=None, before=None, per_page=10, args=None, total_key=None):
+    """Page of the entities selected by `q`, ordered by `order_by`.
+
+    `order_by` is a list of ascending or descending columns, the last
+    of which must be unique.  The columns must not be floats, which
+    may not equal their own values once read back from the cursor.
+    `after` and `before` are the cursors from a previous page; an
+    invalid cursor returns the first page.
+    """
+    args = {k: v for k, v in (args or {}).items() if k not in KEYSET_ARGS}
+
+    total = keyset_total(q, total_key)
+
+    q = q.order_by(None).add_columns(*[_key_column(k) for k in order_by])
+    width = len(order_by)
+
+    cursor = before or after
+    values = None
+
+    if cursor:
+        try:
+            values = _decode_cursor(cursor, order_by)
+        except (ValueError, TypeError):
+            values = None
+
+    backwards = bool(before and values)
+
+    if values:
+        q = q.where(_beyond(order_by, values, reverse=backwards))
+
+    if backwards:
+        q = q.order_by(*[_reversed(k) for k in order_by])
+    else:
+        q = q.order_by(*order_by)
+
+    rows = db.session.execute(q.limit(per_page + 1)).all()
+
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if backwards:
+        rows = list(reversed(rows))
+
+    next_cursor = None
+    previous_cursor = None
+
+    if rows and (more or backwards):
+        next_cursor = _encode_cursor(rows[-1][-width:])
+
+    if rows and values and (more or not backwards):
+        previous_cursor = _encode_cursor(rows[0][-width:])
+
+    return KeysetPage(
+        items=[r[0] for r in rows],
+        total=total,
+        next_cursor=next_cursor,
+        previous_cursor=previous_cursor,
+        args=args,
+    )
+
+
+def keyset_chunks(q, order_by, size=1000):
+    """Rows of `q` in the order of `order_by`, in lists of up to
+    `size` rows.  Each list is read by a separate query that starts
+    after the last row of the previous one, so no result stays open
+    between chunks and other queries can be run while iterating.
+    """
+    width = len(order_by)
+
+    q = (
+        q.order_by(None)
+        .add_columns(*[_key_column(k).label(f'keyset_{i}') for i, k in enumerate(order_by)])
+        .order_by(*order_by)
+    )
+
+    values = None
+
+    while True:
+        chunk = q
+
+        if values is not None:
+            chunk = chunk.where(_beyond(order_by, values))
+
+        rows = db.session.execute(chunk.limit(size)).all()
+
+        if rows:
+            yield rows
+
+        if len(rows) < size:
+            return
+
+        values = list(rows[-1][-width:])
@@ -0,0 +1,212 @@
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+from flask import Response
+from lbrc_flask.database import db
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from sqlalchemy import select
+from werkzeug.utils import secure_filename
+from academics.model.academic import CatalogPublicationsSources, Source, academics_themes
+from academics.model.publication import CatalogPublication, Journal, NihrAcknowledgement, Publication, Sponsor, Subtype, catalog_publications_sponsors
+from academics.model.theme import Theme
+from academics.services.pagination import keyset_chunks
+from academics.services.publication_searching import publication_search_keyset
+
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_STREAM_BLOCK_SIZE = 64 * 1024
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def _cell_value(value):
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub('', value)
+    else:
+        return value
+
+
+def _stream_file(f):
+    try:
+        while block := f.read(EXPORT_STREAM_BLOCK_SIZE):
+            yield block
+    finally:
+        f.close()
+
+
+def excel_stream_download(title, headers, rows):
+    """Download of `rows`, dictionaries keyed by `headers`, as an XLSX file.
+
+    The rows are written to a write only workbook, which keeps them on
+    disk rather than in memory, and the finished file is streamed back
+    in blocks, so memory use does not grow with the number of rows.
+    """
+    headers = list(headers)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=title[:31])
+    ws.append(headers)
+
+    for row in rows:
+        ws.append([_cell_value(row.get(h)) for h in headers])
+
+    f = tempfile.TemporaryFile()
+    wb.save(f)
+    f.seek(0)
+
+    filename = secure_filename(f'{title}_{datetime.now():%Y%m%d_%H%M%S}.xlsx')
+
+    return Response(
+        _stream_file(f),
+        mimetype=XLSX_MIMETYPE,
+        headers={'Content-Disposition': f'attachment; filename={filename}'},
+        direct_passthrough=True,
+    )
+
+
+def _publication_export_query(search_form, *columns):
+    q, order_by = publication_search_keyset(search_form)
+
+    q = q.with_only_columns(
+        Publication.id,
+        Publication.doi,
+        CatalogPublication.id.label('catalog_publication_id'),
+        NihrAcknowledgement.name.label('nihr_acknowledgement'),
+        *columns,
+    )
+    q = q.outerjoin(NihrAcknowledgement, NihrAcknowledgement.id == Publication.nihr_acknowledgement_id)
+
+    return q, order_by
+
+
+def _catalog_publication_sponsors(catalog_publication_ids):
+    result = defaultdict(list)
+
+    for cp_id, name in db.session.execute(
+        select(catalog_publications_sponsors.c.catalog_publication_id, Sponsor.name)
+        .join(Sponsor, Sponsor.id == catalog_publications_sponsors.c.sponsor_id)
+        .where(catalog_publications_sponsors.c.catalog_publication_id.in_(catalog_publication_ids))
+    ):
+        result[cp_id].append(name)
+
+    return result
+
+
+def _catalog_publication_authors(catalog_publication_ids):
+    result = defaultdict(list)
+
+    for a in db.session.execute(
+        select(
+            CatalogPublicationsSources.catalog_publication_id,
+            CatalogPublicationsSources.ordinal,
+            Source.display_name,
+            Source.academic_id,
+        )
+        .join(CatalogPublicationsSources.source)
+        .where(CatalogPublicationsSources.catalog_publication_id.in_(catalog_publication_ids))
+        .order_by(CatalogPublicationsSources.catalog_publication_id, CatalogPublicationsSources.ordinal)
+    ):
+        result[a.catalog_publication_id].append(a)
+
+    return result
+
+
+def _catalog_publication_themes(catalog_publication_ids):
+    result = defaultdict(list)
+
+    for cp_id, name in db.session.execute(
+        select(CatalogPublicationsSources.catalog_publication_id, Theme.name)
+        .join(CatalogPublicationsSources.source)
+        .join(academics_themes, academics_themes.c.academic_id == Source.academic_id)
+        .join(Theme, Theme.id == academics_themes.c.theme_id)
+        .where(CatalogPublicationsSources.catalog_publication_id.in_(catalog_publication_ids))
+        .distinct()
+        .order_by(CatalogPublicationsSources.catalog_publication_id, Theme.name)
+    ):
+        result[cp_id].append(name)
+
+    return result
+
+
+def publication_full_export_rows(search_form):
+    q, order_by = _publication_export_query(
+        search_form,
+        CatalogPublication.catalog,
+        CatalogPublication.catalog_identifier,
+        CatalogPublication.volume,
+        CatalogPublication.issue,
+        CatalogPublication.pages,
+        CatalogPublication.publication_cover_date,
+        CatalogPublication.title,
+        CatalogPublication.abstract,
+        CatalogPublication.is_open_access,
+        CatalogPublication.cited_by_count,
+        Journal.name.label('journal'),
+        Subtype.description.label('type'),
+    )
+    q = q.outerjoin(Journal, Journal.id == CatalogPublication.journal_id)
+    q = q.outerjoin(Subtype, Subtype.id == CatalogPublication.subtype_id)
+
+    for chunk in keyset_chunks(q, order_by, size=EXPORT_CHUNK_SIZE):
+        cp_ids = [p.catalog_publication_id for p in chunk]
+        sponsors = _catalog_publication_sponsors(cp_ids)
+        authors = _catalog_publication_authors(cp_ids)
+
+        for p in chunk:
+            yield {
+                'catalog': p.catalog,
+                'catalog_identifier': p.catalog_identifier,
+                'doi': p.doi,
+                'journal': p.journal or '',
+                'type': p.type or '',
+                'volume': p.volume,
+                'issue': p.issue,
+                'pages': p.pages,
+                'publication_cover_date': p.publication_cover_date,
+                'title': p.title,
+                'abstract': p.abstract,
+                'open access': p.is_open_access,
+                'citations': p.cited_by_count,
+                'sponsor': '; '.join(sponsors[p.catalog_publication_id]),
+                'author_count': len(authors[p.catalog_publication_id]),
+                'brc_authors': '; '.join([f'{a.display_name} ({a.ordinal + 1})' for a in authors[p.catalog_publication_id] if a.academic_id is not None]),
+                'nihr acknowledgement': p.nihr_acknowledgement or '',
+            }
+
+
+def publication_dashboard_export_rows(search_form):
+    q, order_by = _publication_export_query(
+        search_form,
+        Publication.is_external_collaboration,
+        Publication.is_industrial_collaboration,
+        Publication.is_international_collaboration,
+    )
+
+    for chunk in keyset_chunks(q, order_by, size=EXPORT_CHUNK_SIZE):
+        themes = _catalog_publication_themes([p.catalog_publication_id for p in chunk])
+
+        for p in chunk:
+            publication_themes = themes[p.catalog_publication_id]
+
+            for t in publication_themes or ['']:
+                yield {
+                    'DOI': p.doi,
+                    'NIHR Acknowledgement': p.nihr_acknowledgement or '',
+                    'Theme': t,
+                    'External Collaboration': 'Yes' if p.is_external_collaboration else 'No',
+                    'Industrial Collaboration': 'Yes' if p.is_industrial_collaboration else 'No',
+                    'International Collaboration': 'Yes' if p.is_international_collaboration else 'No',
+                    'Theme Collaboration': 'Yes' if len(publication_themes) > 1 else 'No',
+                }
+
+
+def publication_annual_report_rows(search_form):
+    q, order_by = _publication_export_query(search_form, Publication.vancouver)
+
+    for chunk in keyset_chunks(q, order_by, size=EXPORT_CHUNK_SIZE):
+        for p in chunk:
+            yield {
+                'Publication Reference': p.vancouver,
+                'DOI': p.doi,
+            }
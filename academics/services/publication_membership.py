@@ -0,0 +1,80 @@
+from lbrc_flask.database import db
+from sqlalchemy import delete, distinct, literal, select
+from academics.model.academic import CatalogPublicationsSources, Source, academics_themes, supplementary_authors
+from academics.model.group import groups__academics
+from academics.model.publication import Publication
+from academics.model.summary import PublicationMembership
+from academics.services import bulk
+from academics.services.result_cache import data_changed
+
+
+PUBLICATION_MEMBERSHIP_BATCH_SIZE = 1000
+
+
+def update_publication_memberships(publication_ids):
+    """Rebuilds the membership rows of the publications, for example
+    after they are saved or their supplementary authors change, and
+    records that the cached results are to be invalidated.
+    """
+    publication_ids = list(set(filter(None, publication_ids)))
+
+    for i in range(0, len(publication_ids), PUBLICATION_MEMBERSHIP_BATCH_SIZE):
+        _update_publication_membership_batch(publication_ids[i:i + PUBLICATION_MEMBERSHIP_BATCH_SIZE])
+
+    if publication_ids:
+        data_changed()
+
+
+def update_publication_memberships_for_academics(academic_ids):
+    """Rebuilds the membership rows of the publications of the academics,
+    for example after their themes or groups are changed.
+    """
+    update_publication_memberships(db.session.execute(
+        select(distinct(PublicationMembership.publication_id))
+        .where(PublicationMembership.academic_id.in_(academic_ids))
+    ).scalars().all())
+
+
+def _update_publication_membership_batch(publication_ids):
+    db.session.execute(
+        delete(PublicationMembership)
+        .where(PublicationMembership.publication_id.in_(publication_ids))
+    )
+
+    authors = (
+        select(
+            Publication.id.label('publication_id'),
+            Source.academic_id,
+            literal(False).label('via_supplementary'),
+        )
+        .join(CatalogPublicationsSources, CatalogPublicationsSources.catalog_publication_id == Publication.best_catalog_publication_id)
+        .join(CatalogPublicationsSources.source)
+        .where(Publication.id.in_(publication_ids))
+        .where(Source.academic_id != None)
+    )
+
+    supplementary = (
+        select(
+            supplementary_authors.c.publication_id,
+            supplementary_authors.c.academic_id,
+            literal(True).label('via_supplementary'),
+        )
+        .where(supplementary_authors.c.publication_id.in_(publication_ids))
+    )
+
+    members = authors.union(supplementary).subquery()
+
+    memberships = db.session.execute(
+        select(
+            members.c.publication_id,
+            members.c.academic_id,
+            academics_themes.c.theme_id,
+            groups__academics.c.group_id,
+            members.c.via_supplementary,
+        )
+        .outerjoin(academics_themes, academics_themes.c.academic_id == members.c.academic_id)
+        .outerjoin(groups__academics, groups__academics.c.academic_id == members.c.academic_id)
+        .distinct()
+    ).mappings().all()
+
+    bulk.bulk_insert(PublicationMembership, [dict(m) for m in memberships])
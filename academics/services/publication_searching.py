@@ -2,24 +2,30 @@ from itertools import cycle
 import logging
 from dateutil.relativedelta import relativedelta
 from flask import current_app, url_for
-from academics.model.academic import Academic, CatalogPublicationsSources, Source
+from academics.model.academic import Academic, CatalogPublicationsSources
 from academics.model.folder import Folder, FolderDoi
 from academics.model.group import Group
 from academics.model.publication import Journal, Keyword, NihrAcknowledgement, Publication, Subtype, CatalogPublication
 from academics.model.catalog import CATALOG_MANUAL, primary_catalogs
 from lbrc_flask.validators import parse_date_or_none
 from lbrc_flask.data_conversions import ensure_list
-from sqlalchemy import case, literal, literal_column, or_
+from sqlalchemy import Integer, case, cast, literal, literal_column, or_
 from wtforms import BooleanField, HiddenField, MonthField, SelectField, SelectMultipleField
 from lbrc_flask.forms import SearchForm, boolean_coerce
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from lbrc_flask.charting import BarChartItem, SeriesConfig, default_series_colors
 from lbrc_flask.database import db
 from cachetools import cached, TTLCache
 from lbrc_flask.security import current_user_id
 
 from academics.model.security import User
+from academics.model.summary import PublicationMembership, PublicationSummary
 from academics.model.theme import Theme
+from academics.services.result_cache import cached_result
+from academics.services.text_searching import catalog_publication_text_search
+
+
+RELEVANCE_STEPS = 1000
 
 
 @cached(cache=TTLCache(maxsize=1, ttl=60))
@@ -250,24 +256,41 @@ class ValidationSearchForm(SearchForm):
 
 
 def best_catalog_publications(search_data=None):
-    q = select(
-            CatalogPublication.id,
-            func.row_number().over(partition_by=CatalogPublication.publication_id, order_by=[CatalogPublication.catalog.desc(), CatalogPublication.id.desc()]).label('priority')
-        )
+    q = (
+        select(Publication.best_catalog_publication_id.label('id'))
+        .where(Publication.best_catalog_publication_id != None)
+    )
 
     search_data = search_data or {}
 
     if x := search_data.get('folder_id'):
         x = int(x)
-        q = q.join(CatalogPublication.publication)
         q = q.where(Publication.folders.any(Folder.id == x))
 
-    q = q.subquery()
+    return q
+
 
-    return (
-        select(q.c.id)
-        .select_from(q)
-        .where(q.c.priority == 1)
+def update_best_catalog_publications(publication_ids):
+    """Sets the best catalog publication of each of the publications,
+    preferring Scopus, then Open Alex and then manual entries.
+    """
+    publication_ids = set(filter(None, publication_ids))
+
+    if not publication_ids:
+        return
+
+    best = (
+        select(CatalogPublication.id)
+        .where(CatalogPublication.publication_id == Publication.id)
+        .order_by(CatalogPublication.catalog.desc(), CatalogPublication.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    db.session.execute(
+        update(Publication)
+        .where(Publication.id.in_(publication_ids))
+        .values(best_catalog_publication_id=best)
     )
 
 
@@ -282,87 +305,71 @@ def manual_only_catalog_publications():
     return q
 
 def catalog_publication_academics(search_data=None):
-    bcp = best_catalog_publications(search_data).cte("best_catalog_publications")
-
-    qa = (
-        select(CatalogPublicationsSources.catalog_publication_id, Source.academic_id)
-        .select_from(CatalogPublicationsSources)
-        .join(CatalogPublicationsSources.source)
-        .where(Source.academic_id != None)
-        .where(CatalogPublicationsSources.catalog_publication_id.in_(select(bcp.c.id)))
-    )
-
-    qsa = (
-        select(CatalogPublication.id, Academic.id)
-        .select_from(CatalogPublication)
-        .join(CatalogPublication.publication)
-        .join(Publication.supplementary_authors)
-        .where(CatalogPublication.id.in_(select(bcp.c.id)))
+    q = (
+        select(
+            Publication.best_catalog_publication_id.label('catalog_publication_id'),
+            PublicationMembership.academic_id,
+        )
+        .select_from(PublicationMembership)
+        .join(Publication, Publication.id == PublicationMembership.publication_id)
+        .distinct()
     )
 
     search_data = search_data or {}
 
     if x := search_data.get('folder_id'):
         x = int(x)
+        q = q.where(Publication.folder_dois.any(FolderDoi.folder_id == x))
 
-        qa = qa.join(CatalogPublicationsSources.catalog_publication)
-        qa = qa.join(CatalogPublication.publication)
-        qa = qa.where(Publication.folder_dois.any(FolderDoi.folder_id == x))
-
-        qsa = qsa.where(Publication.folder_dois.any(FolderDoi.folder_id == x))
-
-    return qa.union(qsa).alias()
+    return q.alias()
 
 
 def catalog_publication_themes(search_data=None):
-
-    qa = (
-        select(CatalogPublicationsSources.catalog_publication_id, Theme.id.label('theme_id'))
-        .select_from(CatalogPublicationsSources)
-        .join(CatalogPublicationsSources.source)
-        .join(Source.academic)
-        .join(Academic.themes)
-    )
-
-    qsa = (
-        select(CatalogPublication.id, Theme.id)
-        .select_from(CatalogPublication)
-        .join(CatalogPublication.publication)
-        .join(Publication.supplementary_authors)
-        .join(Academic.themes)
+    q = (
+        select(
+            Publication.best_catalog_publication_id.label('catalog_publication_id'),
+            PublicationMembership.theme_id,
+        )
+        .select_from(PublicationMembership)
+        .join(Publication, Publication.id == PublicationMembership.publication_id)
+        .where(PublicationMembership.theme_id != None)
+        .distinct()
     )
 
     search_data = search_data or {}
 
     if x := search_data.get('theme_id'):
         x = int(x)
-        qa = qa.where(Theme.id == x)
-        qsa = qsa.where(Theme.id == x)
+        q = q.where(PublicationMembership.theme_id == x)
 
-    return qa.union(qsa).alias()
+    return q.alias()
 
 
 def catalog_publication_groups():
-    qa = (
-        select(CatalogPublicationsSources.catalog_publication_id, Group.id.label('group_id'))
-        .select_from(CatalogPublicationsSources)
-        .join(CatalogPublicationsSources.source)
-        .join(Source.academic)
-        .join(Academic.groups)
-    )
-
-    qsa = (
-        select(CatalogPublication.id, Group.id)
-        .select_from(CatalogPublication)
-        .join(CatalogPublication.publication)
-        .join(Publication.supplementary_authors)
-        .join(Academic.groups)
+    q = (
+        select(
+            Publication.best_catalog_publication_id.label('catalog_publication_id'),
+            PublicationMembership.group_id,
+        )
+        .select_from(PublicationMembership)
+        .join(Publication, Publication.id == PublicationMembership.publication_id)
+        .where(PublicationMembership.group_id != None)
+        .distinct()
     )
 
-    return qa.union(qsa).alias()
+    return q.alias()
 
 
 def publication_search_query(search_form):
+    q, _ = publication_search_keyset(search_form)
+    return q
+
+
+def publication_search_keyset(search_form):
+    """The publication search query and the keys that it is
+    ordered by for keyset pagination: the text search relevance,
+    if searching, then the newest publications first.
+    """
     cat_pubs = catalog_publication_search_query(search_form).subquery()
 
     q = (
@@ -373,15 +380,29 @@ def publication_search_query(search_form):
         .distinct()
     )
 
-    return q
+    order_by = []
+
+    if search_form.has_value('search'):
+        matches = catalog_publication_text_search(search_form.search.data)
+        q = q.join(matches, matches.c.catalog_publication_id == CatalogPublication.id)
+        # Relevance is a float, so it is sorted in whole steps
+        # that compare exactly once they are in the page cursor.
+        relevance = cast(matches.c.relevance * RELEVANCE_STEPS, Integer)
+        q = q.order_by(relevance.desc())
+        order_by.append(relevance.desc())
+
+    order_by.extend([
+        CatalogPublication.publication_cover_date.desc(),
+        CatalogPublication.id.desc(),
+    ])
+
+    return q, order_by
 
 
 def catalog_publication_search_query(search_form):
     logging.debug(f'publication_search_query started')
 
-    bcp = best_catalog_publications()
-
-    q = select(CatalogPublication.id).join(CatalogPublication.publication).where(CatalogPublication.id.in_(bcp))
+    q = select(CatalogPublication.id).join(Publication, Publication.best_catalog_publication_id == CatalogPublication.id)
 
     if search_form.has_value('author_id'):
         q = q.where(CatalogPublication.catalog_publication_sources.any(
@@ -448,11 +469,8 @@ def catalog_publication_search_query(search_form):
         q = q.where(CatalogPublication.publication_period_start < publication_end_date)
 
     if search_form.has_value('search'):
-        q = q.where(or_(
-            CatalogPublication.title.like(f'%{search_form.search.data}%'),
-            CatalogPublication.journal.has(Journal.name.like(f'%{search_form.search.data}%')),
-            CatalogPublication.doi.like(f'%{search_form.search.data}%'),
-        ))
+        matches = catalog_publication_text_search(search_form.search.data)
+        q = q.where(CatalogPublication.id.in_(select(matches.c.catalog_publication_id)))
 
     acknowledgements = []
 
@@ -504,6 +522,7 @@ def catalog_publication_search_query(search_form):
     return q
 
 
+@cached_result('publication_count')
 def publication_count(search_form):
     pubs = catalog_publication_search_query(search_form).alias()
     q = select(func.count()).select_from(pubs)
@@ -511,6 +530,7 @@ def publication_count(search_form):
     return db.session.execute(q).scalar()
 
 
+@cached_result('publication_summary')
 def publication_summary(search_form):
     if search_form.is_summary_type_academic:
         publications = get_publication_by_academic(search_form)
@@ -565,21 +585,109 @@ def all_series_configs(search_form):
     return results
 
 
+def publication_summary_query(search_form):
+    """Select of the summaries of the publications that match
+    the filters in `search_form`.
+    """
+    q = select(PublicationSummary)
+
+    if search_form.has_value('academic_id'):
+        q = q.where(PublicationSummary.publication_id.in_(
+            select(PublicationMembership.publication_id)
+            .where(PublicationMembership.academic_id.in_(ensure_list(search_form.academic_id.data)))
+        ))
+
+    if search_form.has_value('theme_id'):
+        q = q.where(PublicationSummary.publication_id.in_(
+            select(PublicationMembership.publication_id)
+            .where(PublicationMembership.theme_id.in_(ensure_list(search_form.theme_id.data)))
+        ))
+
+    if search_form.has_value('group_id'):
+        q = q.where(PublicationSummary.publication_id.in_(
+            select(PublicationMembership.publication_id)
+            .where(PublicationMembership.group_id.in_(ensure_list(search_form.group_id.data)))
+        ))
+
+    if search_form.has_value('subtype_id'):
+        q = q.where(PublicationSummary.subtype_id.in_(search_form.subtype_id.data))
+
+    publication_start_date = None
+
+    if search_form.has_value('publication_start_month'):
+        publication_start_date = parse_date_or_none(search_form.publication_start_month.data)
+
+    if publication_start_date:
+        q = q.where(PublicationSummary.publication_period_end >= publication_start_date)
+
+    publication_end_date = None
+
+    if search_form.has_value('publication_end_month'):
+        publication_end_date = parse_date_or_none(search_form.publication_end_month.data)
+
+        if publication_end_date:
+            publication_end_date += relativedelta(months=1)
+
+    if publication_end_date:
+        q = q.where(PublicationSummary.publication_period_start < publication_end_date)
+
+    if search_form.has_value('search'):
+        matches = catalog_publication_text_search(search_form.search.data)
+        q = q.where(PublicationSummary.catalog_publication_id.in_(select(matches.c.catalog_publication_id)))
+
+    if search_form.has_value('nihr_acknowledgement_ids'):
+        status_filter = tuple()
+
+        for ack in search_form.nihr_acknowledgement_ids.data:
+            if ack == '-1':
+                ack = None
+
+            status_filter = (*status_filter, PublicationSummary.nihr_acknowledgement_id == ack)
+
+        q = q.where(or_(*status_filter))
+
+    if search_form.has_value('folder_id'):
+        folder_publications = select(FolderDoi.doi)
+
+        if search_form.folder_id.data != '-1':
+            folder_publications = folder_publications.where(FolderDoi.folder_id == search_form.folder_id.data)
+
+        in_folder = PublicationSummary.publication_id.in_(
+            select(Publication.id).where(Publication.doi.in_(folder_publications))
+        )
+
+        if search_form.folder_id.data == '-1':
+            q = q.where(~in_folder)
+        else:
+            q = q.where(in_folder)
+
+    if search_form.supress_validation_historic.data == True:
+        q = q.where(PublicationSummary.publication_cover_date >= current_app.config['HISTORIC_PUBLICATION_CUTOFF'])
+
+    if search_form.has_value('preprint'):
+        is_is = 1 if search_form.preprint.data else 0
+        q = q.where(func.coalesce(PublicationSummary.preprint, 0) == is_is)
+
+    return q
+
+
 def get_publication_by_theme(search_form):
-    cat_pubs = catalog_publication_search_query(search_form).subquery()
-    cpg = catalog_publication_themes(search_form.data)
+    summaries = publication_summary_query(search_form).subquery()
 
     pub_themes = select(
-        cat_pubs.c.id,
+        summaries.c.catalog_publication_id.label('id'),
         Theme.name.label('bucket')
     ).select_from(
-        cat_pubs
+        summaries
     ).join(
-        cpg, cpg.c.catalog_publication_id == cat_pubs.c.id
+        PublicationMembership, PublicationMembership.publication_id == summaries.c.publication_id
     ).join(
-        Theme, Theme.id == cpg.c.theme_id
+        Theme, Theme.id == PublicationMembership.theme_id
     ).distinct()
 
+    if search_form.has_value('theme_id'):
+        pub_themes = pub_themes.where(Theme.id.in_(ensure_list(search_form.theme_id.data)))
+
     pub_themes = pub_themes.cte('pubs')
 
     if search_form.suppress_multithemes.data == '1' or search_form.has_value('theme_id'):
@@ -598,22 +706,24 @@ def get_publication_by_theme(search_form):
 
 
 def get_publication_by_academic(search_form):
-    cat_pubs = catalog_publication_search_query(search_form).alias()
+    summaries = publication_summary_query(search_form).subquery()
+
+    authors = (
+        select(PublicationMembership.publication_id, PublicationMembership.academic_id)
+        .where(PublicationMembership.via_supplementary == False)
+        .distinct()
+    ).subquery()
 
     q = select(
-        CatalogPublication.id,
+        summaries.c.catalog_publication_id.label('id'),
         func.concat(Academic.first_name, ' ', Academic.last_name).label('bucket')
     ).select_from(
-        cat_pubs
+        summaries
     ).join(
-        CatalogPublication, CatalogPublication.id == cat_pubs.c.id
+        authors, authors.c.publication_id == summaries.c.publication_id
     ).join(
-        CatalogPublication.catalog_publication_sources
-    ).join(
-        CatalogPublicationsSources.source
-    ).join(
-        Source.academic
-    ).distinct().order_by(
+        Academic, Academic.id == authors.c.academic_id
+    ).order_by(
         Academic.last_name,
         Academic.first_name,
     )
@@ -625,18 +735,18 @@ def get_publication_by_academic(search_form):
 
 
 def get_publication_by_brc(search_form):
-    cat_pubs = catalog_publication_search_query(search_form).subquery()
+    summaries = publication_summary_query(search_form).subquery()
 
     q = select(
-        cat_pubs.c.id,
+        summaries.c.catalog_publication_id.label('id'),
         literal('brc').label('bucket'),
     )
 
     return q.cte()
 
 
-def by_acknowledge_status(publications):
-    q_total = (
+def _totals(publications):
+    return (
         select(
             publications.c.bucket,
             func.count().label('total_count'),
@@ -644,166 +754,83 @@ def by_acknowledge_status(publications):
         .group_by(publications.c.bucket)
     ).alias()
 
+
+def _by_series(publications, series, join=None, isouter=False):
+    q_total = _totals(publications)
+
     q = (
         select(
             publications.c.bucket,
-            func.coalesce(NihrAcknowledgement.name, 'Unvalidated').label('series'),
+            series.label('series'),
             func.count().label('publications'),
             q_total.c.total_count
         )
-        .select_from(CatalogPublication)
-        .join(publications, publications.c.id == CatalogPublication.id)
-        .join(CatalogPublication.publication)
-        .join(NihrAcknowledgement, NihrAcknowledgement.id == Publication.nihr_acknowledgement_id, isouter=True)
-        .join(q_total, q_total.c.bucket == publications.c.bucket)
-        .group_by(func.coalesce(NihrAcknowledgement.name, 'Unvalidated'), publications.c.bucket)
-        .order_by(func.coalesce(NihrAcknowledgement.name, 'Unvalidated'), publications.c.bucket)
+        .select_from(PublicationSummary)
+        .join(publications, publications.c.id == PublicationSummary.catalog_publication_id)
     )
 
-    return db.session.execute(q).mappings().all()
-
-
-def by_publication_type(publications):
-    q_total = (
-        select(
-            publications.c.bucket,
-            func.count().label('total_count'),
-        )
-        .group_by(publications.c.bucket)
-    ).alias()
+    if join is not None:
+        q = q.join(*join, isouter=isouter)
 
     q = (
-        select(
-            publications.c.bucket,
-            Subtype.description.label('series'),
-            func.count().label('publications'),
-            q_total.c.total_count
-        )
-        .select_from(CatalogPublication)
-        .join(publications, publications.c.id == CatalogPublication.id)
-        .join(q_total, q_total.c.bucket == publications.c.bucket)
-        .join(CatalogPublication.subtype)
-        .group_by(Subtype.description, publications.c.bucket)
-        .order_by(Subtype.description, publications.c.bucket)
+        q.join(q_total, q_total.c.bucket == publications.c.bucket)
+        .group_by(series, publications.c.bucket)
+        .order_by(series, publications.c.bucket)
     )
 
     return db.session.execute(q).mappings().all()
 
 
-def by_industrial_collaboration(publications):
-    q_total = (
-        select(
-            publications.c.bucket,
-            func.count().label('total_count'),
-        )
-        .group_by(publications.c.bucket)
-    ).alias()
-
-    series_case = case(
-        (Publication.is_industrial_collaboration == 1, 'Collaboration'),
+def _collaboration_series(flag):
+    return case(
+        (flag == True, 'Collaboration'),
         else_='Not Collaboration'
     )
 
-    q = (
-        select(
-            publications.c.bucket,
-            series_case.label('series'),
-            func.count().label('publications'),
-            q_total.c.total_count
-        )
-        .select_from(CatalogPublication)
-        .join(publications, publications.c.id == CatalogPublication.id)
-        .join(CatalogPublication.publication)
-        .join(q_total, q_total.c.bucket == publications.c.bucket)
-        .group_by(series_case, publications.c.bucket)
-        .order_by(series_case, publications.c.bucket)
-    )
-
-    return db.session.execute(q).mappings().all()
-
 
-def by_international_collaboration(publications):
-    q_total = (
-        select(
-            publications.c.bucket,
-            func.count().label('total_count'),
-        )
-        .group_by(publications.c.bucket)
-    ).alias()
-
-    series_case = case(
-        (Publication.is_international_collaboration == 1, 'Collaboration'),
-        else_='Not Collaboration'
+def by_acknowledge_status(publications):
+    return _by_series(
+        publications,
+        func.coalesce(NihrAcknowledgement.name, 'Unvalidated'),
+        join=(NihrAcknowledgement, NihrAcknowledgement.id == PublicationSummary.nihr_acknowledgement_id),
+        isouter=True,
     )
 
-    q = (
-        select(
-            publications.c.bucket,
-            series_case.label('series'),
-            func.count().label('publications'),
-            q_total.c.total_count
-        )
-        .select_from(CatalogPublication)
-        .join(publications, publications.c.id == CatalogPublication.id)
-        .join(CatalogPublication.publication)
-        .join(q_total, q_total.c.bucket == publications.c.bucket)
-        .group_by(series_case, publications.c.bucket)
-        .order_by(series_case, publications.c.bucket)
+
+def by_publication_type(publications):
+    return _by_series(
+        publications,
+        Subtype.description,
+        join=(Subtype, Subtype.id == PublicationSummary.subtype_id),
     )
 
-    return db.session.execute(q).mappings().all()
 
+def by_industrial_collaboration(publications):
+    return _by_series(publications, _collaboration_series(PublicationSummary.is_industrial_collaboration))
 
-def by_external_collaboration(publications):
-    q_total = (
-        select(
-            publications.c.bucket,
-            func.count().label('total_count'),
-        )
-        .group_by(publications.c.bucket)
-    ).alias()
 
-    series_case = case(
-        (Publication.is_external_collaboration == 1, 'Collaboration'),
-        else_='Not Collaboration'
-    )
+def by_international_collaboration(publications):
+    return _by_series(publications, _collaboration_series(PublicationSummary.is_international_collaboration))
 
-    q = (
-        select(
-            publications.c.bucket,
-            series_case.label('series'),
-            func.count().label('publications'),
-            q_total.c.total_count
-        )
-        .select_from(CatalogPublication)
-        .join(publications, publications.c.id == CatalogPublication.id)
-        .join(CatalogPublication.publication)
-        .join(q_total, q_total.c.bucket == publications.c.bucket)
-        .group_by(series_case, publications.c.bucket)
-        .order_by(series_case, publications.c.bucket)
-    )
 
-    return db.session.execute(q).mappings().all()
+def by_external_collaboration(publications):
+    return _by_series(publications, _collaboration_series(PublicationSummary.is_external_collaboration))
 
 
 def by_theme_collaboration(publications):
-    q_total = (
-        select(
-            publications.c.bucket,
-            func.count().label('total_count'),
-        )
-        .group_by(publications.c.bucket)
-    ).alias()
+    q_total = _totals(publications)
 
     collaboration_theme = (
-        select(CatalogPublication.id, Theme.name.label('theme_name'))
-        .select_from(CatalogPublication)
-        .join(CatalogPublication.catalog_publication_sources)
-        .join(CatalogPublicationsSources.source)
-        .join(Source.academic)
-        .join(Academic.themes)
-        .where(CatalogPublication.id.in_(select(publications.c.id)))
-        .group_by(CatalogPublication.id, Theme.name)
+        select(
+            PublicationSummary.catalog_publication_id.label('id'),
+            Theme.name.label('theme_name'),
+        )
+        .select_from(PublicationMembership)
+        .join(PublicationSummary, PublicationSummary.publication_id == PublicationMembership.publication_id)
+        .join(Theme, Theme.id == PublicationMembership.theme_id)
+        .where(PublicationMembership.via_supplementary == False)
+        .where(PublicationSummary.catalog_publication_id.in_(select(publications.c.id)))
+        .group_by(PublicationSummary.catalog_publication_id, Theme.name)
     ).alias()
 
     q = (
@@ -817,36 +844,14 @@ def by_theme_collaboration(publications):
         .join(collaboration_theme, collaboration_theme.c.id == publications.c.id)
         .join(q_total, q_total.c.bucket == publications.c.bucket)
         .group_by(collaboration_theme.c.theme_name, publications.c.bucket)
-        .order_by(collaboration_theme.c.id, publications.c.bucket)
+        .order_by(collaboration_theme.c.theme_name, publications.c.bucket)
     )
 
     return db.session.execute(q).mappings().all()
 
 
 def by_catalog(publications):
-    q_total = (
-        select(
-            publications.c.bucket,
-            func.count().label('total_count'),
-        )
-        .group_by(publications.c.bucket)
-    ).alias()
-
-    q = (
-        select(
-            publications.c.bucket,
-            CatalogPublication.catalog.label('series'),
-            func.count().label('publications'),
-            q_total.c.total_count
-        )
-        .select_from(CatalogPublication)
-        .join(publications, publications.c.id == CatalogPublication.id)
-        .join(q_total, q_total.c.bucket == publications.c.bucket)
-        .group_by(CatalogPublication.catalog, publications.c.bucket)
-        .order_by(CatalogPublication.catalog, publications.c.bucket)
-    )
-
-    return db.session.execute(q).mappings().all()
+    return _by_series(publications, PublicationSummary.catalog)
 
 
 def by_total(publications):
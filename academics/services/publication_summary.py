@@ -0,0 +1,81 @@
+import logging
+from datetime import date
+from lbrc_flask.database import db
+from sqlalchemy import delete, distinct, select
+from academics.model.academic import CatalogPublicationsSources
+from academics.model.publication import CatalogPublication, Publication
+from academics.model.summary import PublicationSummary
+from academics.services import bulk
+from academics.services.publication_membership import update_publication_memberships
+
+
+PUBLICATION_SUMMARY_BATCH_SIZE = 1000
+
+
+def _month(d):
+    if d:
+        return date(d.year, d.month, 1)
+
+
+def update_publication_summaries(publication_ids):
+    """Rebuilds the summary and membership rows of the publications,
+    for example after they are saved or their validation status changes.
+    """
+    publication_ids = list(set(filter(None, publication_ids)))
+
+    for i in range(0, len(publication_ids), PUBLICATION_SUMMARY_BATCH_SIZE):
+        _update_publication_summary_batch(publication_ids[i:i + PUBLICATION_SUMMARY_BATCH_SIZE])
+
+    update_publication_memberships(publication_ids)
+
+
+def update_publication_summaries_for_sources(source_ids):
+    """Rebuilds the summary rows of the publications of the sources,
+    for example after the sources are assigned to a different academic.
+    """
+    update_publication_summaries(db.session.execute(
+        select(distinct(CatalogPublication.publication_id))
+        .join(CatalogPublication.catalog_publication_sources)
+        .where(CatalogPublicationsSources.source_id.in_(source_ids))
+    ).scalars().all())
+
+
+def rebuild_publication_summaries():
+    publication_ids = db.session.execute(select(Publication.id)).scalars().all()
+
+    logging.info(f'Rebuilding publication summaries for {len(publication_ids)} publications')
+
+    db.session.execute(delete(PublicationSummary))
+
+    update_publication_summaries(publication_ids)
+
+
+def _update_publication_summary_batch(publication_ids):
+    db.session.execute(
+        delete(PublicationSummary)
+        .where(PublicationSummary.publication_id.in_(publication_ids))
+    )
+
+    summaries = db.session.execute(
+        select(
+            CatalogPublication.id.label('catalog_publication_id'),
+            Publication.id.label('publication_id'),
+            CatalogPublication.catalog,
+            Publication.nihr_acknowledgement_id,
+            CatalogPublication.subtype_id,
+            Publication.preprint,
+            Publication.is_industrial_collaboration,
+            Publication.is_international_collaboration,
+            Publication.is_external_collaboration,
+            CatalogPublication.publication_cover_date,
+            CatalogPublication.publication_period_start,
+            CatalogPublication.publication_period_end,
+        )
+        .join(Publication, Publication.best_catalog_publication_id == CatalogPublication.id)
+        .where(Publication.id.in_(publication_ids))
+    ).mappings().all()
+
+    bulk.bulk_insert(PublicationSummary, [
+        dict(s) | {'month': _month(s['publication_period_start'] or s['publication_cover_date'])}
+        for s in summaries
+    ])
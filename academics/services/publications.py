@@ -1,10 +1,14 @@
 from datetime import datetime
 from sqlalchemy import select
 from lbrc_flask.database import db
-from lbrc_flask.async_jobs import AsyncJobs
 from academics.jobs.catalogs import CatalogPublicationRefresh
+from academics.jobs.scheduling import schedule
+from academics.model.job import PRIORITY_INTERACTIVE
 from academics.model.catalog import CATALOG_MANUAL
 from academics.model.publication import CatalogPublication, Publication
+from academics.services.publication_searching import update_best_catalog_publications
+from academics.services.publication_summary import update_publication_summaries
+from academics.services.text_searching import update_catalog_publication_search
 
 
 def update_manual_publication(catalog_publication, doi, title=None, publication_cover_date=None):
@@ -13,6 +17,8 @@ def update_manual_publication(catalog_publication, doi, title=None, publication_
             .where(Publication.doi == doi)
         ).unique().scalar_one_or_none() or Publication(doi=doi, refresh_full_details=True)
 
+    previous_publication_id = catalog_publication.publication_id
+
     catalog_publication.catalog_identifier = doi
     catalog_publication.doi = doi
     catalog_publication.title = title or ''
@@ -29,7 +35,11 @@ def update_manual_publication(catalog_publication, doi, title=None, publication_
     db.session.add(catalog_publication)
     db.session.flush()
 
-    AsyncJobs.schedule(CatalogPublicationRefresh(catalog_publication))
+    update_best_catalog_publications([previous_publication_id, publication.id])
+    update_catalog_publication_search([catalog_publication.id])
+    update_publication_summaries([previous_publication_id, publication.id])
+
+    schedule(CatalogPublicationRefresh(catalog_publication), priority=PRIORITY_INTERACTIVE)
     db.session.commit()
 
 
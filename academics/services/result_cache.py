@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import pickle
+import sys
+import threading
+from functools import wraps
+from cachetools import LRUCache
+from flask import current_app
+from lbrc_flask.database import db
+from sqlalchemy import select, update
+from academics.model.summary import DataVersion
+
+
+_IGNORED_FORM_FIELDS = {'csrf_token', 'page'}
+_CHANGED_DATA = 'changed_data'
+
+
+def data_version(name=DataVersion.PUBLICATIONS):
+    return db.session.execute(
+        select(DataVersion.version).where(DataVersion.name == name)
+    ).scalar() or 0
+
+
+def bump_data_version(name=DataVersion.PUBLICATIONS):
+    """Increments the version of the data, so that results cached
+    for the previous version are no longer used.  The new version
+    is seen by other processes once the transaction is committed.
+    """
+    updated = db.session.execute(
+        update(DataVersion)
+        .where(DataVersion.name == name)
+        .values(version=DataVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    if not updated:
+        db.session.add(DataVersion(name=name, version=1))
+        db.session.flush()
+
+
+def data_changed(name=DataVersion.PUBLICATIONS):
+    """Records that the data has been changed, so that its version is
+    bumped by `bump_changed_data_versions` after the changes have been
+    committed.  Bumping it then, rather than with the changes, keeps
+    the version row from being locked while they are written, which
+    would make every worker writing changes wait for the others.
+    """
+    db.session.info.setdefault(_CHANGED_DATA, set()).add(name)
+
+
+def bump_changed_data_versions():
+    """Bumps the versions of the data recorded by `data_changed`,
+    each in its own short transaction.
+    """
+    for name in sorted(db.session.info.pop(_CHANGED_DATA, set())):
+        bump_data_version(name)
+        db.session.commit()
+
+
+def _bump_changed_data_versions(response):
+    bump_changed_data_versions()
+    return response
+
+
+def init_result_cache(app):
+    """Bumps the versions of the data changed by each request
+    after the request has committed its changes.
+    """
+    app.after_request(_bump_changed_data_versions)
+
+
+def _normalised_value(value):
+    if isinstance(value, (list, tuple, set)):
+        return tuple(sorted(str(v) for v in value if v not in (None, '')))
+    elif value in (None, ''):
+        return None
+    else:
+        return str(value)
+
+
+def normalised_form_values(search_form):
+    """The values of `search_form` in a hashable form that is the
+    same however the fields were ordered or left empty in the request.
+    """
+    values = ((k, _normalised_value(v)) for k, v in search_form.data.items() if k not in _IGNORED_FORM_FIELDS)
+
+    return tuple(sorted((k, v) for k, v in values if v))
+
+
+def result_key(name, search_form):
+    return (name, data_version(), normalised_form_values(search_form))
+
+
+def result_etag(name, search_form):
+    return hashlib.sha1(repr(result_key(name, search_form)).encode('utf8')).hexdigest()
+
+
+def _size(value):
+    try:
+        return len(pickle.dumps(value))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return sys.getsizeof(value)
+
+
+class ResultCache:
+    """In memory store of query results, evicted least recently
+    used first once their total size goes over `max_bytes`.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._results = LRUCache(maxsize=max_bytes, getsizeof=_size)
+
+    def get(self, key):
+        with self._lock:
+            return self._results.get(key)
+
+    def put(self, key, value):
+        with self._lock:
+            try:
+                self._results[key] = value
+            except ValueError:
+                logging.debug(f'Result too large to cache for {key[0]}')
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+
+_caches = {}
+
+
+def result_cache():
+    if not current_app.config['RESULT_CACHE_ENABLED']:
+        return None
+
+    max_bytes = current_app.config['RESULT_CACHE_MAX_BYTES']
+
+    if max_bytes not in _caches:
+        _caches[max_bytes] = ResultCache(max_bytes=max_bytes)
+
+    return _caches[max_bytes]
+
+
+def cached_result(name):
+    """Caches the results of a function of a search form until
+    the form values or the publications data version change.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(search_form):
+            cache = result_cache()
+
+            if cache is None:
+                return f(search_form)
+
+            key = result_key(name, search_form)
+            result = cache.get(key)
+
+            if result is None:
+                result = f(search_form)
+                cache.put(key, result)
+
+            return result
+
+        return wrapper
+
+    return decorator
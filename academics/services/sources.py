@@ -1,7 +1,10 @@
+from datetime import datetime, timedelta, timezone
+from flask import current_app
 from sqlalchemy import select
 from academics.catalogs.data_classes import CatalogReference
 from lbrc_flask.database import db
 from academics.model.academic import AcademicPotentialSource, Source
+from academics.model.catalog import CATALOG_OPEN_ALEX
 
 
 def get_sources_for_catalog_identifiers(catalog, catalog_identifiers):
@@ -43,3 +46,32 @@ def get_or_create_source(catalog, catalog_identifier):
         )
 
     return result
+
+
+def _as_utc(value):
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    else:
+        return value
+
+
+def source_publications_fetch_since(source):
+    """The date after which the publications of `source` need to be
+    fetched, which is a little before they were last fetched.
+
+    Returns None when all of the publications should be fetched: if
+    they have never been, or not within `SOURCE_FULL_SYNC_DAYS`, so
+    that anything missed by the incremental fetches is reconciled.
+    """
+    if source.catalog == CATALOG_OPEN_ALEX and not current_app.config['OPEN_ALEX_INCREMENTAL_SYNC']:
+        return None
+
+    if not source.last_fetched_datetime or not source.last_full_fetched_datetime:
+        return None
+
+    now = datetime.now(timezone.utc)
+
+    if _as_utc(source.last_full_fetched_datetime) < now - timedelta(days=current_app.config['SOURCE_FULL_SYNC_DAYS']):
+        return None
+
+    return _as_utc(source.last_fetched_datetime) - timedelta(days=current_app.config['SOURCE_SYNC_OVERLAP_DAYS'])
@@ -0,0 +1,166 @@
+import json
+import logging
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from flask import current_app, g, request
+from lbrc_flask.database import db
+from lbrc_flask.logging import log_exception
+from sqlalchemy import delete, insert
+from academics.model.profiling import SlowRequest
+from academics.services.telemetry import Measurements, start_measuring, stop_measuring
+
+
+_WHITESPACE = re.compile(r'\s+')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_PLACEHOLDER = r'(?:\?|%s|%\(\w+\)s|:\w+)'
+_PLACEHOLDER_LIST = re.compile(rf'\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)')
+
+
+def init_sql_profiling(app):
+    """Profiles the SQL statements run by each request when
+    SQL_PROFILING_ENABLED is set.  The timings are returned in
+    a Server-Timing header and slow requests are logged to the
+    SlowRequest table.
+    """
+    if not app.config['SQL_PROFILING_ENABLED']:
+        return
+
+    app.before_request(_start_profile)
+    app.after_request(_end_profile)
+    app.teardown_request(_stop_profile)
+
+
+def statement_shape(statement):
+    """`statement` with its literals and lists of parameters collapsed,
+    so that statements that only differ by their values are the same.
+    """
+    shape = _WHITESPACE.sub(' ', statement).strip()
+    shape = _LITERAL.sub('?', shape)
+
+    return _PLACEHOLDER_LIST.sub('(?)', shape)
+
+
+def repeated_statements(statements, threshold):
+    """The shapes of the statements run at least `threshold` times,
+    which usually means that a relationship is being loaded one row
+    at a time (N+1).
+    """
+    shapes = defaultdict(list)
+
+    for s in statements:
+        shapes[statement_shape(s.statement)].append(s.seconds)
+
+    return sorted([
+        {'statement': shape, 'count': len(seconds), 'ms': sum(seconds) * 1000}
+        for shape, seconds in shapes.items()
+        if len(seconds) >= threshold
+    ], key=lambda r: r['count'], reverse=True)
+
+
+def explain(statement, parameters):
+    """The query plan of `statement`, run on its own connection so
+    that it does not affect the transaction of the request.
+    """
+    if db.engine.dialect.name == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        prefix = 'EXPLAIN '
+
+    try:
+        with db.engine.connect() as conn:
+            result = conn.exec_driver_sql(prefix + statement, parameters)
+
+            return {
+                'columns': list(result.keys()),
+                'rows': [[str(v) for v in r] for r in result],
+            }
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def server_timing(duration, measurements: Measurements, repeated):
+    result = [
+        f'total;dur={duration * 1000:.1f}',
+        f'sql;dur={measurements.sql_seconds * 1000:.1f};desc="{measurements.sql_count} statements"',
+    ]
+
+    if repeated:
+        result.append(f'sql-repeated;desc="{len(repeated)} repeated"')
+
+    return ', '.join(result)
+
+
+def _start_profile():
+    if request.endpoint == 'static':
+        return
+
+    g.sql_profile = Measurements(statements=[])
+    g.sql_profile_start = time.perf_counter()
+    g.sql_profile_previous = start_measuring(g.sql_profile)
+
+
+def _stop_profile(exception=None):
+    if 'sql_profile_previous' in g:
+        stop_measuring(g.pop('sql_profile_previous'))
+
+
+def _end_profile(response):
+    if 'sql_profile' not in g:
+        return response
+
+    _stop_profile()
+
+    try:
+        measurements = g.sql_profile
+        duration = time.perf_counter() - g.sql_profile_start
+        repeated = repeated_statements(measurements.statements, current_app.config['SQL_PROFILING_REPEAT_THRESHOLD'])
+
+        response.headers.add('Server-Timing', server_timing(duration, measurements, repeated))
+
+        if repeated:
+            logging.warning(f'Repeated SQL statements in {request.method} {request.path}: ' + '; '.join(
+                f"{r['count']} x {r['statement'][:200]}" for r in repeated
+            ))
+
+        if duration * 1000 >= current_app.config['SQL_PROFILING_SLOW_REQUEST_MS']:
+            _log_slow_request(response, duration, measurements, repeated)
+
+    except Exception as e:
+        log_exception(e)
+
+    return response
+
+
+def _log_slow_request(response, duration, measurements: Measurements, repeated):
+    slowest = sorted(measurements.statements, key=lambda s: s.seconds, reverse=True)
+    slowest = slowest[:current_app.config['SQL_PROFILING_EXPLAIN_COUNT']]
+
+    slowest = [{
+        'statement': s.statement,
+        'parameters': repr(s.parameters)[:1000],
+        'ms': s.seconds * 1000,
+        'explain': explain(s.statement, s.parameters) if s.statement.lstrip().upper().startswith('SELECT') else None,
+    } for s in slowest]
+
+    now = datetime.now(timezone.utc)
+
+    with db.engine.begin() as conn:
+        conn.execute(insert(SlowRequest).values(
+            created_datetime=now,
+            method=request.method,
+            path=request.full_path[:500],
+            endpoint=request.endpoint,
+            status_code=response.status_code,
+            duration=duration,
+            sql_count=measurements.sql_count,
+            sql_seconds=measurements.sql_seconds,
+            repeated_count=len(repeated),
+            repeated_statements=json.dumps(repeated),
+            slowest_statements=json.dumps(slowest),
+        ))
+        conn.execute(
+            delete(SlowRequest)
+            .where(SlowRequest.created_datetime < now - timedelta(days=current_app.config['SQL_PROFILING_RETENTION_DAYS']))
+        )
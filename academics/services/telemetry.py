@@ -0,0 +1,112 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+_local = threading.local()
+
+
+@dataclass
+class Statement:
+    statement: str
+    parameters: object
+    seconds: float
+
+
+@dataclass
+class Measurements:
+    """Counts of the work done while measuring, which may be added
+    to by several threads at once.  If `statements` is a list, each
+    SQL statement executed, other than batch inserts and updates, is
+    also appended to it.
+    """
+    http_calls: int = 0
+    http_bytes: int = 0
+    cache_hits: int = 0
+    sql_count: int = 0
+    sql_seconds: float = 0
+    rows_written: int = 0
+    statements: list = field(default=None, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **values):
+        with self._lock:
+            for k, v in values.items():
+                setattr(self, k, getattr(self, k) + v)
+
+    def as_dict(self):
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.compare}
+
+
+def current_measurements():
+    return getattr(_local, 'measurements', None)
+
+
+@contextmanager
+def measuring(measurements=None):
+    """Records the HTTP calls and SQL statements made by this thread
+    into `measurements`, or a new Measurements if none is given.
+    Pass the measurements of another thread to include the work this
+    thread does on its behalf.
+    """
+    measurements = measurements or Measurements()
+    previous = start_measuring(measurements)
+
+    try:
+        yield measurements
+    finally:
+        stop_measuring(previous)
+
+
+def start_measuring(measurements):
+    """Starts recording into `measurements`, returning the measurements
+    to restore with `stop_measuring`, for when the start and end are
+    not in the same block.
+    """
+    previous = current_measurements()
+    _local.measurements = measurements
+
+    return previous
+
+
+def stop_measuring(previous):
+    _local.measurements = previous
+
+
+def record(**values):
+    if measurements := current_measurements():
+        measurements.add(**values)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('telemetry_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info['telemetry_start'].pop()
+    measurements = current_measurements()
+
+    if not measurements:
+        return
+
+    rows_written = 0
+
+    if statement.lstrip().upper().startswith(_WRITE_STATEMENTS):
+        rows_written = max(cursor.rowcount, 0)
+
+    measurements.add(
+        sql_count=1,
+        sql_seconds=seconds,
+        rows_written=rows_written,
+    )
+
+    if measurements.statements is not None and not executemany:
+        with measurements._lock:
+            measurements.statements.append(Statement(statement, parameters, seconds))
@@ -0,0 +1,174 @@
+import re
+from collections import defaultdict
+from lbrc_flask.database import db
+from sqlalchemy import column, distinct, false, func, literal, literal_column, select, table
+from sqlalchemy.dialects.mysql import match
+from academics.model.academic import CatalogPublicationsSources, Source
+from academics.model.publication import CATALOG_PUBLICATION_SEARCH_FTS, CatalogPublication, Journal, Keyword, catalog_publication_search, catalog_publications_keywords
+from academics.services import bulk
+
+
+DOI_RELEVANCE = 1000
+
+# The defaults of innodb_ft_min_token_size and the InnoDB stopword list.
+# These words are not in the FULLTEXT index, so cannot be required.
+INNODB_FT_MIN_TOKEN_SIZE = 3
+INNODB_STOPWORDS = frozenset([
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de',
+    'en', 'for', 'from', 'how', 'i', 'in', 'is', 'it', 'la', 'of',
+    'on', 'or', 'that', 'the', 'this', 'to', 'was', 'what', 'when',
+    'where', 'who', 'will', 'with', 'und', 'www',
+])
+
+
+def update_catalog_publication_search(catalog_publication_ids):
+    """Rebuilds the search text of the catalog publications.  Rows
+    for catalog publications that no longer exist are removed.
+    """
+    ids = set(filter(None, catalog_publication_ids))
+
+    if not ids:
+        return
+
+    keywords = defaultdict(list)
+
+    for cp_id, keyword in db.session.execute(
+        select(catalog_publications_keywords.c.catalog_publication_id, Keyword.keyword)
+        .join(Keyword, Keyword.id == catalog_publications_keywords.c.keyword_id)
+        .where(catalog_publications_keywords.c.catalog_publication_id.in_(ids))
+    ):
+        keywords[cp_id].append(keyword)
+
+    authors = defaultdict(list)
+
+    for cp_id, first_name, last_name, display_name in db.session.execute(
+        select(
+            CatalogPublicationsSources.catalog_publication_id,
+            Source.first_name,
+            Source.last_name,
+            Source.display_name,
+        )
+        .join(Source, Source.id == CatalogPublicationsSources.source_id)
+        .where(CatalogPublicationsSources.catalog_publication_id.in_(ids))
+        .order_by(CatalogPublicationsSources.ordinal)
+    ):
+        authors[cp_id].append(' '.join(filter(None, [first_name, last_name, display_name])))
+
+    rows = [
+        {
+            'catalog_publication_id': cp.id,
+            'title': cp.title or '',
+            'abstract': cp.abstract or '',
+            'journal': cp.journal_name or '',
+            'keywords': ' '.join(keywords[cp.id]),
+            'authors': ' '.join(authors[cp.id]),
+        }
+        for cp in db.session.execute(
+            select(
+                CatalogPublication.id,
+                CatalogPublication.title,
+                CatalogPublication.abstract,
+                Journal.name.label('journal_name'),
+            )
+            .outerjoin(Journal, Journal.id == CatalogPublication.journal_id)
+            .where(CatalogPublication.id.in_(ids))
+        )
+    ]
+
+    bulk.delete_keys(catalog_publication_search, ['catalog_publication_id'], list(ids))
+    bulk.bulk_insert(catalog_publication_search, rows)
+
+
+def update_catalog_publication_search_for_sources(source_ids):
+    """Rebuilds the search text of the catalog publications of the
+    sources, for example after their names change.
+    """
+    update_catalog_publication_search(db.session.execute(
+        select(distinct(CatalogPublicationsSources.catalog_publication_id))
+        .where(CatalogPublicationsSources.source_id.in_(source_ids))
+    ).scalars().all())
+
+
+def _search_terms(search_string):
+    return re.findall(r'\w+', search_string or '')
+
+
+def _looks_like_doi(search_string):
+    return re.fullmatch(r'\S*[./]\S*', (search_string or '').strip()) is not None
+
+
+def _innodb_boolean_query(terms):
+    """Boolean mode query for InnoDB requiring every term that is
+    indexed.  Stopwords and short terms are not in the index, so
+    requiring them would match nothing.  They are left out unless the
+    search has no other terms, when they can still match the start of
+    longer words.
+    """
+    indexed = [
+        t for t in terms
+        if len(t) >= INNODB_FT_MIN_TOKEN_SIZE and t.lower() not in INNODB_STOPWORDS
+    ]
+
+    return ' '.join(f'+{t}*' for t in indexed or terms)
+
+
+def catalog_publication_text_search(search_string):
+    """Select of the `catalog_publication_id` and `relevance` of the
+    catalog publications whose title, abstract, journal, keywords or
+    authors contain words starting with every word in `search_string`,
+    other than the words too common or short for MariaDB to index.
+
+    A search string that looks like a DOI, or part of one, also matches
+    the DOIs that contain it.
+    """
+    terms = _search_terms(search_string)
+    dialect = db.session.get_bind().dialect.name
+
+    if not terms:
+        q = select(
+            CatalogPublication.id.label('catalog_publication_id'),
+            literal(0).label('relevance'),
+        ).where(false())
+    elif dialect in ('mysql', 'mariadb'):
+        relevance = match(
+            catalog_publication_search.c.title,
+            catalog_publication_search.c.abstract,
+            catalog_publication_search.c.journal,
+            catalog_publication_search.c.keywords,
+            catalog_publication_search.c.authors,
+            against=_innodb_boolean_query(terms),
+        ).in_boolean_mode()
+
+        q = select(
+            catalog_publication_search.c.catalog_publication_id,
+            relevance.label('relevance'),
+        ).where(relevance)
+    elif dialect == 'sqlite':
+        fts = table(CATALOG_PUBLICATION_SEARCH_FTS, column('rowid'), column('rank'))
+
+        q = select(
+            fts.c.rowid.label('catalog_publication_id'),
+            (-fts.c.rank).label('relevance'),
+        ).where(
+            literal_column(CATALOG_PUBLICATION_SEARCH_FTS).op('MATCH')(' '.join(f'"{t}"*' for t in terms))
+        )
+    else:
+        raise NotImplementedError(f'Text search not supported for database dialect {dialect}')
+
+    if _looks_like_doi(search_string):
+        matches = q.union_all(
+            select(
+                CatalogPublication.id.label('catalog_publication_id'),
+                literal(DOI_RELEVANCE).label('relevance'),
+            ).where(CatalogPublication.doi.contains(search_string.strip(), autoescape=True))
+        ).subquery()
+
+        q = (
+            select(
+                matches.c.catalog_publication_id,
+                func.max(matches.c.relevance).label('relevance'),
+            )
+            .group_by(matches.c.catalog_publication_id)
+        )
+
+    return q.subquery()
@@ -6,18 +6,23 @@ from sqlalchemy import delete, select
 from wtforms.fields.simple import HiddenField, StringField, BooleanField
 from wtforms import DateField, RadioField, SelectField
 from academics.jobs.catalogs import AcademicInitialise, AcademicRefresh
+from academics.jobs.runner import run_jobs_asynch
+from academics.jobs.scheduling import schedule
+from academics.model.job import PRIORITY_INITIALISE, PRIORITY_INTERACTIVE
 from academics.catalogs.scopus import scopus_author_search
-from academics.model.academic import Academic, AcademicPotentialSource
+from academics.model.academic import Academic, AcademicPotentialSource, Source
 from academics.model.publication import CATALOG_SCOPUS
 from wtforms.validators import Length, DataRequired, Optional
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer
 from flask_security import roles_accepted
-from lbrc_flask.async_jobs import AsyncJobs, run_jobs_asynch
+from lbrc_flask.async_jobs import AsyncJobs
 from lbrc_flask.requests import get_value_from_all_arguments
 from functools import partial
 from academics.model.security import User, UserPicker
 from academics.model.theme import Theme
 from academics.services.academic_searching import AcademicSearchForm, academic_search_query
+from academics.services.publication_membership import update_publication_memberships_for_academics
+from academics.services.publication_summary import update_publication_summaries_for_sources
 from academics.services.sources import create_potential_sources, get_sources_for_catalog_identifiers
 from academics.ui.views.users import render_user_search_add, user_search_query
 from lbrc_flask.forms import MultiCheckboxField
@@ -81,7 +86,13 @@ def index():
     search_form = AcademicSearchForm(formdata=request.args)
 
     q = academic_search_query(search_form.data)
-    q = q.options(selectinload(Academic.sources))
+    q = q.options(
+        undefer(Academic.publication_count),
+        undefer(Academic.has_new_potential_sources),
+        selectinload(Academic.user),
+        selectinload(Academic.sources).undefer(Source.publication_count),
+        selectinload(Academic.sources).selectinload(Source.affiliations),
+    )
 
     academics = db.paginate(select=q)
 
@@ -128,6 +139,10 @@ def academic_edit(id):
         academic.user = user
 
         db.session.add(academic)
+        db.session.flush()
+
+        update_publication_memberships_for_academics([academic.id])
+
         db.session.commit()
 
         return refresh_response()
@@ -221,7 +236,10 @@ def add_author_submit():
         for s in sources:
             s.academic = academic
 
-        AsyncJobs.schedule(AcademicInitialise(academic))
+        db.session.flush()
+        update_publication_summaries_for_sources([s.id for s in sources])
+
+        schedule(AcademicInitialise(academic), priority=PRIORITY_INITIALISE)
         db.session.commit()
 
         run_jobs_asynch()
@@ -255,7 +273,7 @@ def delete_academic(id):
 def update_academic(id):
     academic = db.get_or_404(Academic, id)
 
-    AsyncJobs.schedule(AcademicRefresh(academic))
+    schedule(AcademicRefresh(academic), priority=PRIORITY_INTERACTIVE)
     db.session.commit()
     run_jobs_asynch()
 
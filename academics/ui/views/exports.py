@@ -1,20 +1,11 @@
-from collections import defaultdict
-from datetime import datetime
-from pathlib import Path
-import shutil
-import tempfile
-from flask import render_template, request, send_file
+from flask import abort, redirect, render_template, request, send_file, url_for
 from lbrc_flask.database import db
-from lbrc_flask.export import excel_download, pdf_download
-from lbrc_flask.lookups import NullObject
-from weasyprint import HTML
-from academics.model.academic import CatalogPublicationsSources, Source
-from academics.model.folder import FolderDoi
-from academics.model.publication import CatalogPublication, Publication
-from academics.model.theme import Theme
-from academics.services.publication_searching import PublicationSearchForm, publication_search_query
-from sqlalchemy.orm import selectinload
-from werkzeug.utils import secure_filename
+from lbrc_flask.security import current_user_id
+from academics.jobs.exports import run_export_job
+from academics.model.export import ExportJob
+from academics.services.export_jobs import create_export_job, export_artifact_path
+from academics.services.publication_export import excel_stream_download, publication_annual_report_rows, publication_dashboard_export_rows, publication_full_export_rows
+from academics.services.publication_searching import PublicationSearchForm
 from .. import blueprint
 
 
@@ -44,41 +35,7 @@ def publication_full_export_xlsx():
 
     search_form = PublicationSearchForm(formdata=request.args)
 
-    q = publication_search_query(search_form)
-    q = q.options(
-        selectinload(Publication.catalog_publications)
-        .selectinload(CatalogPublication.catalog_publication_sources)
-        .selectinload(CatalogPublicationsSources.source)
-    )
-    q = q.options(
-        selectinload(Publication.catalog_publications)
-        .selectinload(CatalogPublication.sponsors)
-    )
-    q = q.options(
-        selectinload(Publication.nihr_acknowledgement)
-    )
-
-    publication_details = ({
-        'catalog': p.best_catalog_publication.catalog,
-        'catalog_identifier': p.best_catalog_publication.catalog_identifier,
-        'doi': p.doi,
-        'journal': NullObject(p.best_catalog_publication.journal).name,
-        'type': NullObject(p.best_catalog_publication.subtype).description,
-        'volume': p.best_catalog_publication.volume,
-        'issue': p.best_catalog_publication.issue,
-        'pages': p.best_catalog_publication.pages,
-        'publication_cover_date': p.best_catalog_publication.publication_cover_date,
-        'title': p.best_catalog_publication.title,
-        'abstract': p.best_catalog_publication.abstract,
-        'open access': p.best_catalog_publication.is_open_access,
-        'citations': p.best_catalog_publication.cited_by_count,
-        'sponsor': '; '.join([s.name for s in p.best_catalog_publication.sponsors]),
-        'author_count': len(p.best_catalog_publication.catalog_publication_sources),
-        'brc_authors': '; '.join([f'{cps.source.display_name} ({cps.ordinal + 1})' for cps in p.best_catalog_publication.catalog_publication_sources if cps.source.academic is not None]),
-        'nihr acknowledgement': '' if p.nihr_acknowledgement is None else p.nihr_acknowledgement.name,
-    } for p in db.session.execute(q).scalars())
-
-    return excel_download('Academics_Publications', headers.keys(), publication_details)
+    return excel_stream_download('Academics_Publications', headers.keys(), publication_full_export_rows(search_form))
 
 
 @blueprint.route("/export/publications/annual_report")
@@ -91,20 +48,7 @@ def publication_full_annual_report_xlsx():
 
     search_form = PublicationSearchForm(formdata=request.args)
 
-    q = publication_search_query(search_form)
-
-    q = q.with_only_columns(
-        Publication.id,
-        Publication.doi,
-        Publication.vancouver,
-    )
-
-    publication_details = ({
-        'Publication Reference': p.vancouver,
-        'DOI': p.doi,
-    } for p in db.session.execute(q).unique().mappings())
-
-    return excel_download('Academics_Publications', headers.keys(), publication_details)
+    return excel_stream_download('Academics_Publications', headers.keys(), publication_annual_report_rows(search_form))
 
 
 @blueprint.route("/export/publications/dashboard")
@@ -122,109 +66,55 @@ def publication_dashboard_report_xlsx():
 
     search_form = PublicationSearchForm(formdata=request.args)
 
-    q = publication_search_query(search_form)
+    return excel_stream_download('Academics_Publications', headers.keys(), publication_dashboard_export_rows(search_form))
 
-    q = q.options(
-        selectinload(Publication.catalog_publications)
-        .selectinload(CatalogPublication.catalog_publication_sources)
-        .selectinload(CatalogPublicationsSources.source)
-    )
-    q = q.options(
-        selectinload(Publication.catalog_publications)
-        .selectinload(CatalogPublication.sponsors)
-    )
-    q = q.options(
-        selectinload(Publication.nihr_acknowledgement)
-    )
 
-    publication_details = []
+@blueprint.route("/export/publications/pdf")
+def publication_export_pdf():
+    export_job = create_export_job(ExportJob.TYPE_PUBLICATIONS_PDF, request.args)
 
-    for p in db.session.execute(q).unique().scalars():
-        p: Publication
+    run_export_job.delay(export_job_id=export_job.id)
 
-        themes = [t.name for t in p.themes]
+    return redirect(url_for('ui.export_job', id=export_job.id))
 
-        if not themes:
-            themes = ['']
 
-        for t in themes:
-            t: Theme
+@blueprint.route("/export/publications/author_report/pdf")
+def publication_author_report_pdf():
+    export_job = create_export_job(ExportJob.TYPE_AUTHOR_REPORT, request.args)
 
-            publication_details.append({
-                'DOI': p.doi,
-                'NIHR Acknowledgement': p.nihr_acknowledgement_name,
-                'Theme': t,
-                'External Collaboration': 'Yes' if p.is_external_collaboration else 'No',
-                'Industrial Collaboration': 'Yes' if p.is_industrial_collaboration else 'No',
-                'International Collaboration': 'Yes' if p.is_international_collaboration else 'No',
-                'Theme Collaboration': 'Yes' if p.is_theme_collaboration else 'No',
-            })
+    run_export_job.delay(export_job_id=export_job.id)
 
-    return excel_download('Academics_Publications', headers.keys(), publication_details)
+    return redirect(url_for('ui.export_job', id=export_job.id))
 
 
-@blueprint.route("/export/publications/pdf")
-def publication_export_pdf():
-    search_form = PublicationSearchForm(formdata=request.args)
-    
-    q = publication_search_query(search_form)
-    q = q.options(
-        selectinload(Publication.catalog_publications)
-        .selectinload(CatalogPublication.catalog_publication_sources)
-        .selectinload(CatalogPublicationsSources.source)
-        .selectinload(Source.academic)
-    )
-    q = q.options(
-        selectinload(Publication.folder_dois)
-        .selectinload(FolderDoi.folder)
-    )
+def _get_export_job_or_404(id):
+    export_job: ExportJob = db.get_or_404(ExportJob, id)
 
-    publications = db.session.execute(q.order_by(CatalogPublication.publication_period_start)).unique().scalars()
+    if export_job.owner_id != current_user_id():
+        abort(403)
 
-    return pdf_download(
-        'ui/exports/publication_export.html',
-        publications=publications,
-        parameters=search_form.values_description(),
-    )
+    return export_job
 
 
-@blueprint.route("/export/publications/author_report/pdf")
-def publication_author_report_pdf():
-    search_form = PublicationSearchForm(formdata=request.args)
-    
-    q = publication_search_query(search_form)
-    q = q.options(
-        selectinload(Publication.catalog_publications)
-        .selectinload(CatalogPublication.catalog_publication_sources)
-        .selectinload(CatalogPublicationsSources.source)
-        .selectinload(Source.academic)
-    )
+@blueprint.route("/export/<int:id>")
+def export_job(id):
+    return render_template("ui/exports/job.html", export_job=_get_export_job_or_404(id))
+
+
+@blueprint.route("/export/<int:id>/status")
+def export_job_status(id):
+    return render_template("ui/exports/_job_status.html", export_job=_get_export_job_or_404(id))
+
 
-    publications = db.session.execute(q.order_by(CatalogPublication.publication_period_start)).unique().scalars()
-
-    academics = defaultdict(set)
-
-    for p in publications:
-        for a in p.academics:
-            academics[a].add(p)
-
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        print('created temporary directory', tmpdirname)
-
-        for a, pubs in academics.items():
-            html = render_template(
-                'ui/exports/publications_by_academic.html',
-                publications=pubs,
-                academic=a,
-                parameters=search_form.values_description(),
-            )
-            weasy_html = HTML(string=html, base_url=tmpdirname)
-            weasy_html.write_pdf(Path(tmpdirname) / secure_filename(a.full_name))
-
-        with tempfile.NamedTemporaryFile(delete=False) as zipfilename:
-            zipname = shutil.make_archive(zipfilename.name, 'zip', tmpdirname)
-            return send_file(
-                zipname,
-                as_attachment=True,
-                download_name=f'publication_author_report_{datetime.now():%Y%m%d_%H%M%S}.zip',
-                )
+@blueprint.route("/export/<int:id>/download")
+def export_job_download(id):
+    export_job = _get_export_job_or_404(id)
+
+    if not export_job.is_downloadable:
+        abort(404)
+
+    return send_file(
+        export_artifact_path(export_job),
+        as_attachment=True,
+        download_name=export_job.filename,
+    )
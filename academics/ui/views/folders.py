@@ -2,8 +2,10 @@ import re
 from string import whitespace
 from academics.jobs.emails import email_theme_folder_academics_publication, email_theme_folder_publication_list
 from academics.services.academic_searching import academic_search_query
-from academics.services.folder import FolderPublicationSearchForm, FolderThemeSearchForm, add_doi_to_folder, add_dois_to_folder, current_user_folders_search_query, folder_publication_search_query, folder_scheule_update_publications, folder_theme_search_query, is_folder_name_duplicate, remove_doi_from_folder
+from academics.services.folder import FOLDER_PUBLICATION_ORDER_BY, FolderPublicationSearchForm, FolderThemeSearchForm, add_doi_to_folder, add_dois_to_folder, current_user_folders_search_query, folder_publication_search_query, folder_scheule_update_publications, folder_theme_search_query, is_folder_name_duplicate, remove_doi_from_folder
 from academics.services.folder_academics import folder_academics_search_query_with_folder_summary
+from academics.services.pagination import keyset_paginate, keyset_total_key
+from academics.services.result_cache import bump_data_version
 from academics.services.publication_searching import nihr_acknowledgement_select_choices, publication_picker_search_query
 from academics.services.publications import add_manual_doi_publications_if_missing
 from academics.ui.views.users import render_user_search_results, user_search_query
@@ -93,6 +95,7 @@ def folder_edit(id):
         form.populate_item(folder)
 
         db.session.add(folder)
+        bump_data_version()
         db.session.commit()
 
         return refresh_response()
@@ -135,6 +138,7 @@ def folder_delete(id):
     folder = db.get_or_404(Folder, id)
 
     db.session.delete(folder)
+    bump_data_version()
     db.session.commit()
 
     return refresh_response()
@@ -234,7 +238,17 @@ def folder_publications(folder_id, academic_id=None, theme_id=None):
         .selectinload(Source.academic)
     )
 
-    publications = db.paginate(select=q, per_page=10)
+    args = request.view_args | request.args.to_dict(flat=False)
+
+    publications = keyset_paginate(
+        q,
+        FOLDER_PUBLICATION_ORDER_BY,
+        after=request.args.get('after'),
+        before=request.args.get('before'),
+        per_page=10,
+        args=args,
+        total_key=keyset_total_key(request.path, args),
+    )
 
     return render_template(
         "ui/folder/publications.html",
@@ -1,5 +1,6 @@
 from academics.model.group import Group
 from academics.services.groups import is_group_name_duplicate
+from academics.services.publication_membership import update_publication_memberships_for_academics
 from academics.ui.views.users import render_user_search_results, user_search_query
 from .. import blueprint
 from flask import render_template, request, url_for
@@ -92,8 +93,13 @@ def group_edit(id=None):
 @assert_group_user()
 def group_delete(id):
     group = db.get_or_404(Group, id)
+    academic_ids = [a.id for a in group.academics]
 
     db.session.delete(group)
+    db.session.flush()
+
+    update_publication_memberships_for_academics(academic_ids)
+
     db.session.commit()
 
     return refresh_response()
@@ -123,6 +129,10 @@ def group_delete_acadmic(group_id, academic_id):
     g.academics.remove(a)
 
     db.session.add(g)
+    db.session.flush()
+
+    update_publication_memberships_for_academics([a.id])
+
     db.session.commit()
 
     return refresh_response()
@@ -139,6 +149,10 @@ def group_add_academic(group_id):
     g.academics.add(a)
 
     db.session.add(g)
+    db.session.flush()
+
+    update_publication_memberships_for_academics([a.id])
+
     db.session.commit()
 
     return refresh_response()
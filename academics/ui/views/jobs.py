@@ -1,17 +1,21 @@
+from flask import render_template, request
 from lbrc_flask.database import db
 from academics.jobs.catalogs import ManaualCatalogPublicationsFindScopus, PublicationReGuessStatus, RefreshAll, InstitutionRefreshAll
 from flask_security import roles_accepted
-from lbrc_flask.async_jobs import AsyncJobs, run_jobs_asynch
 from lbrc_flask.response import refresh_response
 
-from academics.jobs.publications import AutoFillFolders
+from academics.jobs.publications import AutoFillFolders, PublicationCollaborationRefresh
+from academics.jobs.runner import run_jobs_asynch
+from academics.jobs.scheduling import schedule
+from academics.model.job import LANES
+from academics.services.job_telemetry import PERCENTILES, job_telemetry_summary
 from .. import blueprint
 
 
 @blueprint.route("/jobs/update_all_academics")
 @roles_accepted('admin')
 def update_all_academics():
-    AsyncJobs.schedule(RefreshAll())
+    schedule(RefreshAll())
     db.session.commit()
     
     run_jobs_asynch()
@@ -28,7 +32,7 @@ def run_outstanding_jobs():
 @blueprint.route("/jobs/fill_folders")
 @roles_accepted('admin')
 def auto_fill_folders():
-    AsyncJobs.schedule(AutoFillFolders())
+    schedule(AutoFillFolders())
     db.session.commit()
     
     run_jobs_asynch()
@@ -38,7 +42,7 @@ def auto_fill_folders():
 @blueprint.route("/jobs/manaual_catalog_publications_find_scopus")
 @roles_accepted('admin')
 def manaual_catalog_publications_find_scopus():
-    AsyncJobs.schedule(ManaualCatalogPublicationsFindScopus())
+    schedule(ManaualCatalogPublicationsFindScopus())
     db.session.commit()
     
     run_jobs_asynch()
@@ -48,7 +52,7 @@ def manaual_catalog_publications_find_scopus():
 @blueprint.route("/redo_publication_statuses")
 @roles_accepted('admin')
 def redo_publication_statuses():
-    AsyncJobs.schedule(PublicationReGuessStatus())
+    schedule(PublicationReGuessStatus())
     db.session.commit()
 
     run_jobs_asynch()
@@ -58,8 +62,32 @@ def redo_publication_statuses():
 @blueprint.route("/refresh_institutions")
 @roles_accepted('admin')
 def refresh_institutions():
-    AsyncJobs.schedule(InstitutionRefreshAll())
+    schedule(InstitutionRefreshAll())
     db.session.commit()
 
     run_jobs_asynch()
     return refresh_response()
+
+
+@blueprint.route("/refresh_publication_collaborations")
+@roles_accepted('admin')
+def refresh_publication_collaborations():
+    schedule(PublicationCollaborationRefresh())
+    db.session.commit()
+
+    run_jobs_asynch()
+    return refresh_response()
+
+
+@blueprint.route("/jobs/telemetry")
+@roles_accepted('admin')
+def job_telemetry():
+    hours = request.args.get('hours', 24, type=int)
+
+    return render_template(
+        "ui/jobs/telemetry.html",
+        telemetry=job_telemetry_summary(hours),
+        hours=hours,
+        lanes=LANES,
+        percentiles=PERCENTILES,
+    )
@@ -11,12 +11,15 @@ from academics.model.folder import Folder
 from academics.model.publication import CatalogPublication, Journal, Keyword, NihrAcknowledgement, Publication, Subtype
 from academics.model.security import User
 from academics.services.folder import add_doi_to_folder
-from academics.services.publication_searching import PublicationSearchForm, academic_select_choices, best_catalog_publications, folder_select_choices, journal_select_choices, keyword_select_choices, publication_search_query
+from academics.services.pagination import keyset_paginate, keyset_total_key
+from academics.services.publication_searching import PublicationSearchForm, academic_select_choices, folder_select_choices, journal_select_choices, keyword_select_choices, publication_search_keyset, update_best_catalog_publications
 from sqlalchemy import select, or_
 from sqlalchemy.orm import selectinload
 from wtforms.validators import Length, DataRequired, Optional
 from lbrc_flask.requests import get_value_from_all_arguments
+from academics.services.publication_summary import update_publication_summaries
 from academics.services.publications import update_manual_publication
+from academics.services.text_searching import update_catalog_publication_search
 from .. import blueprint
 
 
@@ -52,7 +55,7 @@ class PublicationAddForm(FlashingForm):
 def publications():
     search_form = PublicationSearchForm(formdata=request.args)
 
-    q = publication_search_query(search_form)
+    q, order_by = publication_search_keyset(search_form)
 
     q = q.options(
         selectinload(Publication.catalog_publications)
@@ -60,13 +63,17 @@ def publications():
         .selectinload(CatalogPublicationsSources.source)
         .selectinload(Source.academic)
     )
-    q = q.order_by(CatalogPublication.publication_cover_date.desc())
 
-    publications = db.paginate(
-        select=q,
-        page=search_form.page.data,
+    args = request.args.to_dict(flat=False)
+
+    publications = keyset_paginate(
+        q,
+        order_by,
+        after=request.args.get('after'),
+        before=request.args.get('before'),
         per_page=5,
-        error_out=False,
+        args=args,
+        total_key=keyset_total_key(request.path, args),
     )
 
     keywords = db.session.execute(select(Keyword).where(Keyword.id.in_(search_form.keywords.data)).order_by(Keyword.keyword)).scalars().all()
@@ -101,8 +108,7 @@ def publications():
 def validation():
     q = (
         select(Publication)
-        .join(Publication.catalog_publications)
-        .where(CatalogPublication.id.in_(best_catalog_publications()))
+        .join(Publication.best_catalog_publication)
         .where(CatalogPublication.subtype_id.in_([s.id for s in Subtype.get_validation_types()]))
         .where(CatalogPublication.publication_cover_date >= current_app.config['HISTORIC_PUBLICATION_CUTOFF'])
         .where(Publication.nihr_acknowledgement_id == None)
@@ -197,6 +203,9 @@ def publication_update_preprint(id, is_preprint):
     publication = db.get_or_404(Publication, id)
     publication.preprint = is_preprint
     db.session.add(publication)
+    db.session.flush()
+
+    update_publication_summaries([publication.id])
     db.session.commit()
 
     return request_publication_bar(publication.id)
@@ -209,10 +218,13 @@ def publication_update_nihr_acknowledgement(id, nihr_acknowledgement_id):
 
     if nihr_acknowledgement_id == 0:
         publication.nihr_acknowledgement = None
-        db.session.commit()
     else:
         publication.nihr_acknowledgement = db.get_or_404(NihrAcknowledgement, nihr_acknowledgement_id)
-        db.session.commit()
+
+    db.session.flush()
+
+    update_publication_summaries([publication.id])
+    db.session.commit()
 
     return request_publication_bar(publication.id)
 
@@ -253,6 +265,9 @@ def publication_delete_supplementary_author(id, academic_id):
     publication.supplementary_authors.remove(academic)
 
     db.session.add(publication)
+    db.session.flush()
+
+    update_publication_summaries([publication.id])
     db.session.commit()
 
     return trigger_response('refreshAuthors')
@@ -313,6 +328,9 @@ def publication_add_supplementary_author(publication_id):
     p.supplementary_authors.append(a)
 
     db.session.add(p)
+    db.session.flush()
+
+    update_publication_summaries([p.id])
     db.session.commit()
 
     return trigger_response('refreshAuthors')
@@ -406,8 +424,14 @@ def catalog_publication_edit(id=None):
 @blueprint.route("/catalog_publication/<int:id>/delete", methods=['POST'])
 def catalog_publication_delete(id):
     catalog_publication = db.get_or_404(CatalogPublication, id)
+    publication_id = catalog_publication.publication_id
 
     db.session.delete(catalog_publication)
+    db.session.flush()
+
+    update_best_catalog_publications([publication_id])
+    update_catalog_publication_search([id])
+    update_publication_summaries([publication_id])
     db.session.commit()
 
     return refresh_response()
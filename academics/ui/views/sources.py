@@ -2,14 +2,17 @@ from flask import abort, render_template
 from sqlalchemy import select
 from wtforms import SelectField
 from academics.jobs.catalogs import AcademicRefresh
+from academics.jobs.runner import run_jobs_asynch
+from academics.jobs.scheduling import schedule
+from academics.model.job import PRIORITY_INTERACTIVE
 from academics.model.academic import Academic, AcademicPotentialSource, Source
+from academics.services.publication_summary import update_publication_summaries_for_sources
 from academics.services.sources import create_potential_sources
 from .. import blueprint
 from lbrc_flask.database import db
 from lbrc_flask.forms import FlashingForm
 from flask_security import roles_accepted
 from lbrc_flask.response import refresh_response, trigger_response
-from lbrc_flask.async_jobs import AsyncJobs, run_jobs_asynch
 
 
 class AcademicEditForm(FlashingForm):
@@ -40,6 +43,9 @@ def source_summary_details(id):
             create_potential_sources([s], a, not_match=False)
             s.academic = a
             db.session.add(s)
+            db.session.flush()
+
+            update_publication_summaries_for_sources([s.id])
             db.session.commit()
 
         return refresh_response()
@@ -89,9 +95,12 @@ def academics_amend_potential_sources(id, academic_id, status):
         case 'match':
             ps.source.academic = a
             ps.not_match = False
-            AsyncJobs.schedule(AcademicRefresh(a))
+            schedule(AcademicRefresh(a), priority=PRIORITY_INTERACTIVE)
     
     db.session.add(ps)
+    db.session.flush()
+
+    update_publication_summaries_for_sources([ps.source_id])
     db.session.commit()
 
     run_jobs_asynch()
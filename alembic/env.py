@@ -22,6 +22,10 @@ import academics.model.theme
 import academics.catalogs.scopus
 import academics.model.raw_data
 import academics.model.group
+import academics.model.summary
+import academics.model.export
+import academics.model.job
+import academics.model.profiling
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
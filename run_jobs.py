@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
 from lbrc_flask.database import db
 
@@ -10,11 +11,22 @@ load_dotenv()
 from academics.jobs.catalogs import RefreshAll
 
 from academics import create_app
-from lbrc_flask.async_jobs import run_jobs_asynch
+from academics.jobs.runner import run_jobs_asynch
+from academics.jobs.workers import run_workers
 
-application = create_app()
-application.app_context().push()
 
-application.config['SERVER_NAME'] = os.environ["CELERY_SERVER_NAME"]
+# Guarded as the worker processes import this module when they start
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the outstanding jobs')
+    parser.add_argument('--workers', type=int, default=0, help='Run the jobs in this many worker processes rather than queueing them for Celery')
+    args = parser.parse_args()
 
-run_jobs_asynch()
+    application = create_app()
+    application.app_context().push()
+
+    application.config['SERVER_NAME'] = os.environ["CELERY_SERVER_NAME"]
+
+    if args.workers:
+        run_workers(args.workers, config={'SERVER_NAME': application.config['SERVER_NAME']})
+    else:
+        run_jobs_asynch()
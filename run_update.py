@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
 from lbrc_flask.database import db
 
@@ -12,16 +13,29 @@ load_dotenv()
 from academics.jobs.catalogs import RefreshAll
 
 from academics import create_app
-from lbrc_flask.async_jobs import AsyncJobs, run_jobs_asynch
+from academics.jobs.runner import run_jobs_asynch
+from academics.jobs.scheduling import schedule
+from academics.jobs.workers import run_workers
 
-application = create_app()
-application.app_context().push()
 
-application.config['SERVER_NAME'] = os.environ["CELERY_SERVER_NAME"]
+# Guarded as the worker processes import this module when they start
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Schedule the periodic update and run the outstanding jobs')
+    parser.add_argument('--workers', type=int, default=0, help='Run the jobs in this many worker processes rather than queueing them for Celery')
+    args = parser.parse_args()
 
-AsyncJobs.schedule(RefreshAll())
-AsyncJobs.schedule(PublicationRemoveUnused())
-AsyncJobs.schedule(AutoFillFolders())
+    application = create_app()
+    application.app_context().push()
 
-db.session.commit()
-run_jobs_asynch()
+    application.config['SERVER_NAME'] = os.environ["CELERY_SERVER_NAME"]
+
+    schedule(RefreshAll())
+    schedule(PublicationRemoveUnused())
+    schedule(AutoFillFolders())
+
+    db.session.commit()
+
+    if args.workers:
+        run_workers(args.workers, config={'SERVER_NAME': application.config['SERVER_NAME']})
+    else:
+        run_jobs_asynch()
@@ -0,0 +1,28 @@
+from collections import namedtuple
+from academics.catalogs.fetching import _fetch_for_catalogs
+
+
+Reference = namedtuple('Reference', ['catalog', 'catalog_identifier'])
+
+
+def test__fetch_for_catalogs__batch_identifiers_are_case_insensitive(app):
+    references = [
+        Reference('open alex', 'W1'),
+        Reference('open alex', 'w2'),
+        Reference('open alex', 'W3'),
+    ]
+
+    def batch_fetcher(ids):
+        return {'w1': 'first', 'W2': 'second'}
+
+    actual = dict(_fetch_for_catalogs(
+        references,
+        fetchers={},
+        batch_fetchers={'open alex': (batch_fetcher, 10)},
+    ))
+
+    assert actual == {
+        Reference('open alex', 'W1'): 'first',
+        Reference('open alex', 'w2'): 'second',
+        Reference('open alex', 'W3'): None,
+    }
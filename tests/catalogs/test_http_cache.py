@@ -0,0 +1,52 @@
+from academics.catalogs.http_cache import ResponseCache, endpoint_for_url
+
+
+def _cache(tmp_path, max_bytes=1024 * 1024, ttl=60):
+    return ResponseCache(
+        path=str(tmp_path / 'cache.db'),
+        max_bytes=max_bytes,
+        ttls={'abstract': ttl, 'other': ttl},
+    )
+
+
+def test__response_cache__put_and_get(tmp_path):
+    cache = _cache(tmp_path)
+
+    cache.put('key', 'abstract', '{"a": 1}', etag='"123"')
+
+    actual = cache.get('key')
+
+    assert actual.text == '{"a": 1}'
+    assert actual.etag == '"123"'
+    assert actual.is_fresh
+
+
+def test__response_cache__missing(tmp_path):
+    cache = _cache(tmp_path)
+
+    assert cache.get('key') is None
+
+
+def test__response_cache__expired_is_not_fresh(tmp_path):
+    cache = _cache(tmp_path, ttl=-1)
+
+    cache.put('key', 'abstract', 'text')
+
+    assert not cache.get('key').is_fresh
+
+
+def test__response_cache__evicts_least_recently_used(tmp_path):
+    cache = _cache(tmp_path, max_bytes=1)
+
+    cache.put('first', 'abstract', 'one')
+    cache.put('second', 'abstract', 'two')
+
+    assert cache.get('first') is None
+
+
+def test__endpoint_for_url():
+    assert endpoint_for_url('https://api.elsevier.com/content/abstract/scopus_id/123') == 'abstract'
+    assert endpoint_for_url('https://api.elsevier.com/content/search/scopus?query=x') == 'search'
+    assert endpoint_for_url('https://api.elsevier.com/analytics/scival/institution/1') == 'scival_institution'
+    assert endpoint_for_url('https://api.openalex.org/authors/A123') == 'author'
+    assert endpoint_for_url('https://example.com/') == 'other'
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+from lbrc_flask.database import db
+from sqlalchemy import select
+from academics.catalogs.data_classes import InstitutionData
+from academics.jobs.catalogs import InstitutionRefresh
+from academics.model.catalog import CATALOG_SCIVAL
+from academics.model.publication import Publication
+from academics.model.summary import PublicationSummary
+from academics.services.publication_searching import update_best_catalog_publications
+from academics.services.publication_summary import update_publication_summaries
+
+
+def _international(publication_id):
+    return db.session.execute(
+        select(Publication.is_international_collaboration).where(Publication.id == publication_id)
+    ).scalar()
+
+
+def _summary_international(publication_id):
+    return db.session.execute(
+        select(PublicationSummary.is_international_collaboration).where(PublicationSummary.publication_id == publication_id)
+    ).scalar()
+
+
+def test__institution_refresh__country_changed(app, faker):
+    institution = faker.institution().get(save=True, catalog=CATALOG_SCIVAL, country_code='GBR', sector='academic')
+    catalog_publication = faker.catalog_publication().get(save=True)
+    publication = catalog_publication.publication
+    publication.institutions = {institution}
+    publication.set_collaboration_flags()
+    update_best_catalog_publications([publication.id])
+    update_publication_summaries([publication.id])
+    db.session.commit()
+
+    assert _international(publication.id) == False
+    assert _summary_international(publication.id) == False
+
+    with patch('academics.jobs.catalogs.get_scival_institution') as get_scival_institution:
+        get_scival_institution.return_value = InstitutionData(
+            catalog=CATALOG_SCIVAL,
+            catalog_identifier=institution.catalog_identifier,
+            name=institution.name,
+            country_code='USA',
+            sector='academic',
+        )
+
+        InstitutionRefresh(institution)._run_actual()
+
+    assert _international(publication.id) == True
+    assert _summary_international(publication.id) == True
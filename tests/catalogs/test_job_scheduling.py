@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta, timezone
+from lbrc_flask.async_jobs import AsyncJobs
+from lbrc_flask.database import db
+from academics.jobs.catalogs import CatalogPublicationRefreshStale, RefreshAll
+from academics.jobs.runner import add_missing_schedules, claim_next_job, next_due_job, release_claims, worker_name
+from academics.jobs.scheduling import running_job_priority, schedule
+from academics.model.catalog import CATALOG_OPEN_ALEX, CATALOG_SCIVAL, CATALOG_SCOPUS
+from academics.model.job import LANE_DATABASE, LANE_OPEN_ALEX, LANE_SCIVAL, LANE_SCOPUS, PRIORITY_INITIALISE, PRIORITY_INTERACTIVE, PRIORITY_PERIODIC, catalog_lane
+
+
+def test__catalog_lane():
+    assert catalog_lane(CATALOG_SCOPUS) == LANE_SCOPUS
+    assert catalog_lane(CATALOG_SCIVAL) == LANE_SCIVAL
+    assert catalog_lane(CATALOG_OPEN_ALEX) == LANE_OPEN_ALEX
+    assert catalog_lane('manual') == LANE_DATABASE
+    assert catalog_lane(None) == LANE_DATABASE
+
+
+def test__schedule__default_priority(app):
+    job = RefreshAll()
+
+    assert schedule(job)
+    db.session.commit()
+
+    assert job.job_schedule.priority == PRIORITY_PERIODIC
+    assert job.job_schedule.lane == LANE_DATABASE
+
+
+def test__schedule__inherits_running_priority(app):
+    job = RefreshAll()
+
+    with running_job_priority(PRIORITY_INTERACTIVE):
+        schedule(job, priority=PRIORITY_INITIALISE)
+
+    db.session.commit()
+
+    assert job.job_schedule.priority == PRIORITY_INTERACTIVE
+
+
+def test__schedule__coalesced_raises_priority(app):
+    job = RefreshAll()
+    schedule(job)
+    db.session.commit()
+
+    assert not schedule(RefreshAll(), priority=PRIORITY_INTERACTIVE)
+    db.session.commit()
+
+    assert job.job_schedule.priority == PRIORITY_INTERACTIVE
+
+
+def test__schedule__not_coalesced_into_failed_job(app):
+    failed = RefreshAll()
+    schedule(failed)
+    db.session.commit()
+
+    failed.scheduled = None
+    db.session.commit()
+
+    job = RefreshAll()
+
+    assert schedule(job)
+    db.session.commit()
+
+    assert job.id != failed.id
+    assert next_due_job(LANE_DATABASE)[0] == job
+
+
+def test__schedule__coalesced_brings_forward_retry(app):
+    retrying = RefreshAll()
+    schedule(retrying)
+    db.session.commit()
+
+    retrying.scheduled = datetime.now(timezone.utc) + timedelta(days=2)
+    db.session.commit()
+
+    assert next_due_job(LANE_DATABASE) is None
+
+    assert not schedule(RefreshAll())
+    db.session.commit()
+
+    assert next_due_job(LANE_DATABASE)[0] == retrying
+
+
+def test__schedule__interactive_over_failed_job(app):
+    failed = RefreshAll()
+    schedule(failed)
+    db.session.commit()
+
+    failed.scheduled = None
+    db.session.commit()
+
+    job = RefreshAll()
+
+    assert schedule(job, priority=PRIORITY_INTERACTIVE)
+    db.session.commit()
+
+    assert failed.job_schedule.priority == PRIORITY_PERIODIC
+    assert next_due_job(LANE_DATABASE) == (job, PRIORITY_INTERACTIVE)
+
+
+def test__next_due_job__highest_priority_first(app):
+    periodic = RefreshAll()
+    interactive = CatalogPublicationRefreshStale()
+
+    schedule(periodic)
+    schedule(interactive, priority=PRIORITY_INTERACTIVE)
+    db.session.commit()
+
+    job, priority = next_due_job(LANE_DATABASE)
+
+    assert job == interactive
+    assert priority == PRIORITY_INTERACTIVE
+
+
+def test__claim_next_job__claimed_once(app):
+    job = RefreshAll()
+    schedule(job)
+    db.session.commit()
+
+    claimed, _ = claim_next_job(LANE_DATABASE)
+
+    assert claimed == job
+    assert job.job_schedule.claimed_by == worker_name()
+    assert claim_next_job(LANE_DATABASE) is None
+
+
+def test__claim_next_job__released_claim(app):
+    job = RefreshAll()
+    schedule(job)
+    db.session.commit()
+
+    claim_next_job(LANE_DATABASE)
+
+    assert release_claims() == 1
+    assert claim_next_job(LANE_DATABASE)[0] == job
+
+
+def test__claim_next_job__expired_claim(app):
+    job = RefreshAll()
+    schedule(job)
+    db.session.commit()
+
+    job.job_schedule.claimed_by = worker_name(pid=1)
+    job.job_schedule.claimed_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.session.commit()
+
+    assert claim_next_job(LANE_DATABASE)[0] == job
+
+
+def test__add_missing_schedules(app):
+    job = RefreshAll()
+    AsyncJobs.schedule(job)
+    db.session.commit()
+
+    assert job.job_schedule is None
+
+    add_missing_schedules()
+    db.session.refresh(job)
+
+    assert job.job_schedule.priority == PRIORITY_PERIODIC
+    assert job.job_schedule.lane == LANE_DATABASE
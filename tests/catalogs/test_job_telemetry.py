@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+from lbrc_flask.database import db
+from sqlalchemy import select
+from academics.jobs.catalogs import RefreshAll
+from academics.jobs.scheduling import schedule
+from academics.model.job import JobExecution
+from academics.services.job_telemetry import _percentile, job_type_statistics, record_job_execution
+from academics.services.telemetry import Measurements, measuring, record
+
+
+def test__percentile():
+    values = list(range(1, 101))
+
+    assert _percentile(values, 50) == 50
+    assert _percentile(values, 99) == 99
+    assert _percentile([7], 90) == 7
+    assert _percentile([], 50) is None
+
+
+def test__measuring__counts_sql(app):
+    with measuring() as measurements:
+        db.session.execute(select(JobExecution)).all()
+
+    assert measurements.sql_count == 1
+    assert measurements.rows_written == 0
+
+
+def test__record__only_while_measuring(app):
+    record(http_calls=1)
+
+    with measuring() as measurements:
+        record(http_calls=1, http_bytes=100)
+        record(cache_hits=1)
+
+    assert measurements.http_calls == 1
+    assert measurements.http_bytes == 100
+    assert measurements.cache_hits == 1
+
+
+def test__job_type_statistics(app):
+    job = RefreshAll()
+    schedule(job)
+    db.session.commit()
+
+    now = datetime.now(timezone.utc)
+
+    for duration, outcome in [(1, JobExecution.OUTCOME_SUCCESS), (3, JobExecution.OUTCOME_ERROR)]:
+        record_job_execution(job, job.job_schedule, 'worker', now, duration, Measurements(sql_count=2), outcome)
+
+    db.session.commit()
+
+    actual = job_type_statistics(now - timedelta(hours=1))
+
+    assert len(actual) == 1
+    assert actual[0]['job_type'] == 'RefreshAll'
+    assert actual[0]['executions'] == 2
+    assert actual[0]['errors'] == 1
+    assert actual[0]['duration'] == {'p50': 1, 'p90': 3, 'p99': 3}
+    assert actual[0]['sql_count']['p50'] == 2
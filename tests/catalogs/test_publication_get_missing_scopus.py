@@ -0,0 +1,61 @@
+from unittest.mock import patch
+from lbrc_flask.async_jobs import AsyncJob
+from lbrc_flask.database import db
+from academics.catalogs.fetching import prefetching
+from academics.jobs.catalogs import PublicationGetMissingScopus
+from academics.jobs.runner import run_job
+from academics.jobs.scheduling import schedule
+
+
+def _schedule(faker):
+    publication = faker.publication().get(save=True, doi='10.1000/123')
+    job = PublicationGetMissingScopus(publication)
+    schedule(job)
+    db.session.commit()
+
+    return job
+
+
+def _run(job):
+    job_id = job.id
+
+    with patch('academics.jobs.catalogs.get_scopus_publication_search_data') as get_scopus_publication_search_data:
+        get_scopus_publication_search_data.return_value = None
+
+        run_job(job)
+
+    get_scopus_publication_search_data.assert_called_once_with(doi='10.1000/123')
+
+    # The job is only deleted if it succeeded
+    assert db.session.get(AsyncJob, job_id) is None
+
+
+@patch('academics.jobs.catalogs.get_scopus_publication_search_datas_for_dois')
+def test__publication_get_missing_scopus__outside_run(get_scopus_publication_search_datas_for_dois, app, faker):
+    _run(_schedule(faker))
+
+    get_scopus_publication_search_datas_for_dois.assert_not_called()
+
+
+@patch('academics.jobs.catalogs.response_cache')
+@patch('academics.jobs.catalogs.get_scopus_publication_search_datas_for_dois')
+def test__publication_get_missing_scopus__prefetches_dois(get_scopus_publication_search_datas_for_dois, response_cache, app, faker):
+    get_scopus_publication_search_datas_for_dois.return_value = iter([])
+    job = _schedule(faker)
+
+    with prefetching():
+        _run(job)
+
+    get_scopus_publication_search_datas_for_dois.assert_called_once_with(['10.1000/123'])
+
+
+@patch('academics.jobs.catalogs.response_cache')
+@patch('academics.jobs.catalogs.get_scopus_publication_search_datas_for_dois')
+def test__publication_get_missing_scopus__no_cache(get_scopus_publication_search_datas_for_dois, response_cache, app, faker):
+    response_cache.return_value = None
+    job = _schedule(faker)
+
+    with prefetching():
+        _run(job)
+
+    get_scopus_publication_search_datas_for_dois.assert_not_called()
@@ -0,0 +1,72 @@
+from unittest.mock import patch
+from lbrc_flask.async_jobs import AsyncJob
+from lbrc_flask.database import db
+from sqlalchemy import select
+from academics.jobs.publications import PublicationCollaborationRefresh, PublicationSummaryRefresh
+from academics.jobs.runner import run_job
+from academics.jobs.scheduling import schedule
+from academics.model.summary import PublicationSummary
+from academics.services.publication_searching import update_best_catalog_publications
+from academics.services.publication_summary import rebuild_publication_summaries
+from academics.services.result_cache import data_version
+
+
+def _summaries():
+    return db.session.execute(select(PublicationSummary)).scalars().all()
+
+
+def _publication_with_best_catalog_publication(faker):
+    catalog_publication = faker.catalog_publication().get(save=True)
+    update_best_catalog_publications([catalog_publication.publication_id])
+    db.session.commit()
+
+    return catalog_publication
+
+
+def _run(job):
+    schedule(job)
+    db.session.commit()
+    job_id = job.id
+
+    run_job(job)
+
+    # The job is only deleted if it succeeded
+    assert db.session.get(AsyncJob, job_id) is None
+
+
+def test__publication_summary_refresh(app, faker):
+    catalog_publication = _publication_with_best_catalog_publication(faker)
+
+    _run(PublicationSummaryRefresh())
+
+    actual = _summaries()
+
+    assert [s.catalog_publication_id for s in actual] == [catalog_publication.id]
+    assert actual[0].publication_id == catalog_publication.publication_id
+
+
+def test__publication_collaboration_refresh(app, faker):
+    catalog_publication = _publication_with_best_catalog_publication(faker)
+
+    _run(PublicationCollaborationRefresh())
+
+    actual = _summaries()
+
+    assert [s.catalog_publication_id for s in actual] == [catalog_publication.id]
+
+
+def test__publication_summary_refresh__data_version_bumped_after_commit(app, faker):
+    _publication_with_best_catalog_publication(faker)
+    version = data_version()
+    versions_during = []
+
+    def _rebuild():
+        rebuild_publication_summaries()
+        versions_during.append(data_version())
+
+    with patch('academics.jobs.publications.rebuild_publication_summaries', side_effect=_rebuild):
+        _run(PublicationSummaryRefresh())
+
+    # The version row is not written while the summaries are
+    assert versions_during == [version]
+    assert data_version() == version + 1
@@ -0,0 +1,74 @@
+import time
+from email.utils import formatdate
+import pytest
+from academics.catalogs.rate_limit import RateLimiter, _retry_after_timestamp
+
+
+def _limiter(tmp_path):
+    return RateLimiter(path=str(tmp_path / 'rate_limit.db'), name='test', rate=10)
+
+
+def test__retry_after_timestamp__seconds():
+    assert _retry_after_timestamp('30') == pytest.approx(time.time() + 30, abs=1)
+
+
+def test__retry_after_timestamp__http_date():
+    expected = int(time.time()) + 30
+
+    assert _retry_after_timestamp(formatdate(expected, usegmt=True)) == expected
+
+
+@pytest.mark.parametrize("retry_after", [None, '', 'soon'])
+def test__retry_after_timestamp__invalid(retry_after):
+    assert _retry_after_timestamp(retry_after) is None
+
+
+def test__wait_after_too_many_requests__http_date(app, tmp_path, monkeypatch):
+    limiter = _limiter(tmp_path)
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+
+    assert limiter.wait_after_too_many_requests({'Retry-After': formatdate(time.time() + 30, usegmt=True)})
+
+    # The caller waits when it next acquires the bucket
+    assert sleeps == []
+    assert limiter._take() == pytest.approx(30, abs=2)
+
+
+def test__wait_after_too_many_requests__too_long(app, tmp_path):
+    limiter = _limiter(tmp_path)
+    retry_after = str(app.config['RATE_LIMIT_MAX_WAIT'] + 60)
+
+    assert not limiter.wait_after_too_many_requests({'Retry-After': retry_after})
+    assert limiter._take() == 0
+
+
+def _takes(limiter, count):
+    return [limiter._take() for _ in range(count)]
+
+
+def test__update_from_headers__slows_to_last_until_reset(tmp_path):
+    limiter = _limiter(tmp_path)
+
+    # 5 requests left for 10 seconds, slower than the 10 a second configured
+    limiter.update_from_headers({'X-RateLimit-Remaining': '5', 'X-RateLimit-Reset': str(time.time() + 10)})
+
+    assert _takes(limiter, 5) == [0] * 5
+    assert limiter._take() == pytest.approx(2, abs=0.1)
+
+
+def test__update_from_headers__enough_remaining(tmp_path):
+    limiter = _limiter(tmp_path)
+
+    limiter.update_from_headers({'X-RateLimit-Remaining': '1000', 'X-RateLimit-Reset': str(time.time() + 10)})
+
+    assert _takes(limiter, 10) == [0] * 10
+    assert limiter._take() == pytest.approx(0.1, abs=0.05)
+
+
+def test__update_from_headers__quota_used(tmp_path):
+    limiter = _limiter(tmp_path)
+
+    limiter.update_from_headers({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(time.time() + 30)})
+
+    assert limiter._take() == pytest.approx(30, abs=2)
@@ -0,0 +1,190 @@
+from dataclasses import replace
+from datetime import date
+from unittest.mock import patch
+import pytest
+from lbrc_flask.database import db
+from sqlalchemy import select
+from academics.catalogs.data_classes import AuthorData, PublicationData, fingerprint
+from academics.jobs.catalogs import CatalogPublicationRefresh, PublicationSaveSummary, SourceRefresh, save_publications
+from academics.model.academic import CatalogPublicationsSources, Source
+from academics.model.catalog import CATALOG_OPEN_ALEX, CATALOG_SCOPUS
+from academics.model.publication import CatalogPublication, catalog_publication_search
+from academics.model.raw_data import RawData
+
+
+def _author_data(n, **kwargs):
+    return AuthorData(**{
+        'catalog': CATALOG_OPEN_ALEX,
+        'catalog_identifier': f'A{n}',
+        'orcid': None,
+        'first_name': f'First{n}',
+        'last_name': f'Last{n}',
+        'initials': 'F',
+        'href': None,
+        'affiliations': [],
+        'raw_text': '{}',
+        'action': 'test',
+    } | kwargs)
+
+
+def _publication_data(n, **kwargs):
+    return PublicationData(**{
+        'catalog': CATALOG_OPEN_ALEX,
+        'catalog_identifier': f'W{n}',
+        'href': f'https://openalex.org/W{n}',
+        'doi': f'10.1000/{n}',
+        'title': f'Title {n}',
+        'journal_name': 'Journal',
+        'publication_cover_date': date(2024, 6, 1),
+        'abstract_text': 'Abstract',
+        'funding_list': set(),
+        'funding_text': '',
+        'volume': '1',
+        'issue': '2',
+        'pages': '3-4',
+        'subtype_code': '',
+        'subtype_description': 'article',
+        'cited_by_count': 1,
+        'authors': [_author_data(1), _author_data(2)],
+        'keywords': set(),
+        'raw_text': '{}',
+        'action': 'test',
+    } | kwargs)
+
+
+def _catalog_publication(n):
+    return db.session.execute(
+        select(CatalogPublication)
+        .where(CatalogPublication.catalog_identifier == f'W{n}')
+        .execution_options(populate_existing=True)
+    ).scalar_one()
+
+
+def _raw_data_count(n):
+    return len(db.session.execute(
+        select(RawData).where(RawData.catalog_identifier == f'W{n}')
+    ).scalars().all())
+
+
+def test__fingerprint__normalised():
+    assert fingerprint('a  b', {2, 1}, None) == fingerprint(' a b ', {1, 2}, '')
+    assert fingerprint('a', 1) != fingerprint('a', 2)
+
+
+def test__publication_data__fingerprint():
+    assert _publication_data(1).fingerprint == _publication_data(1, raw_text='other', action='other').fingerprint
+    assert _publication_data(1).fingerprint != _publication_data(1, cited_by_count=2).fingerprint
+    assert _publication_data(1).fingerprint != _publication_data(1, authors=[_author_data(2), _author_data(1)]).fingerprint
+
+
+def test__save_publications__unchanged_skipped(app):
+    save_publications([_publication_data(1)])
+
+    assert save_publications([_publication_data(1)]) == PublicationSaveSummary(unchanged=1)
+    assert _raw_data_count(1) == 1
+
+
+def test__save_publications__changed_written(app):
+    save_publications([_publication_data(1)])
+
+    actual = save_publications([_publication_data(1, cited_by_count=7)])
+
+    assert actual == PublicationSaveSummary(updated=1)
+    assert _raw_data_count(1) == 2
+
+    catalog_publication = _catalog_publication(1)
+
+    assert catalog_publication.cited_by_count == 7
+    assert catalog_publication.fingerprint == _publication_data(1, cited_by_count=7).fingerprint
+
+
+def test__catalog_publication_refresh__unchanged_scopus_search_view(app):
+    full = _publication_data(
+        1,
+        catalog=CATALOG_SCOPUS,
+        funding_list={'Wellcome Trust'},
+        funding_text='Funded by the Wellcome Trust',
+        publication_year='2024',
+        publication_month='6',
+    )
+    save_publications([full])
+
+    # The search view has no funding or publication date details
+    search_view = replace(full, funding_list=set(), funding_text='', publication_year=None, publication_month=None)
+
+    for _ in range(2):
+        catalog_publication = _catalog_publication(1)
+        catalog_publication.refresh_full_details = False
+        catalog_publication.last_refreshed_datetime = None
+        db.session.commit()
+
+        with patch('academics.jobs.catalogs.get_scopus_publication_search_data') as get_scopus_publication_search_data:
+            get_scopus_publication_search_data.return_value = replace(search_view)
+
+            CatalogPublicationRefresh(catalog_publication)._run_actual()
+
+        assert _raw_data_count(1) == 1
+        assert _catalog_publication(1).fingerprint == full.fingerprint
+
+
+def test__save_publications__counts(app):
+    assert save_publications([_publication_data(1), _publication_data(2)]) == PublicationSaveSummary(inserted=2)
+
+    actual = save_publications([
+        _publication_data(1),
+        _publication_data(2, cited_by_count=5),
+        _publication_data(3),
+    ])
+
+    assert actual == PublicationSaveSummary(inserted=1, updated=1, unchanged=1)
+    assert _catalog_publication(2).cited_by_count == 5
+    assert _catalog_publication(3).title == 'Title 3'
+
+
+def _author_identifiers(n):
+    return db.session.execute(
+        select(Source.catalog_identifier)
+        .join(CatalogPublicationsSources, CatalogPublicationsSources.source_id == Source.id)
+        .where(CatalogPublicationsSources.catalog_publication_id == _catalog_publication(n).id)
+        .order_by(CatalogPublicationsSources.ordinal)
+    ).scalars().all()
+
+
+def _search_authors(n):
+    return db.session.execute(
+        select(catalog_publication_search.c.authors)
+        .where(catalog_publication_search.c.catalog_publication_id == _catalog_publication(n).id)
+    ).scalar()
+
+
+@pytest.mark.parametrize(
+    "before, after",
+    [
+        ([1, 2, 3], [3, 1, 2]),
+        ([1, 2], [1, 3, 2]),
+        ([1, 2, 3], [1, 3]),
+        ([1, 2], [1, 4]),
+    ],
+    ids=['reordered', 'inserted', 'removed', 'replaced'],
+)
+def test__save_publications__authors_changed(app, before, after):
+    save_publications([_publication_data(1, authors=[_author_data(a) for a in before])])
+
+    actual = save_publications([_publication_data(1, authors=[_author_data(a) for a in after])])
+
+    assert actual == PublicationSaveSummary(updated=1)
+    assert _author_identifiers(1) == [f'A{a}' for a in after]
+    assert _search_authors(1) == ' '.join(f'First{a} Last{a} First{a} Last{a}' for a in after)
+
+
+def test__source_refresh__renamed_author(app):
+    save_publications([_publication_data(1)])
+
+    source = db.session.execute(select(Source).where(Source.catalog_identifier == 'A2')).scalar_one()
+
+    with patch('academics.jobs.catalogs.get_open_alex_author_data') as get_open_alex_author_data:
+        get_open_alex_author_data.return_value = _author_data(2, first_name='Renamed')
+
+        SourceRefresh(source)._run_actual()
+
+    assert _search_authors(1) == 'First1 Last1 First1 Last1 Renamed Last2 Renamed Last2'
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+from academics.model.academic import Source
+from academics.model.catalog import CATALOG_OPEN_ALEX, CATALOG_SCOPUS
+from academics.services.sources import source_publications_fetch_since
+
+
+def _source(catalog=CATALOG_SCOPUS, last_fetched_days=None, last_full_fetched_days=None):
+    now = datetime.now(timezone.utc)
+
+    return Source(
+        catalog=catalog,
+        catalog_identifier='12345',
+        last_fetched_datetime=None if last_fetched_days is None else now - timedelta(days=last_fetched_days),
+        last_full_fetched_datetime=None if last_full_fetched_days is None else now - timedelta(days=last_full_fetched_days),
+    )
+
+
+def test__source_publications_fetch_since__never_fetched(app):
+    assert source_publications_fetch_since(_source()) is None
+
+
+def test__source_publications_fetch_since__never_fully_fetched(app):
+    assert source_publications_fetch_since(_source(last_fetched_days=1)) is None
+
+
+def test__source_publications_fetch_since__incremental(app):
+    source = _source(last_fetched_days=1, last_full_fetched_days=10)
+
+    actual = source_publications_fetch_since(source)
+
+    assert actual == source.last_fetched_datetime - timedelta(days=app.config['SOURCE_SYNC_OVERLAP_DAYS'])
+
+
+def test__source_publications_fetch_since__full_sync_due(app):
+    source = _source(last_fetched_days=1, last_full_fetched_days=app.config['SOURCE_FULL_SYNC_DAYS'] + 1)
+
+    assert source_publications_fetch_since(source) is None
+
+
+def test__source_publications_fetch_since__open_alex_incremental_disabled(app):
+    source = _source(catalog=CATALOG_OPEN_ALEX, last_fetched_days=1, last_full_fetched_days=10)
+
+    assert source_publications_fetch_since(source) is None
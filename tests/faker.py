@@ -380,6 +380,7 @@ class PublicationFakeCreator(FakeCreator):
             preprint = preprint,
             institutions = institutions,
         )
+        result.set_collaboration_flags()
 
         for folder in folders:
             self.faker.folder_doi().get(
@@ -482,6 +483,12 @@ class CatalogPublicationFakeCreator(FakeCreator):
                 )
             )
 
+        if publication is not None:
+            publication.best_catalog_publication = next(
+                (cp for c in primary_catalogs for cp in publication.catalog_publications if cp.catalog == c),
+                None,
+            )
+
         return result
 
     def assert_equal(self, expected: CatalogPublication, actual: CatalogPublication):
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+import pytest
+from lbrc_flask.database import db
+from sqlalchemy import select
+from academics.model.publication import catalog_publications_keywords
+from academics.model.summary import DataVersion
+from academics.services import bulk
+from academics.services.telemetry import measuring
+
+
+def _versions():
+    return dict(db.session.execute(select(DataVersion.name, DataVersion.version)).all())
+
+
+def _links():
+    return set(db.session.execute(select(
+        catalog_publications_keywords.c.catalog_publication_id,
+        catalog_publications_keywords.c.keyword_id,
+    )).all())
+
+
+def _upsert_versions(rows):
+    bulk.upsert(DataVersion, rows, index_elements=['name'], update_columns=['version'])
+    db.session.commit()
+
+
+def test__upsert__inserts_updates_and_leaves_unchanged(app):
+    _upsert_versions([{'name': 'updated', 'version': 1}, {'name': 'unchanged', 'version': 1}])
+
+    _upsert_versions([{'name': 'updated', 'version': 2}, {'name': 'inserted', 'version': 3}])
+
+    assert _versions() == {'updated': 2, 'unchanged': 1, 'inserted': 3}
+
+
+def test__upsert__chunked(app, monkeypatch):
+    monkeypatch.setattr(bulk, 'MAX_STATEMENT_PARAMETERS', 4)
+    rows = [{'name': f'n{i}', 'version': i} for i in range(5)]
+
+    with measuring() as measurements:
+        _upsert_versions(rows)
+
+    # Two parameters per row, so two rows per statement
+    assert measurements.sql_count == 3
+    assert _versions() == {r['name']: r['version'] for r in rows}
+
+
+def test__upsert__unsupported_dialect(app, monkeypatch):
+    monkeypatch.setattr(db.session, 'get_bind', lambda: SimpleNamespace(dialect=SimpleNamespace(name='postgresql')))
+
+    with pytest.raises(ValueError):
+        bulk.upsert(DataVersion, [{'name': 'a', 'version': 1}], index_elements=['name'], update_columns=['version'])
+
+
+def test__insert_ignore__skips_existing(app):
+    _upsert_versions([{'name': 'existing', 'version': 1}])
+
+    bulk.insert_ignore(DataVersion, [{'name': 'existing', 'version': 2}, {'name': 'new', 'version': 2}])
+    db.session.commit()
+
+    assert _versions() == {'existing': 1, 'new': 2}
+
+
+def test__bulk_update(app):
+    _upsert_versions([{'name': 'a', 'version': 1}, {'name': 'b', 'version': 1}])
+
+    bulk.bulk_update(DataVersion, [{'name': 'a', 'version': 5}], 'name')
+    db.session.commit()
+
+    assert _versions() == {'a': 5, 'b': 1}
+
+
+def test__delete_keys__chunked(app, monkeypatch):
+    monkeypatch.setattr(bulk, 'MAX_STATEMENT_PARAMETERS', 2)
+    _upsert_versions([{'name': f'n{i}', 'version': i} for i in range(5)])
+
+    bulk.delete_keys(DataVersion, ['name'], ['n0', 'n1', 'n2', 'n3'])
+    db.session.commit()
+
+    assert _versions() == {'n4': 4}
+
+
+def test__sync_links__adds_and_removes(app, faker):
+    cp_1, cp_2, cp_3 = [faker.catalog_publication().get(save=True) for _ in range(3)]
+    k_1, k_2, k_3 = [faker.keyword().get(save=True) for _ in range(3)]
+
+    bulk.insert_ignore(catalog_publications_keywords, [
+        {'catalog_publication_id': cp_1.id, 'keyword_id': k_1.id},
+        {'catalog_publication_id': cp_1.id, 'keyword_id': k_2.id},
+        {'catalog_publication_id': cp_2.id, 'keyword_id': k_1.id},
+        {'catalog_publication_id': cp_3.id, 'keyword_id': k_1.id},
+    ])
+    db.session.commit()
+
+    actual = bulk.sync_links(
+        catalog_publications_keywords,
+        'catalog_publication_id',
+        'keyword_id',
+        {cp_1.id: {k_2.id, k_3.id}, cp_2.id: {k_1.id}},
+    )
+    db.session.commit()
+
+    assert actual == {cp_1.id}
+    assert _links() == {
+        (cp_1.id, k_2.id),
+        (cp_1.id, k_3.id),
+        (cp_2.id, k_1.id),
+        (cp_3.id, k_1.id),
+    }
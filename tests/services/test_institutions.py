@@ -0,0 +1,51 @@
+import pytest
+from lbrc_flask.database import db
+from sqlalchemy import select
+from academics.model.publication import Publication
+from academics.services.institutions import update_publication_collaborations
+
+
+COLLABORATION_CASES = [
+    ([], (None, None, None)),
+    ([('corporate', 'GBR', True)], (True, False, False)),
+    ([('Corporate', 'gbr', False)], (True, False, False)),
+    ([('academic', None, True), ('academic', 'GBR', None)], (False, False, True)),
+    ([('academic', 'USA', False), ('government', 'GBR', False)], (False, True, False)),
+]
+
+
+def _publication(faker, institutions):
+    return faker.publication().get(save=True, institutions={
+        faker.institution().get(save=True, sector=sector, country_code=country_code, home_institution=home_institution)
+        for sector, country_code, home_institution in institutions
+    })
+
+
+def _flags(publication_id):
+    return tuple(db.session.execute(
+        select(
+            Publication.is_industrial_collaboration,
+            Publication.is_international_collaboration,
+            Publication.is_external_collaboration,
+        ).where(Publication.id == publication_id)
+    ).one())
+
+
+@pytest.mark.parametrize("institutions, expected", COLLABORATION_CASES)
+def test__set_collaboration_flags(app, faker, institutions, expected):
+    publication = _publication(faker, institutions)
+
+    publication.set_collaboration_flags()
+    db.session.commit()
+
+    assert _flags(publication.id) == expected
+
+
+@pytest.mark.parametrize("institutions, expected", COLLABORATION_CASES)
+def test__update_publication_collaborations(app, faker, institutions, expected):
+    publication = _publication(faker, institutions)
+
+    update_publication_collaborations([publication.id])
+    db.session.commit()
+
+    assert _flags(publication.id) == expected
@@ -0,0 +1,67 @@
+from datetime import date
+import pytest
+from lbrc_flask.database import db
+from sqlalchemy import select
+from academics.model.publication import CatalogPublication
+from academics.services.pagination import keyset_chunks, keyset_paginate, keyset_total_key
+from academics.services.result_cache import bump_data_version
+
+
+ORDER_BYS = {
+    'ascending': [CatalogPublication.publication_cover_date.asc(), CatalogPublication.id.asc()],
+    'descending': [CatalogPublication.publication_cover_date.desc(), CatalogPublication.id.desc()],
+}
+
+
+def _catalog_publications_with_null_dates(faker):
+    cover_dates = [None, date(2024, 1, 1), None, date(2024, 1, 1), date(2023, 1, 1), None]
+    catalog_publications = [faker.catalog_publication().get(save=True, publication_cover_date=d) for d in cover_dates]
+    db.session.commit()
+
+    return [cp.id for cp in catalog_publications]
+
+
+def _expected(ids, order_by):
+    return db.session.execute(
+        select(CatalogPublication.id).where(CatalogPublication.id.in_(ids)).order_by(*order_by)
+    ).scalars().all()
+
+
+@pytest.mark.parametrize("order", ORDER_BYS.keys())
+def test__keyset_paginate__null_sort_keys(app, faker, order):
+    ids = _catalog_publications_with_null_dates(faker)
+    order_by = ORDER_BYS[order]
+    q = select(CatalogPublication).where(CatalogPublication.id.in_(ids))
+
+    pages = [keyset_paginate(q, order_by, per_page=2)]
+
+    while pages[-1].next_cursor:
+        pages.append(keyset_paginate(q, order_by, after=pages[-1].next_cursor, per_page=2))
+
+    assert [cp.id for p in pages for cp in p.items] == _expected(ids, order_by)
+
+    previous = keyset_paginate(q, order_by, before=pages[-1].previous_cursor, per_page=2)
+
+    assert [cp.id for cp in previous.items] == [cp.id for cp in pages[-2].items]
+
+
+@pytest.mark.parametrize("order", ORDER_BYS.keys())
+def test__keyset_chunks__null_sort_keys(app, faker, order):
+    ids = _catalog_publications_with_null_dates(faker)
+    order_by = ORDER_BYS[order]
+    q = select(CatalogPublication.id).where(CatalogPublication.id.in_(ids))
+
+    actual = [r[0] for chunk in keyset_chunks(q, order_by, size=2) for r in chunk]
+
+    assert actual == _expected(ids, order_by)
+
+
+def test__keyset_total_key__changes_with_data(app):
+    before = keyset_total_key('/publications', {'search': 'heart', 'after': 'a'})
+
+    assert keyset_total_key('/publications', {'search': 'heart', 'after': 'b'}) == before
+
+    bump_data_version()
+    db.session.commit()
+
+    assert keyset_total_key('/publications', {'search': 'heart'}) != before
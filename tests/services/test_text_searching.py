@@ -0,0 +1,42 @@
+import pytest
+from lbrc_flask.database import db
+from sqlalchemy import select
+from academics.services.text_searching import _innodb_boolean_query, _looks_like_doi, catalog_publication_text_search
+
+
+@pytest.mark.parametrize(
+    "terms, expected",
+    [
+        (['heart', 'failure'], '+heart* +failure*'),
+        (['the', 'heart'], '+heart*'),
+        (['The', 'ct', 'scan'], '+scan*'),
+        (['of', 'ct'], '+of* +ct*'),
+    ],
+)
+def test__innodb_boolean_query(terms, expected):
+    assert _innodb_boolean_query(terms) == expected
+
+
+@pytest.mark.parametrize(
+    "search_string, expected",
+    [
+        ('10.1000/xyz123', True),
+        (' s41586-020-2012-7.pdf ', True),
+        ('nejm/oa2002032', True),
+        ('heart failure', False),
+        ('', False),
+        (None, False),
+    ],
+)
+def test__looks_like_doi(search_string, expected):
+    assert _looks_like_doi(search_string) == expected
+
+
+def test__catalog_publication_text_search__doi_substring(app, faker):
+    expected = faker.catalog_publication().get(save=True, doi='10.1000/nejm.2024.123')
+    faker.catalog_publication().get(save=True, doi='10.1000/lancet.2024.456')
+    db.session.commit()
+
+    matches = catalog_publication_text_search('nejm.2024')
+
+    assert db.session.execute(select(matches.c.catalog_publication_id)).scalars().all() == [expected.id]
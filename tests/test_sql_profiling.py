@@ -0,0 +1,30 @@
+from academics.services.sql_profiling import repeated_statements, server_timing, statement_shape
+from academics.services.telemetry import Measurements, Statement
+
+
+def test__statement_shape__collapses_values():
+    assert statement_shape("SELECT a\nFROM t WHERE x IN (?, ?, ?) AND y = 'foo' AND anon_1 = 5") == 'SELECT a FROM t WHERE x IN (?) AND y = ? AND anon_1 = ?'
+    assert statement_shape('SELECT a FROM t WHERE x IN (%s, %s)') == statement_shape('SELECT a FROM t WHERE x IN (%s)')
+
+
+def test__repeated_statements():
+    statements = [Statement('SELECT a FROM t WHERE id = ?', (i,), 0.001) for i in range(5)]
+    statements.append(Statement('SELECT b FROM u', (), 0.001))
+
+    actual = repeated_statements(statements, threshold=5)
+
+    assert len(actual) == 1
+    assert actual[0]['statement'] == 'SELECT a FROM t WHERE id = ?'
+    assert actual[0]['count'] == 5
+
+
+def test__repeated_statements__under_threshold():
+    statements = [Statement('SELECT a FROM t WHERE id = ?', (i,), 0.001) for i in range(4)]
+
+    assert repeated_statements(statements, threshold=5) == []
+
+
+def test__server_timing():
+    actual = server_timing(0.25, Measurements(sql_count=3, sql_seconds=0.1), [{'statement': 'x', 'count': 5, 'ms': 1}])
+
+    assert actual == 'total;dur=250.0, sql;dur=100.0;desc="3 statements", sql-repeated;desc="1 repeated"'
@@ -5,6 +5,8 @@ from lbrc_flask.pytest.form_tester import FormTesterField
 from sqlalchemy import select
 from lbrc_flask.database import db
 from academics.model.academic import Academic
+from academics.services.publication_membership import update_publication_memberships
+from academics.services.result_cache import data_version
 from tests.ui.views.academics import AcademicFormTester, AcademicViewTester
 
 
@@ -52,6 +54,23 @@ class TestAcademicEditPost(AcademicEditViewTester, FlaskViewLoggedInTester):
 
         self.assert_actual_equals_expected(expected, actual)
 
+    def test__post__invalidates_cached_results(self):
+        publication = self.faker.publication().get(save=True)
+        self.existing.supplementary_publications.append(publication)
+        update_publication_memberships([publication.id])
+        db.session.commit()
+
+        version = data_version()
+
+        new_user = self.faker.user().get(save=True)
+        expected = self.faker.academic().get(user_id=new_user.id, save=False)
+        data = self.get_data_from_object(expected)
+
+        resp = self.post(data)
+
+        assert__refresh_response(resp)
+        assert data_version() > version
+
     @pytest.mark.parametrize(
         "missing_field", AcademicFormTester().mandatory_fields_edit,
     )
@@ -1,5 +1,9 @@
+from unittest.mock import patch
 import pytest
+from lbrc_flask.database import db
 from lbrc_flask.pytest.testers import RequiresLoginTester, FlaskViewLoggedInTester
+from sqlalchemy import select
+from academics.model.export import ExportJob
 
 
 class ExportPublicationExportPDFViewBaseTester:
@@ -13,8 +17,15 @@ class TestPublicationExportPDFRequiresLogin(ExportPublicationExportPDFViewBaseTe
 
 
 class TestPublicationExportPDFGet(ExportPublicationExportPDFViewBaseTester, FlaskViewLoggedInTester):
+    @patch('academics.ui.views.exports.run_export_job') # Mocking as cereal tasks do not work in testing
     @pytest.mark.app_crsf(True)
-    def test__get(self):
+    def test__get(self, run_export_job):
         resp = self.get()
 
+        export_job = db.session.execute(select(ExportJob)).scalar_one()
+
+        assert export_job.export_type == ExportJob.TYPE_PUBLICATIONS_PDF
+        assert export_job.status == ExportJob.STATUS_QUEUED
+        run_export_job.delay.assert_called_once_with(export_job_id=export_job.id)
+
     # To do: test the actual content of the PDF file
@@ -1,4 +1,6 @@
+from io import BytesIO
 import pytest
+from openpyxl import load_workbook
 from lbrc_flask.pytest.testers import RequiresLoginTester, FlaskViewLoggedInTester
 
 
@@ -17,4 +19,20 @@ class TestExportFullExportXlsxGet(ExportFullExportXlsxViewBaseTester, FlaskViewL
     def test__get(self):
         resp = self.get()
 
-    # To do: test the actual content of the XLSX file
+    @pytest.mark.parametrize("item_count", [0, 1, 5])
+    def test__get__rows(self, item_count, monkeypatch):
+        monkeypatch.setattr('academics.services.publication_export.EXPORT_CHUNK_SIZE', 2)
+
+        self.faker.subtype().create_defaults()
+        catalog_publications = self.faker.catalog_publication().get_list(
+            save=True,
+            item_count=item_count,
+        )
+
+        resp = self.get()
+
+        ws = load_workbook(BytesIO(resp.get_data())).active
+        rows = list(ws.iter_rows(values_only=True))
+
+        assert rows[0][0] == 'catalog'
+        assert sorted(r[2] for r in rows[1:]) == sorted(cp.doi for cp in catalog_publications)
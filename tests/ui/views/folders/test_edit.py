@@ -2,6 +2,7 @@ import pytest
 from lbrc_flask.pytest.testers import RequiresLoginTester, FlaskViewLoggedInTester, ModalContentAsserter, ModalFormErrorContentAsserter
 from lbrc_flask.pytest.asserts import assert__refresh_response
 from lbrc_flask.pytest.form_tester import FormTester, FormTesterTextField, FormTesterCheckboxField, FormTesterTextAreaField, FormTesterField
+from academics.services.result_cache import data_version
 
 
 class FolderEditViewTester:
@@ -66,6 +67,17 @@ class TestFolderEditPost(FolderEditViewTester, FlaskViewLoggedInTester):
 
         self.faker.folder().assert_equal(expected, actual)
 
+    def test__post__invalidates_cached_results(self):
+        version = data_version()
+
+        expected = self.faker.folder().get(save=False, owner_id=self.loggedin_user.id)
+        data = self.get_data_from_object(expected)
+
+        resp = self.post(data)
+
+        assert__refresh_response(resp)
+        assert data_version() > version
+
     @pytest.mark.parametrize(
         "missing_field", FolderEditFormTester().mandatory_fields_edit,
     )
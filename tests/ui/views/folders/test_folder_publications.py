@@ -1,5 +1,10 @@
+from urllib.parse import parse_qs, urlparse
 import pytest
-from lbrc_flask.pytest.testers import IndexTester, RequiresLoginTester, PagedSize10ResultSet, PanelListContentAsserter, RowContentAsserter
+from bs4 import BeautifulSoup
+from lbrc_flask.pytest.testers import RequiresLoginTester, FlaskViewLoggedInTester
+
+
+FOLDER_PUBLICATIONS_PER_PAGE = 10
 
 
 class FolderPublicationsTester:
@@ -14,26 +19,20 @@ class FolderPublicationsTester:
         self.parameters['folder_id'] = self.folder.id
 
 
-class FolderPublicationsRowContentAsserter(PanelListContentAsserter):
-    def assert_row_details(self, row, expected_result):
-        assert row is not None
-        assert expected_result is not None
-
-        # Todo: Add specific assertions for folder row details
-
-
 class TestFolderPublicationsRequiresLogin(FolderPublicationsTester, RequiresLoginTester):
     ...
 
 
-class TestFolderPublications(FolderPublicationsTester, IndexTester):
-    @property
-    def content_asserter(self) -> RowContentAsserter:
-        return FolderPublicationsRowContentAsserter
+class TestFolderPublications(FolderPublicationsTester, FlaskViewLoggedInTester):
+    def _page(self, resp):
+        soup = BeautifulSoup(resp.data, 'html.parser')
+        items = soup.select('ul.panel_list > li')
+        next_link = soup.select_one('nav.pagination a[rel=next]')
+
+        return items, next_link
 
-    @pytest.mark.parametrize("item_count", PagedSize10ResultSet.test_page_edges())
-    @pytest.mark.parametrize("current_page", PagedSize10ResultSet.test_current_pages())
-    def test__get__no_filters(self, item_count, current_page):
+    @pytest.mark.parametrize("item_count", [0, 1, FOLDER_PUBLICATIONS_PER_PAGE, FOLDER_PUBLICATIONS_PER_PAGE + 1])
+    def test__get__no_filters(self, item_count):
         cat_pubs = self.faker.catalog_publication().get_list(
             save=True,
             item_count=item_count,
@@ -46,13 +45,19 @@ class TestFolderPublications(FolderPublicationsTester, IndexTester):
                 doi=cp.doi,
             )
 
-        self.parameters['page'] = current_page
-
         resp = self.get()
 
-        self.assert_all(
-            page_count_helper=PagedSize10ResultSet(page=current_page, expected_results=cat_pubs),
-            resp=resp,
-        )
+        items, next_link = self._page(resp)
+        seen = len(items)
+
+        assert len(items) == min(item_count, FOLDER_PUBLICATIONS_PER_PAGE)
+
+        while next_link is not None:
+            self.parameters['after'] = parse_qs(urlparse(next_link['href']).query)['after'][0]
+
+            items, next_link = self._page(self.get())
+            seen += len(items)
+
+        assert seen == item_count
 
     # Todo: Add more tests for filtering, sorting, etc.
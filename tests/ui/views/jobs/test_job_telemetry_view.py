@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+import pytest
+from bs4 import BeautifulSoup
+from lbrc_flask.database import db
+from lbrc_flask.pytest.testers import RequiresLoginTester, FlaskViewLoggedInTester
+from academics.api.views import api_job_telemetry
+from academics.jobs.catalogs import RefreshAll
+from academics.jobs.scheduling import schedule
+from academics.model.job import LANES, JobExecution
+from academics.services.job_telemetry import record_job_execution
+from academics.services.telemetry import Measurements
+
+
+def _record_executions():
+    job = RefreshAll()
+    schedule(job)
+    db.session.commit()
+
+    now = datetime.now(timezone.utc)
+
+    for duration, outcome in [(1, JobExecution.OUTCOME_SUCCESS), (3, JobExecution.OUTCOME_ERROR)]:
+        record_job_execution(job, job.job_schedule, 'worker', now, duration, Measurements(sql_count=2), outcome)
+
+    db.session.commit()
+
+
+class JobTelemetryViewTester:
+    @property
+    def endpoint(self):
+        return 'ui.job_telemetry'
+
+
+class TestJobTelemetryRequiresLogin(JobTelemetryViewTester, RequiresLoginTester):
+    ...
+
+
+class TestJobTelemetryGet(JobTelemetryViewTester, FlaskViewLoggedInTester):
+    def user_to_login(self, faker):
+        return faker.user().admin(save=True)
+
+    def _job_type_rows(self, resp):
+        soup = BeautifulSoup(resp.data, 'html.parser')
+        table = soup.find('h3', string='Job Types').find_next_sibling('table')
+
+        return [[td.get_text(strip=True) for td in tr.select('td')] for tr in table.select('tbody tr')]
+
+    @pytest.mark.app_crsf(True)
+    def test__get__no_executions(self):
+        resp = self.get()
+
+        assert resp.status_code == 200
+        assert self._job_type_rows(resp) == [['No jobs have been run in this period']]
+
+    @pytest.mark.app_crsf(True)
+    def test__get__executions(self):
+        _record_executions()
+
+        resp = self.get()
+
+        assert resp.status_code == 200
+
+        rows = self._job_type_rows(resp)
+
+        assert len(rows) == 1
+        assert rows[0][:4] == ['RefreshAll', '2', '1', '4.0']
+
+
+def test__api_job_telemetry(app):
+    _record_executions()
+
+    with app.test_request_context('/api/job_telemetry?hours=24'):
+        resp = app.make_response(api_job_telemetry())
+
+    assert resp.status_code == 200
+    assert resp.is_json
+
+    actual = resp.get_json()
+
+    assert set(actual) == {'since', 'job_types', 'throughput', 'backlog', 'backlog_history'}
+    assert [s['job_type'] for s in actual['job_types']] == ['RefreshAll']
+    assert actual['job_types'][0]['executions'] == 2
+    assert actual['job_types'][0]['errors'] == 1
+    assert sum(t['executions'] for t in actual['throughput']) == 2
+    assert set(actual['backlog']) == set(LANES)
@@ -1,5 +1,10 @@
+from urllib.parse import parse_qs, urlparse
 import pytest
-from lbrc_flask.pytest.testers import IndexTester, RequiresLoginTester, PagedResultSet, PanelListContentAsserter, RowContentAsserter
+from bs4 import BeautifulSoup
+from lbrc_flask.pytest.testers import RequiresLoginTester, FlaskViewLoggedInTester
+
+
+PUBLICATIONS_PER_PAGE = 5
 
 
 class PublicationsIndexTester:
@@ -8,41 +13,69 @@ class PublicationsIndexTester:
         return 'ui.publications'
 
 
-class PublicationsRowContentAsserter(PanelListContentAsserter):
-    def assert_row_details(self, row, expected_result):
-        assert row is not None
-        assert expected_result is not None
-
-    # Todo: Add specific assertions for journal row details
-
-
 class TestPublicationsRequiresLogin(PublicationsIndexTester, RequiresLoginTester):
     ...
 
 
-class TestPublicationsIndex(PublicationsIndexTester, IndexTester):
-    @property
-    def content_asserter(self) -> RowContentAsserter:
-        return PublicationsRowContentAsserter
+class TestPublicationsIndex(PublicationsIndexTester, FlaskViewLoggedInTester):
+    def _page(self, resp):
+        soup = BeautifulSoup(resp.data, 'html.parser')
+        items = soup.select('ul.panel_list > li')
+        next_link = soup.select_one('nav.pagination a[rel=next]')
+        previous_link = soup.select_one('nav.pagination a[rel=prev]')
 
-    @pytest.mark.parametrize("item_count", PagedResultSet.test_page_edges())
-    @pytest.mark.parametrize("current_page", PagedResultSet.test_current_pages())
-    def test__get__no_filters(self, item_count, current_page):
+        return items, next_link, previous_link
+
+    def _cursor(self, link, name):
+        return parse_qs(urlparse(link['href']).query)[name][0]
+
+    @pytest.mark.parametrize("item_count", [0, 1, PUBLICATIONS_PER_PAGE, PUBLICATIONS_PER_PAGE + 1, PUBLICATIONS_PER_PAGE * 2 + 1])
+    def test__get__no_filters(self, item_count):
         self.faker.subtype().create_defaults()
-        catalog_publications = self.faker.catalog_publication().get_list(
+        self.faker.catalog_publication().get_list(
             save=True,
             item_count=item_count,
         )
 
-        publications = [cp.publication for cp in catalog_publications]
+        resp = self.get()
 
-        self.parameters['page'] = current_page
+        items, next_link, previous_link = self._page(resp)
+        seen = len(items)
 
-        resp = self.get()
+        assert len(items) == min(item_count, PUBLICATIONS_PER_PAGE)
+        assert previous_link is None
+
+        while next_link is not None:
+            self.parameters['after'] = self._cursor(next_link, 'after')
 
-        self.assert_all(
-            page_count_helper=PagedResultSet(page=current_page, expected_results=publications),
-            resp=resp,
+            resp = self.get()
+
+            items, next_link, previous_link = self._page(resp)
+            seen += len(items)
+
+            assert 0 < len(items) <= PUBLICATIONS_PER_PAGE
+            assert previous_link is not None
+
+        assert seen == item_count
+
+    def test__get__previous_page(self):
+        self.faker.subtype().create_defaults()
+        self.faker.catalog_publication().get_list(
+            save=True,
+            item_count=PUBLICATIONS_PER_PAGE + 1,
         )
 
+        first_items, next_link, _ = self._page(self.get())
+
+        self.parameters['after'] = self._cursor(next_link, 'after')
+        _, _, previous_link = self._page(self.get())
+
+        del self.parameters['after']
+        self.parameters['before'] = self._cursor(previous_link, 'before')
+        items, next_link, previous_link = self._page(self.get())
+
+        assert [str(i) for i in items] == [str(i) for i in first_items]
+        assert next_link is not None
+        assert previous_link is None
+
     # Todo: Add more tests for filtering, sorting, etc.